@@ -0,0 +1,173 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Micro-benchmarks of game engines
+
+Every engine is timed in every evaluation mode, throughput is measured in
+hands per second for three kinds of cases:
+- one hand per check of analytical sequence, e.g. 'straight_flush'
+- uniformly random hands ('random')
+- hands without winning combination, they go through the whole analytical
+  sequence ('worst')
+Batch evaluation of random hands is timed too (mode 'batch').
+
+Results are written as JSON. If baseline results are given, the run fails
+when throughput of any case drops more than allowed.
+
+Usage:
+    python -m benchmarks.engines --output results.json
+    python -m benchmarks.engines --baseline results.json --tolerance 0.2
+"""
+
+import sys
+import time
+import json
+import argparse
+import numpy as np
+from engine.base import evaluation_modes
+from engine.canonical import canonical_deals
+from engine.returns import load_game
+
+games = ('tens_or_better', 'jacks_or_better', 'deuces_wild')
+# Allowed drop of throughput against baseline
+TOLERANCE = 0.2
+# Minimal time of a measurement, seconds
+MIN_TIME = 0.2
+
+
+def prepare_cases(engine, seed=0, n=1000):
+    """Pick hands for every case
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param seed: seed of random hands
+    :type seed: int
+    :param n: number of random and worst-case hands
+    :type n: int
+
+    :return: name of case and list of n hands (tuples of card codes), hand
+             of a check of analytical sequence is repeated n times
+    :type: dict
+    """
+    deals, _ = canonical_deals()
+    combinations = engine.evaluate_batch(deals)
+    names = [check.__name__ for check in engine.analytical_sequence]
+    cases = {}
+    for i, name in enumerate(names):
+        found = np.flatnonzero(combinations == i)
+        if len(found):
+            cases[name] = [tuple(deals[found[0]].tolist())] * n
+    worst = np.flatnonzero(combinations == len(names))
+    cases['worst'] = [tuple(deal) for deal in deals[worst[:n]].tolist()]
+    rng = np.random.default_rng(seed)
+    cases['random'] = [
+        tuple(deal) for deal in
+        np.argsort(rng.random((n, 52)), axis=1)[:, :5].tolist()]
+    return cases
+
+
+def measure(function, hands):
+    """Measure throughput of a function
+
+    :param function: function that evaluates list of hands
+    :type function: callable
+    :param hands: hands
+    :type hands: list
+
+    :return: hands per second
+    :type: float
+    """
+    rounds, elapsed = 0, 0
+    start = time.perf_counter()
+    while elapsed < MIN_TIME:
+        function(hands)
+        rounds += 1
+        elapsed = time.perf_counter() - start
+    return rounds * len(hands) / elapsed
+
+
+def run(games=games):
+    """Run benchmarks
+
+    :param games: names of engine modules
+    :type games: iterable
+
+    :return: hands per second by game, mode and case
+    :type: dict
+    """
+    results = {}
+    for game in games:
+        engine, _ = load_game(game)
+        cases = prepare_cases(engine)
+        results[game] = {}
+        for mode in evaluation_modes:
+            evaluate = type(engine)(mode=mode).evaluate
+
+            def evaluate_all(hands):
+                for hand in hands:
+                    evaluate(hand)
+
+            results[game][mode] = {name: measure(evaluate_all, hands)
+                                   for name, hands in cases.items()}
+        random_hands = np.array(cases['random'] * 100)
+        results[game]['batch'] = {
+            'random': measure(engine.evaluate_batch, random_hands)}
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Find cases which throughput dropped against baseline
+
+    :param results: current results, see run()
+    :type results: dict
+    :param baseline: baseline results
+    :type baseline: dict
+    :param tolerance: allowed drop, share of baseline throughput
+    :type tolerance: float
+
+    :return: game, mode, case, baseline and current throughput of every
+             regression
+    :type: list
+    """
+    regressions = []
+    for game, modes in baseline.items():
+        for mode, cases in modes.items():
+            for case, expected in cases.items():
+                actual = results.get(game, {}).get(mode, {}).get(case)
+                if actual is not None and actual < expected * (1-tolerance):
+                    regressions.append((game, mode, case, expected, actual))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark game engines')
+    parser.add_argument('--output', help='file to write results to')
+    parser.add_argument('--baseline', help='file with baseline results')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed drop of throughput, default = '
+                             '{}'.format(TOLERANCE))
+    parser.add_argument('--game', action='append', choices=games,
+                        help='engine module, default = all')
+    args = parser.parse_args()
+    results = run(args.game or games)
+    for game, modes in results.items():
+        for mode, cases in modes.items():
+            for case, hands_per_second in cases.items():
+                print('{:<16} {:<9} {:<20} {:>12.0f} hands/s'.format(
+                    game, mode, case, hands_per_second))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for game, mode, case, expected, actual in regressions:
+            print('Regression: {} {} {}: {:.0f} -> {:.0f} hands/s'.format(
+                game, mode, case, expected, actual))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
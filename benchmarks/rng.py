@@ -0,0 +1,148 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Throughput of dealing with every random backend (see engine.rng)
+
+Throughput is measured in rounds (five dealt and five drawn cards) per
+second for two kinds of cases, every backend draws from one generator:
+- rounds dealt from one deck ('deck')
+- rounds played in chunks by the simulator, Jacks or Better with pairs
+  strategy ('simulator')
+
+Measurements of backends are interleaved in alternating order, so a slowdown
+of the machine hits all of them, and the median of several measurements is
+kept. Cost of a backend is its drop of throughput against the reference
+backend (Mersenne Twister). The run fails when cost of any case is over the
+limit.
+
+Usage:
+    python -m benchmarks.rng --output results.json
+    python -m benchmarks.rng --backend crypto --max-cost 0.05 --repeats 15
+"""
+
+import sys
+import json
+import argparse
+import statistics
+from engine.deck import Deck, deal
+from engine.rng import backends, generator
+from engine.base import build_paytable
+from engine.returns import load_game
+from engine.simulator import play, hold_pairs
+from .engines import measure
+
+REFERENCE = 'mt19937'
+# Allowed drop of throughput against reference backend
+MAX_COST = 0.05
+# Rounds of a measurement of the deck
+ROUNDS = 1000
+# Rounds of a chunk of the simulator
+CHUNK_SIZE = 100000
+# Number of measurements of a case, the median one is kept
+REPEATS = 9
+
+
+def prepare_cases(backend):
+    """Make functions of cases of a backend
+
+    :param backend: name of random backend
+    :type backend: str
+
+    :return: name of case, function that plays rounds and rounds
+    :type: dict
+    """
+    engine, poker_winnings = load_game('jacks_or_better')
+    paytable = build_paytable(poker_winnings)
+    deck = Deck(rng=generator(backend, 0))
+    rng = generator(backend, 0)
+
+    def play_deck(rounds):
+        for _ in rounds:
+            deck.reset()
+            deck.deal(5)
+            deck.deal(5)
+
+    def play_chunk(rounds):
+        play(engine, paytable, deal(rng, len(rounds)), 5, hold_pairs)
+
+    return {'deck': (play_deck, range(ROUNDS)),
+            'simulator': (play_chunk, range(CHUNK_SIZE))}
+
+
+def run(backends=backends, repeats=REPEATS):
+    """Run benchmarks
+
+    :param backends: names of random backends
+    :type backends: iterable
+    :param repeats: number of measurements of every case
+    :type repeats: int
+
+    :return: median rounds per second by backend and case
+    :type: dict
+    """
+    cases = {backend: prepare_cases(backend) for backend in backends}
+    samples = {backend: {case: [] for case in cases[backend]}
+               for backend in backends}
+    order = list(backends)
+    for _ in range(repeats):
+        for backend in order:
+            for case, (function, rounds) in cases[backend].items():
+                samples[backend][case].append(measure(function, rounds))
+        # No backend is always measured first
+        order.reverse()
+    return {backend: {case: statistics.median(values)
+                      for case, values in backend_samples.items()}
+            for backend, backend_samples in samples.items()}
+
+
+def costs(results, backend, reference=REFERENCE):
+    """Calculate cost of a backend against reference backend
+
+    :param results: results, see run()
+    :type results: dict
+    :param backend: name of backend
+    :type backend: str
+    :param reference: name of reference backend, default = REFERENCE
+    :type reference: str
+
+    :return: drop of throughput by case, share of reference throughput,
+             negative when backend is faster
+    :type: dict
+    """
+    return {case: 1 - results[backend][case] / expected
+            for case, expected in results[reference].items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark dealing with random backends')
+    parser.add_argument('--output', help='file to write results to')
+    parser.add_argument('--backend', default='crypto', choices=backends,
+                        help='backend to check against {}, default = '
+                             'crypto'.format(REFERENCE))
+    parser.add_argument('--max-cost', type=float, default=MAX_COST,
+                        help='allowed drop of throughput, default = '
+                             '{}'.format(MAX_COST))
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help='number of measurements of every case, '
+                             'default = {}'.format(REPEATS))
+    args = parser.parse_args()
+    results = run(repeats=args.repeats)
+    for backend, cases in results.items():
+        for case, rounds_per_second in cases.items():
+            print('{:<9} {:<10} {:>12.0f} rounds/s'.format(
+                backend, case, rounds_per_second))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    over = False
+    for case, cost in costs(results, args.backend).items():
+        print('Cost of {} ({}): {:+.1%}'.format(args.backend, case, cost))
+        over = over or cost > args.max_cost
+    if over:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Bankroll and risk of ruin
+
+Player starts with a bankroll and bets the same number of coins every round
+until bankroll is less than the bet. Rounds are independent, winning of a
+round follows distribution of final combinations of a game (e.g. under
+optimal play, see sensitivity.Analyzer). Many bankroll paths are advanced at
+once: winnings of a chunk of rounds are drawn for all paths, accumulated and
+frozen from the round where a path is ruined.
+
+Usage:
+    python -m engine.bankroll jacks_or_better --cache job.npz \\
+        --paths 10000 --hands 10000 --seed 1
+"""
+
+import argparse
+import collections
+import os
+import numpy as np
+from settings import INITIAL_CREDS
+from .base import build_paytable
+from .sensitivity import Analyzer
+from .returns import load_game
+
+Report = collections.namedtuple(
+    'Report', ('paths', 'hands', 'risk_of_ruin', 'bust_times', 'final',
+               'checkpoints', 'percentiles', 'curves'))
+
+
+def payout_distribution(probabilities, poker_winnings, coins=5):
+    """Get distribution of net winning of a round
+
+    :param probabilities: probability of every combination ('' for no
+                          winning combination), e.g. probabilities of
+                          returns.Report
+    :type probabilities: dict
+    :param poker_winnings: table of winnings
+    :type poker_winnings: collections.OrderedDict
+    :param coins: number of coins, 1..5, default = 5
+    :type coins: int
+
+    :return: net winnings (winning minus bet, in creds) and their
+             probabilities, in order of combination IDs
+    :type: tuple
+
+    :raise KeyError: probability of a combination is missing
+    """
+    names = list(poker_winnings) + ['']
+    weights = np.array([probabilities[name] for name in names],
+                       dtype=np.float64)
+    return (build_paytable(poker_winnings)[:, coins-1] - coins,
+            weights / weights.sum())
+
+
+def simulate(winnings, probabilities, paths, hands, bankroll=INITIAL_CREDS,
+             coins=5, seed=None, percentiles=(5, 25, 50, 75, 95), step=None,
+             chunk_size=None):
+    """Simulate bankroll paths
+
+    :param winnings: net winnings of a round, see payout_distribution()
+    :type winnings: numpy.ndarray
+    :param probabilities: probabilities of winnings
+    :type probabilities: numpy.ndarray
+    :param paths: number of paths
+    :type paths: int
+    :param hands: maximal number of rounds of a path
+    :type hands: int
+    :param bankroll: initial bankroll (in creds), default = INITIAL_CREDS
+    :type bankroll: int
+    :param coins: bet of a round, path is ruined when its bankroll is less
+                  than the bet, default = 5
+    :type coins: int
+    :param seed: seed of RNG, default = fresh entropy
+    :type seed: int
+    :param percentiles: percentiles of bankroll curves
+    :type percentiles: tuple
+    :param step: number of rounds between points of curves, default = 1% of
+                 rounds
+    :type step: int
+    :param chunk_size: number of rounds advanced at once, default = about
+                       4M draws per chunk
+    :type chunk_size: int
+
+    :return: number of paths and rounds, share of ruined paths, round of
+             ruin of every ruined path, final bankroll of every path, rounds
+             where curves are taken, percentiles and curves (checkpoints ×
+             percentiles)
+    :type: Report
+
+    :raise ValueError: initial bankroll is less than bet
+    """
+    if bankroll < coins:
+        raise ValueError('Initial bankroll is less than bet: ', bankroll)
+    if step is None:
+        step = max(1, hands // 100)
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 22) // paths)
+    rng = np.random.default_rng(seed)
+    winnings = np.asarray(winnings, dtype=np.int64)
+    cdf = np.cumsum(probabilities)
+    current = np.full(paths, bankroll, dtype=np.int64)
+    alive = np.ones(paths, dtype=bool)
+    bust_times = np.zeros(paths, dtype=np.int64)
+    checkpoints = list(range(0, hands + 1, step))
+    if checkpoints[-1] != hands:
+        checkpoints.append(hands)
+    curves = [np.percentile(current, percentiles)]
+    for start in range(0, hands, chunk_size):
+        n = min(chunk_size, hands - start)
+        # Ruined paths do not change, only the rest are advanced
+        columns = np.flatnonzero(alive)
+        outcomes = np.searchsorted(cdf, rng.random((n, len(columns))),
+                                   side='right').clip(0, len(winnings) - 1)
+        trajectory = current[columns] + np.cumsum(winnings[outcomes], axis=0)
+        # Path is frozen from the first round it can not afford the next bet
+        ruined = np.logical_or.accumulate(trajectory < coins, axis=0)
+        first = ruined.argmax(axis=0)
+        busted = ruined[-1]
+        trajectory = np.where(
+            ruined, trajectory[first, np.arange(len(columns))], trajectory)
+        bust_times[columns[busted]] = start + first[busted] + 1
+        alive[columns[busted]] = False
+        for checkpoint in checkpoints:
+            if start < checkpoint <= start + n:
+                current[columns] = trajectory[checkpoint - start - 1]
+                curves.append(np.percentile(current, percentiles))
+        current[columns] = trajectory[-1]
+    return Report(
+        paths=paths,
+        hands=hands,
+        risk_of_ruin=float((~alive).mean()),
+        bust_times=bust_times[~alive],
+        final=current,
+        checkpoints=np.array(checkpoints),
+        percentiles=tuple(percentiles),
+        curves=np.array(curves)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate bankroll of a video poker player under '
+                    'optimal play')
+    parser.add_argument('game', help='engine module, e.g. jacks_or_better')
+    parser.add_argument('--coins', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--bankroll', type=int, default=INITIAL_CREDS)
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--hands', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--cache', help='file to keep counts in (.npz), see '
+                                        'engine.sensitivity')
+    args = parser.parse_args()
+    engine, poker_winnings = load_game(args.game)
+    if args.cache and os.path.exists(args.cache):
+        analyzer = Analyzer.load(args.cache)
+    else:
+        analyzer = Analyzer.solve(engine, poker_winnings,
+                                  processes=args.processes)
+        if args.cache:
+            analyzer.save(args.cache)
+    report = analyzer.analyze(poker_winnings, args.coins)
+    winnings, probabilities = payout_distribution(
+        report.probabilities, poker_winnings, args.coins)
+    result = simulate(winnings, probabilities, args.paths, args.hands,
+                      args.bankroll, args.coins, args.seed)
+    print('Risk of ruin: {:.4%}'.format(result.risk_of_ruin))
+    if len(result.bust_times):
+        print('Rounds to ruin: median {:.0f}, mean {:.1f}'.format(
+            np.median(result.bust_times), result.bust_times.mean()))
+    print('{:>8} '.format('Round') + ' '.join(
+        '{:>8}'.format('P{}'.format(p)) for p in result.percentiles))
+    for checkpoint, curve in zip(result.checkpoints, result.curves):
+        print('{:>8} '.format(checkpoint) + ' '.join(
+            '{:>8.0f}'.format(value) for value in curve))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,10 @@
 
 """Base engine for various poker types"""
 
+import enum
+import itertools
+import numpy as np
+
 # Card parameters
 suits = {
     'S': '♠',  # Spades
@@ -13,12 +17,246 @@ suits = {
 }
 suit_list = suits.keys()
 ranks = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+# Each rank is mapped to a prime number, so product of primes of hand's ranks
+# is unique for every multiset of ranks and does not depend on card order
+rank_primes = dict(zip(ranks,
+                       (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)))
+# Integer card codes: code = rank index * 4 + suit index, so rank of a card
+# is code >> 2 and suit is code & 3
+suit_indexes = {suit: i for i, suit in enumerate(suits)}
+rank_indexes = {rank: i for i, rank in enumerate(ranks)}
+deck_size = len(suits) * len(ranks)
+code_suits = tuple(suit for rank in ranks for suit in suits)
+code_ranks = tuple(rank for rank in ranks for suit in suits)
+code_primes = tuple(rank_primes[rank] for rank in code_ranks)
+# Evaluation modes of engines
+evaluation_modes = ('sequence', 'table', 'histogram')
+
+# Lookup tables that are already built, one per engine class
+_lookup_tables = {}
+# Name of combination ID that means no winning combination
+NO_WIN = 'NOTHING'
+
+
+def rank_key(card_ranks):
+    """Calculate key of rank multiset
+
+    :param card_ranks: card ranks
+    :type card_ranks: list
+
+    :return: product of primes of card ranks
+    :type: int
+    """
+    key = 1
+    for rank in card_ranks:
+        key *= rank_primes[rank]
+    return key
+
+
+def rank_histogram(card_ranks):
+    """Count cards of every rank in one pass
+
+    :param card_ranks: rank indexes of cards
+    :type card_ranks: iterable
+
+    :return: number of cards of every rank (13 slots) and rank mask (bit i is
+             set when hand has a card of i-th rank)
+    :type: tuple
+    """
+    histogram = [0] * len(ranks)
+    mask = 0
+    for rank in card_ranks:
+        histogram[rank] += 1
+        mask |= 1 << rank
+    return histogram, mask
+
+
+def check_cards(card_suits, card_ranks):
+    """Check that card suits and ranks describe a hand of 5 cards
+
+    :param card_suits: card suits
+    :type card_suits: list
+    :param card_ranks: card ranks
+    :type card_ranks: list
+
+    :raise: TypeError: card_suit/card_rank is not a list
+    :raise: ValueError: number of elements in a list is not equal to 5
+    :raise: KeyError: current suit/rank does not exist
+    """
+    # Check for correct type
+    if type(card_suits) != list:
+        raise TypeError('Card suits must be a list')
+    if type(card_ranks) != list:
+        raise TypeError('Card ranks must be a list')
+    # Check for list length
+    if len(card_suits) != 5:
+        raise ValueError('Number of elements in a list of card suits must'
+                         'be equal to 5')
+    if len(card_ranks) != 5:
+        raise ValueError('Number of elements in a list of card ranks must'
+                         'be equal to 5')
+    # Check values in list
+    for e in card_suits:
+        if e not in suit_list:
+            raise KeyError('Unknown card suit: ', e)
+    for e in card_ranks:
+        if e not in ranks:
+            raise KeyError('Unknown card rank: ', e)
+
+
+def encode_card(suit, rank):
+    """Get integer code of a card
+
+    :param suit: card suit
+    :type suit: str
+    :param rank: card rank
+    :type rank: str
+
+    :return: card code
+    :type: int
+
+    :raise: KeyError: suit/rank does not exist
+    """
+    return rank_indexes[rank]*4 + suit_indexes[suit]
+
+
+def decode_card(code):
+    """Get suit and rank of a card by its code
+
+    :param code: card code
+    :type code: int
+
+    :return: suit and rank
+    :type: tuple
+    """
+    return code_suits[code], code_ranks[code]
+
+
+def combination_enum(combination_names):
+    """Create enumeration of integer combination IDs, ID of a combination is
+    its index in table of winnings and ID of NOTHING (no winning combination)
+    is number of combinations, so IDs are the same as returned by
+    evaluate_batch() and can be used as row indexes of paytable
+
+    :param combination_names: names of combinations in order of table of
+                              winnings
+    :type combination_names: iterable
+
+    :return: enumeration where member name is combination name in upper case
+             with underscores, e.g. Combination.TWO_PAIRS
+    :type: enum.IntEnum
+    """
+    members = [(name.upper().replace(' ', '_'), i)
+               for i, name in enumerate(combination_names)]
+    members.append((NO_WIN, len(members)))
+    return enum.IntEnum('Combination', members)
+
+
+def build_paytable(poker_winnings):
+    """Convert table of winnings to dense array
+
+    :param poker_winnings: table of winnings, combination name is mapped to
+                           winnings for 1..5 coins
+    :type poker_winnings: collections.OrderedDict
+
+    :return: (number of combinations + 1)×5 array, row is combination ID (see
+             combination_enum()) and column is number of coins - 1, the last
+             row (no winning combination) is filled with zeros
+    :type: numpy.ndarray
+    """
+    rows = [list(winnings) for winnings in poker_winnings.values()]
+    rows.append([0] * len(rows[0]))
+    return np.array(rows, dtype=np.int64)
+
+
+class Hand(tuple):
+    """Five cards as integer codes. Codes are checked once on creation, so a
+    hand can be passed to evaluate() of any engine
+    """
+    __slots__ = ()
+
+    def __new__(cls, cards):
+        """Create hand from card codes
+
+        :param cards: five card codes
+        :type cards: iterable
+
+        :raise: ValueError: number of cards is not equal to 5
+        :raise: KeyError: card code does not exist
+        """
+        hand = super().__new__(cls, cards)
+        if len(hand) != 5:
+            raise ValueError('Number of cards in a hand must be equal to 5')
+        for code in hand:
+            if type(code) != int or not 0 <= code < deck_size:
+                raise KeyError('Unknown card code: ', code)
+        return hand
+
+    @classmethod
+    def from_strings(cls, card_suits, card_ranks):
+        """Create hand from card suits and ranks
+
+        :param card_suits: card suits
+        :type card_suits: list
+        :param card_ranks: card ranks
+        :type card_ranks: list
+
+        :return: hand
+        :type: Hand
+
+        :raise: see check_cards()
+        """
+        check_cards(card_suits, card_ranks)
+        return super().__new__(cls, map(encode_card, card_suits, card_ranks))
+
+    @property
+    def suits(self):
+        """Card suits
+
+        :type: list
+        """
+        return [code_suits[code] for code in self]
+
+    @property
+    def ranks(self):
+        """Card ranks
+
+        :type: list
+        """
+        return [code_ranks[code] for code in self]
 
 
 class BaseEngine:
     """Base class for game engines
     """
     suits_flush = [['S']*5, ['C']*5, ['H']*5, ['D']*5]
+    # Ranks of wild cards, they are not taken into account by suited()
+    wild_ranks = ()
+    # Names of winning combinations in order of analytical sequence
+    combinations = ()
+    # Card codes of the deck the game is played with
+    deck = tuple(range(deck_size))
+
+    def __init__(self, mode='sequence'):
+        """Class BaseEngine constructor, should be called by subclasses with
+        super().__init__(mode)
+
+        :param mode: evaluation mode: 'sequence' runs analytical sequence of
+                     checks, 'table' takes result from precomputed lookup
+                     table, 'histogram' classifies hand by histogram of
+                     ranks made in one pass (no table in memory), default =
+                     'sequence'
+        :type mode: str
+
+        :raise ValueError: unknown evaluation mode
+        """
+        if mode not in evaluation_modes:
+            raise ValueError('Unknown evaluation mode: ', mode)
+        self.mode = mode
+        self.table = self.lookup_table() if mode == 'table' else None
+        self.combination_ids = {name: i for i, name
+                                in enumerate(self.combinations)}
+        self.combination_ids[''] = len(self.combinations)
 
     def __call__(self, card_suits, card_ranks):
         """Entry point with necessary checks, should be overridden with
@@ -33,25 +271,96 @@ class BaseEngine:
         :raise: ValueError: number of elements in a list is not equal to 5
         :raise: KeyError: current suit/rank does not exist
         """
-        # Check for correct type
-        if type(card_suits) != list:
-            raise TypeError('Card suits must be a list')
-        if type(card_ranks) != list:
-            raise TypeError('Card ranks must be a list')
-        # Check for list length
-        if len(card_suits) != 5:
-            raise ValueError('Number of elements in a list of card suits must'
-                             'be equal to 5')
-        if len(card_ranks) != 5:
-            raise ValueError('Number of elements in a list of card ranks must'
-                             'be equal to 5')
-        # Check values in list
-        for e in card_suits:
-            if e not in suit_list:
-                raise KeyError('Unknown card suit: ', e)
-        for e in card_ranks:
-            if e not in ranks:
-                raise KeyError('Unknown card rank: ', e)
+        check_cards(card_suits, card_ranks)
+
+    def evaluate(self, cards):
+        """Entry point for trusted callers: check for winning combination
+        without any checks of input, should be overridden
+
+        :param cards: five card codes, e.g. Hand
+        :type cards: sequence
+
+        :return: winning combination
+        :type: str
+        """
+        raise NotImplementedError('Method should be implemented')
+
+    def evaluate_id(self, cards):
+        """Entry point for trusted callers: check for winning combination and
+        return its ID
+
+        :param cards: five card codes, e.g. Hand
+        :type cards: sequence
+
+        :return: combination ID, see combination_enum()
+        :type: int
+        """
+        return self.combination_ids[self.evaluate(cards)]
+
+    def evaluate_batch(self, cards):
+        """Check for winning combinations of many hands at once, should be
+        overridden
+
+        :param cards: N×5 array of card codes
+        :type cards: array_like
+
+        :return: N-length array of indexes of winning combinations in
+                 analytical sequence (it has the same order as poker_winnings)
+                 or number of combinations if there is no winning combination
+        :type: numpy.ndarray
+        """
+        raise NotImplementedError('Method should be implemented')
+
+    def suited(self, card_suits, card_ranks):
+        """Check if all cards except wild ones have the same suit
+
+        :param card_suits: card suits
+        :type card_suits: list
+        :param card_ranks: card ranks
+        :type card_ranks: list
+
+        :return: True if hand is suited
+        :type: bool
+        """
+        return len({s for s, r in zip(card_suits, card_ranks)
+                    if r not in self.wild_ranks}) == 1
+
+    @classmethod
+    def lookup_table(cls):
+        """Get lookup table of winning combinations for engine class, table
+        is built on first call only
+
+        :return: table where rank key of a hand is mapped to pair of winning
+                 combinations: for unsuited hand and for suited one
+        :type: dict
+        """
+        table = _lookup_tables.get(cls)
+        if table is None:
+            table = _lookup_tables[cls] = cls().build_lookup_table()
+        return table
+
+    def build_lookup_table(self):
+        """Evaluate every multiset of 5 ranks both as unsuited and as suited
+        hand. Engine's result must depend on card ranks and suited() only
+
+        :return: lookup table, see lookup_table()
+        :type: dict
+        """
+        table = {}
+        for hand_ranks in itertools.combinations_with_replacement(ranks, 5):
+            hand_ranks = list(hand_ranks)
+            entry = [None, None]
+            for hand_suits in (['S', 'C', 'H', 'D', 'S'], ['S']*5):
+                suited = self.suited(hand_suits, hand_ranks)
+                entry[suited] = self(hand_suits, hand_ranks)
+            # Hand with less than 2 non-wild cards is either always suited
+            # or never suited, so both flags get the same result
+            if entry[0] is None:
+                entry[0] = entry[1]
+            if entry[1] is None:
+                entry[1] = entry[0]
+            table[rank_key(hand_ranks)] = tuple(entry)
+        return table
 
 
 class RankOrBetter(BaseEngine):
@@ -60,8 +369,18 @@ class RankOrBetter(BaseEngine):
     Method rank_or_better() is abstract and should be reimplemented
     """
     ranks_straight = [set(ranks[i:i+5]) for i in range(9)]
+    # Rank masks of straights and of royal flush, used in histogram mode
+    straight_masks = tuple(0b11111 << i for i in range(9))
+    royal_mask = straight_masks[-1]
+    # Ranks of pairs that win, used by evaluate_batch() and histogram mode
+    pair_ranks = ()
+
+    def __init__(self, mode='sequence'):
+        """Class RankOrBetter constructor
 
-    def __init__(self):
+        :param mode: evaluation mode, see BaseEngine
+        :type mode: str
+        """
         self.analytical_sequence = (
             self.royal_flush,
             self.straight_flush,
@@ -73,6 +392,7 @@ class RankOrBetter(BaseEngine):
             self.two_pairs,
             self.rank_or_better
         )
+        super().__init__(mode)
 
     def __call__(self, card_suits, card_ranks):
         """Check for winning combination and return result if any
@@ -81,6 +401,91 @@ class RankOrBetter(BaseEngine):
         :type: str
         """
         super().__call__(card_suits, card_ranks)
+        if self.table is not None:
+            return self.table[rank_key(card_ranks)][
+                card_suits in self.suits_flush]
+        if self.mode == 'histogram':
+            return self.classify([rank_indexes[rank] for rank in card_ranks],
+                                 card_suits in self.suits_flush)
+        return self.analyze(card_suits, card_ranks)
+
+    def evaluate(self, cards):
+        """Check for winning combination of five card codes without checks
+
+        :param cards: five card codes
+        :type cards: sequence
+
+        :return: winning combination
+        :type: str
+        """
+        if self.table is not None:
+            a, b, c, d, e = cards
+            return self.table[
+                code_primes[a] * code_primes[b] * code_primes[c] *
+                code_primes[d] * code_primes[e]
+            ][((a ^ b) | (a ^ c) | (a ^ d) | (a ^ e)) & 3 == 0]
+        if self.mode == 'histogram':
+            a, b, c, d, e = cards
+            return self.classify(
+                (a >> 2, b >> 2, c >> 2, d >> 2, e >> 2),
+                ((a ^ b) | (a ^ c) | (a ^ d) | (a ^ e)) & 3 == 0)
+        return self.analyze([code_suits[code] for code in cards],
+                            [code_ranks[code] for code in cards])
+
+    def evaluate_batch(self, cards):
+        """Check for winning combinations of many hands at once
+
+        :param cards: N×5 array of card codes
+        :type cards: array_like
+
+        :return: N-length array of combination indexes, see BaseEngine
+        :type: numpy.ndarray
+        """
+        # Batch module imports this one, so it is imported on demand
+        from . import batch
+        return batch.rank_or_better(cards, self.pair_ranks)
+
+    def classify(self, card_ranks, suited):
+        """Classify hand by its histogram of ranks, gives the same results
+        as analytical sequence
+
+        :param card_ranks: rank indexes of cards
+        :type card_ranks: sequence
+        :param suited: True if all cards have the same suit
+        :type suited: bool
+
+        :return: winning combination
+        :type: str
+        """
+        # Combinations are taken by their indexes in analytical sequence
+        histogram, mask = rank_histogram(card_ranks)
+        straight = mask in self.straight_masks
+        if suited and straight:
+            return self.combinations[mask != self.royal_mask]
+        if 4 in histogram:
+            return self.combinations[2]
+        if 3 in histogram and 2 in histogram:
+            return self.combinations[3]
+        if suited:
+            return self.combinations[4]
+        if straight:
+            return self.combinations[5]
+        if 3 in histogram:
+            return self.combinations[6]
+        pairs = histogram.count(2)
+        if pairs == 2:
+            return self.combinations[7]
+        if pairs and any(histogram[rank_indexes[rank]] == 2
+                         for rank in self.pair_ranks):
+            return self.combinations[8]
+        return ''
+
+    def analyze(self, card_suits, card_ranks):
+        """Run analytical sequence for checked cards
+
+        :return: winning combination
+        :type: str
+        """
         self.card_suits = card_suits
         self.card_ranks = card_ranks
         for fun in self.analytical_sequence:
@@ -89,6 +494,14 @@ class RankOrBetter(BaseEngine):
                 return result
         return ''
 
+    def suited(self, card_suits, card_ranks):
+        """Check for all cards of the same suit
+
+        :return: True if all cards have the same suit
+        :type: bool
+        """
+        return card_suits in self.suits_flush
+
     def royal_flush(self):
         """Check for Royal Flush
 
@@ -0,0 +1,224 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Vectorized evaluation of many hands at once with NumPy
+
+Hands are given as N×5 array of card codes (see engine.base), result is
+N-length array of indexes of winning combinations in engine's analytical
+sequence, which has the same order as poker_winnings of the engine module.
+Hands without winning combination get index equal to number of combinations.
+"""
+
+import itertools
+import numpy as np
+from .base import ranks, deck_size, rank_indexes
+
+# Rank masks of straights: 5 consecutive ranks, bit i is set for ranks[i]
+straight_masks = np.array([0b11111 << i for i in range(len(ranks)-4)],
+                          dtype=np.int16)
+royal_mask = straight_masks[-1]
+
+
+def split_cards(cards):
+    """Check array of hands and split card codes into ranks and suits. Arrays
+    are transposed, so every card position is a contiguous row
+
+    :param cards: N×5 array of card codes
+    :type cards: array_like
+
+    :return: 5×N arrays of rank indexes and suit indexes
+    :type: tuple
+
+    :raise ValueError: array is not of N×5 shape
+    :raise KeyError: array contains unknown card code
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or cards.shape[1] != 5:
+        raise ValueError('Array of hands must have N×5 shape')
+    if cards.size and (cards.min() < 0 or cards.max() >= deck_size):
+        raise KeyError('Unknown card code in array of hands')
+    cards = np.ascontiguousarray(cards.T, dtype=np.int16)
+    return cards >> 2, cards & 3
+
+
+def rank_counts(card_ranks, counted=None):
+    """Count cards of the same rank as every card, i.e. rank histogram value
+    of every card
+
+    :param card_ranks: 5×N array of rank indexes
+    :type card_ranks: numpy.ndarray
+    :param counted: 5×N boolean array of cards to count, default = all cards
+    :type counted: numpy.ndarray
+
+    :return: 5×N array of counts, 0 for cards that are not counted
+    :type: numpy.ndarray
+    """
+    if counted is None:
+        counted = np.ones(card_ranks.shape, dtype=bool)
+    counts = counted.astype(np.int8)
+    for i, j in itertools.combinations(range(5), 2):
+        same = (card_ranks[i] == card_ranks[j]) & counted[i] & counted[j]
+        counts[i] += same
+        counts[j] += same
+    return counts
+
+
+def rank_mask(card_ranks):
+    """Make bit mask of ranks present in every hand
+
+    :param card_ranks: 5×N array of rank indexes
+    :type card_ranks: numpy.ndarray
+
+    :return: N-length array of masks
+    :type: numpy.ndarray
+    """
+    return np.bitwise_or.reduce(1 << card_ranks, axis=0)
+
+
+def single_suit(suit_mask):
+    """Check if exactly one bit of suit mask is set
+
+    :param suit_mask: N-length array of suit masks
+    :type suit_mask: numpy.ndarray
+
+    :return: N-length boolean array
+    :type: numpy.ndarray
+    """
+    return (suit_mask != 0) & ((suit_mask & (suit_mask - 1)) == 0)
+
+
+def classify(conditions, n):
+    """Pick index of the first true condition for every hand
+
+    :param conditions: N-length boolean arrays in order of analytical sequence
+    :type conditions: list
+    :param n: number of hands
+    :type n: int
+
+    :return: N-length array of combination indexes
+    :type: numpy.ndarray
+    """
+    if not n:
+        return np.zeros(0, dtype=np.int8)
+    return np.select(conditions, range(len(conditions)),
+                     default=len(conditions)).astype(np.int8)
+
+
+def rank_or_better(cards, pair_ranks):
+    """Evaluate hands for 'any rank or better' poker types, order of checks
+    is the same as in RankOrBetter
+
+    :param cards: N×5 array of card codes
+    :type cards: array_like
+    :param pair_ranks: ranks of pairs that win
+    :type pair_ranks: iterable
+
+    :return: N-length array of combination indexes
+    :type: numpy.ndarray
+    """
+    card_ranks, card_suits = split_cards(cards)
+    counts = rank_counts(card_ranks)
+    mask = rank_mask(card_ranks)
+    flush = (card_suits == card_suits[0]).all(axis=0)
+    straight = np.isin(mask, straight_masks)
+    four = (counts == 4).any(axis=0)
+    three = (counts == 3).any(axis=0)
+    paired = counts == 2
+    # Number of cards in pairs, i.e. 2 per pair
+    pairs = paired.sum(axis=0)
+    high_pair = paired & np.isin(card_ranks,
+                                 [rank_indexes[rank] for rank in pair_ranks])
+    return classify([
+        flush & (mask == royal_mask),           # Royal Flush
+        flush & straight,                       # Straight Flush
+        four,                                   # Four of a Kind
+        three & (pairs > 0),                    # Full House
+        flush,                                  # Flush
+        straight,                               # Straight
+        three,                                  # Three of a Kind
+        pairs > 2,                              # Two Pairs
+        high_pair.any(axis=0)                   # Rank or Better
+    ], card_ranks.shape[1])
+
+
+def deuces_wild(cards):
+    """Evaluate hands for Deuces Wild, order and rules of checks are the same
+    as in DeucesWild
+
+    :param cards: N×5 array of card codes
+    :type cards: array_like
+
+    :return: N-length array of combination indexes
+    :type: numpy.ndarray
+    """
+    card_ranks, card_suits = split_cards(cards)
+    natural = card_ranks > 0
+    deuces = 5 - natural.sum(axis=0)
+    counts = rank_counts(card_ranks, natural)
+    mask = rank_mask(card_ranks) & ~1
+    suited = single_suit(np.bitwise_or.reduce(
+        np.where(natural, 1 << card_suits, 0), axis=0))
+    # Straights of DeucesWild start from '3'; straight flush with n deuces
+    # is checked against the first 7-n of them only
+    windows = straight_masks[1:, None]
+    within = (mask & ~windows) == 0
+    allowed = np.arange(len(windows))[:, None] < 7 - deuces
+    # Deuces have zero counts, so a rank that is not on hand is covered too
+    with_deuces = counts + deuces.astype(np.int8)
+    # Which counts of natural ranks are present in a hand
+    present = {i: (counts == i).any(axis=0) for i in range(1, 6)}
+
+    def only(*values):
+        return np.logical_and.reduce(
+            [present[i] == (i in values) for i in present])
+
+    return classify([
+        (deuces == 0) & suited & (mask == royal_mask),  # Natural Royal Flush
+        deuces == 4,                                    # Four Deuces
+        (deuces > 0) & suited & ((mask & ~royal_mask) == 0),  # Deuces Royal
+        (with_deuces == 5).any(axis=0),                 # Five of a Kind
+        suited & (within & allowed).any(axis=0),        # Straight Flush
+        (with_deuces == 4).any(axis=0),                 # Four of a Kind
+        (only(1, 2) & (deuces == 2)) | (only(2) & (deuces == 1)) |
+        (only(2, 3) & (deuces == 0)),                   # Full House
+        suited,                                         # Flush
+        ((deuces > 0) & (counts < 2).all(axis=0) & within.any(axis=0)) |
+        ((deuces == 0) & np.isin(mask, windows)),       # Straight
+        (with_deuces == 3).any(axis=0)                  # Three of a Kind
+    ], card_ranks.shape[1])
+
+
+def table_lookup(cards, primes, wild, keys, results):
+    """Evaluate hands by lookup table keyed by product of rank primes and
+    suited flag of non-wild cards, for engines with any deck
+
+    :param cards: N×5 array of card codes
+    :type cards: array_like
+    :param primes: rank prime of every card code
+    :type primes: numpy.ndarray
+    :param wild: flag of every card code, True for wild cards
+    :type wild: numpy.ndarray
+    :param keys: sorted keys of lookup table
+    :type keys: numpy.ndarray
+    :param results: 2×len(keys) array of combination indexes of unsuited and
+                    suited hands
+    :type results: numpy.ndarray
+
+    :return: N-length array of combination indexes
+    :type: numpy.ndarray
+
+    :raise ValueError: array is not of N×5 shape
+    :raise KeyError: array contains unknown card code
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or cards.shape[1] != 5:
+        raise ValueError('Array of hands must have N×5 shape')
+    if cards.size and (cards.min() < 0 or cards.max() >= len(primes)):
+        raise KeyError('Unknown card code in array of hands')
+    cards = np.ascontiguousarray(cards.T, dtype=np.intp)
+    index = np.searchsorted(keys, primes[cards].prod(axis=0))
+    suit_mask = np.bitwise_or.reduce(
+        np.where(wild[cards], 0, 1 << (cards & 3)), axis=0)
+    return results[((suit_mask & (suit_mask - 1)) == 0).astype(np.intp),
+                   index]
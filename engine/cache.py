@@ -0,0 +1,112 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Shared cache of results of engines and solvers
+
+Results are kept by canonical form of a hand (see canonical), so all
+suit-isomorphic hands share one result. Results of engines are keyed by
+engine class, expected winnings of holds are keyed by engine class, table of
+winnings and number of coins too. Least recently used results are dropped
+when number of results or their size in memory is over the limit. Cache may
+be shared by threads of a multi-session server.
+
+Cache works with games played with 52-card deck only.
+"""
+
+import itertools
+from settings import CACHE_SIZE, CACHE_MAX_BYTES
+from .base import Hand
+from .canonical import canonicalize, canonical_holds, Memo
+
+# Maximal number of kept engine classes and tables of winnings
+IDS_SIZE = 1024
+
+
+class Cache:
+    """Cache of winning combinations and expected winnings of holds"""
+
+    def __init__(self, maxsize=CACHE_SIZE, maxbytes=CACHE_MAX_BYTES):
+        """Class Cache constructor
+
+        :param maxsize: maximal number of stored results, default =
+                        CACHE_SIZE
+        :type maxsize: int
+        :param maxbytes: maximal size of stored results in bytes, default =
+                         CACHE_MAX_BYTES
+        :type maxbytes: int
+        """
+        self.memo = Memo(maxsize=maxsize, maxbytes=maxbytes)
+        # Engine classes and tables of winnings are mapped to small numbers,
+        # so keys of results are tuples of integers. Numbers are never
+        # reused, so results of a dropped table are never taken for another
+        self.ids = Memo(maxsize=IDS_SIZE)
+        self.numbers = itertools.count()
+
+    def _id(self, *args):
+        """Get number of a combination of arguments
+
+        :return: number
+        :type: int
+        """
+        return self.ids.get(args, next, self.numbers)
+
+    def evaluate(self, engine, card_suits, card_ranks):
+        """Check for winning combination, see BaseEngine.__call__()
+
+        :param engine: game engine
+        :type engine: BaseEngine
+        :param card_suits: card suits
+        :type card_suits: list
+        :param card_ranks: card ranks
+        :type card_ranks: list
+
+        :return: winning combination
+        :type: str
+
+        :raise: see check_cards()
+        """
+        hand = Hand.from_strings(card_suits, card_ranks)
+        form = canonicalize(hand)[0]
+        return self.memo.get((self._id(type(engine)),) + form, engine,
+                             card_suits, card_ranks)
+
+    def hold_values(self, solver, cards, coins):
+        """Calculate expected winning of every hold, see Solver.hold_values()
+
+        :param solver: solver of a game
+        :type solver: Solver
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: expected winning (in creds) by hold mask
+        :type: numpy.ndarray
+        """
+        form, positions, _ = canonicalize(cards)
+        key = (self._id(solver.engine_class, solver.paytable.tobytes()),
+               coins) + form
+        values = self.memo.get(key, solver.hold_values, form, coins)
+        return values[canonical_holds(positions)]
+
+    def best_hold(self, solver, cards, coins):
+        """Find hold with maximal expected winning, see Solver.best_hold()
+
+        :return: hold mask and its expected winning
+        :type: tuple
+        """
+        values = self.hold_values(solver, cards, coins)
+        hold = int(values.argmax())
+        return hold, float(values[hold])
+
+    def stats(self):
+        """Get counters of cache, see Memo.stats()
+
+        :type: MemoStats
+        """
+        return self.memo.stats()
+
+
+# Cache shared by all sessions of a process
+shared = Cache()
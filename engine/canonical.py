@@ -0,0 +1,298 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Suit-isomorphic classes of hands
+
+Results of all engines and of solver do not change when suits are renamed,
+so hands that differ by a permutation of suits only form one class. To get
+canonical form of a hand its suits are renamed in order of decreasing rank
+mask (bit i is set when the suit has a card of i-th rank), then card codes
+are sorted. Suits with equal masks are interchangeable, so their order does
+not matter.
+"""
+
+import collections
+import itertools
+import math
+import sys
+import threading
+import numpy as np
+from .base import suits, deck_size
+
+# All 24 permutations of suit indexes
+suit_permutations = tuple(itertools.permutations(range(len(suits))))
+MemoStats = collections.namedtuple(
+    'MemoStats', ('hits', 'misses', 'evictions', 'size', 'nbytes'))
+
+
+def _relabel(keys):
+    """Rename suits in order of decreasing keys
+
+    :param keys: key of every suit
+    :type keys: list
+
+    :return: new index of every suit and number of suit permutations that
+             keep the keys (i.e. hand) the same
+    :type: tuple
+    """
+    order = sorted(range(len(suits)), key=keys.__getitem__, reverse=True)
+    relabel = [0] * len(suits)
+    for new, old in enumerate(order):
+        relabel[old] = new
+    symmetries = math.prod(math.factorial(n)
+                           for n in collections.Counter(keys).values())
+    return relabel, symmetries
+
+
+def sizeof(value):
+    """Estimate size of a value in memory, items of tuples are counted too
+
+    :param value: value, e.g. tuple or NumPy array
+    :type value: object
+
+    :return: size in bytes
+    :type: int
+    """
+    if isinstance(value, np.ndarray):
+        # View does not own its data, so it is counted separately
+        return sys.getsizeof(value) + (0 if value.base is None
+                                       else value.nbytes)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def canonicalize(cards):
+    """Get canonical form of a hand
+
+    :param cards: card codes
+    :type cards: sequence
+
+    :return: sorted card codes of canonical form, position of every card in
+             canonical form and number of different hands in the class
+    :type: tuple
+    """
+    masks = [0] * len(suits)
+    for code in cards:
+        masks[code & 3] |= 1 << (code >> 2)
+    relabel, symmetries = _relabel(masks)
+    renamed = [code & ~3 | relabel[code & 3] for code in cards]
+    form = tuple(sorted(renamed))
+    positions = tuple(form.index(code) for code in renamed)
+    return form, positions, len(suit_permutations) // symmetries
+
+
+def canonical_form(cards):
+    """Get canonical form of a hand
+
+    :param cards: card codes
+    :type cards: sequence
+
+    :return: sorted card codes of canonical form
+    :type: tuple
+    """
+    return canonicalize(cards)[0]
+
+
+def canonical_hold(cards, hold):
+    """Get canonical form of a dealt hand with a hold, i.e. of pair of held
+    and discarded cards
+
+    :param cards: five dealt card codes
+    :type cards: sequence
+    :param hold: hold mask, bit i is set when i-th card stays on hand
+    :type hold: int
+
+    :return: sorted codes of held cards, sorted codes of discarded cards and
+             number of different pairs in the class
+    :type: tuple
+    """
+    held_masks, discarded_masks = [0] * len(suits), [0] * len(suits)
+    for i, code in enumerate(cards):
+        masks = held_masks if hold >> i & 1 else discarded_masks
+        masks[code & 3] |= 1 << (code >> 2)
+    relabel, symmetries = _relabel(list(zip(held_masks, discarded_masks)))
+    held, discarded = [], []
+    for i, code in enumerate(cards):
+        (held if hold >> i & 1 else discarded).append(
+            code & ~3 | relabel[code & 3])
+    return (tuple(sorted(held)), tuple(sorted(discarded)),
+            len(suit_permutations) // symmetries)
+
+
+def canonical_holds(positions):
+    """Map hold masks of a hand to hold masks of its canonical form
+
+    :param positions: position of every card in canonical form, see
+                      canonicalize()
+    :type positions: sequence
+
+    :return: canonical hold mask for every hold mask
+    :type: list
+    """
+    return [sum(1 << position for i, position in enumerate(positions)
+                if hold >> i & 1) for hold in range(32)]
+
+
+def pack_forms(forms):
+    """Pack sorted hands into numbers, 6 bits per card
+
+    :param forms: N×5 array of sorted card codes
+    :type forms: array_like
+
+    :return: N-length array of keys, order of keys is the same as
+             lexicographic order of hands
+    :type: numpy.ndarray
+    """
+    return np.asarray(forms, dtype=np.int64) @ np.array(
+        [1 << 6*(4-column) for column in range(5)], dtype=np.int64)
+
+
+def unpack_forms(keys):
+    """Unpack keys made by pack_forms()
+
+    :param keys: N-length array of keys
+    :type keys: array_like
+
+    :return: N×5 array of sorted card codes
+    :type: numpy.ndarray
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    return np.stack([keys >> 6*(4-column) & 63 for column in range(5)],
+                    axis=1)
+
+
+def canonicalize_batch(cards):
+    """Get canonical forms of many hands at once, see canonicalize()
+
+    :param cards: N×5 array of card codes
+    :type cards: array_like
+
+    :return: N-length array of packed canonical forms (see pack_forms()) and
+             N×5 array of position of every card in canonical form
+    :type: tuple
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    card_ranks, card_suits = cards >> 2, cards & 3
+    rows = np.arange(len(cards))
+    masks = np.zeros((len(cards), len(suits)), dtype=np.int64)
+    for column in range(5):
+        masks[rows, card_suits[:, column]] |= 1 << card_ranks[:, column]
+    # Stable sort keeps order of suits with equal masks, as sorted() does
+    order = np.argsort(-masks, axis=1, kind='stable')
+    relabel = np.argsort(order, axis=1)
+    renamed = card_ranks << 2 | relabel[rows[:, None], card_suits]
+    order = np.argsort(renamed, axis=1)
+    forms = np.take_along_axis(renamed, order, axis=1)
+    return pack_forms(forms), np.argsort(order, axis=1)
+
+
+def canonical_deals():
+    """Get all suit-isomorphic classes of 5-card deals from a 52-card deck
+
+    :return: N×5 array of canonical forms and N-length array of numbers of
+             deals in every class (134,459 classes of 2,598,960 deals)
+    :type: tuple
+    """
+    deals = np.array(list(itertools.combinations(range(deck_size), 5)),
+                     dtype=np.int64)
+    keys, _ = canonicalize_batch(deals)
+    keys, counts = np.unique(keys, return_counts=True)
+    return unpack_forms(keys), counts
+
+
+class Memo:
+    """Bounded memo of results by canonical form, least recently used
+    results are dropped first when number of results or their approximate
+    size in memory is over the limit. Memo may be shared by threads: results
+    are calculated without the lock, so a slow calculation does not block
+    other threads
+    """
+
+    def __init__(self, function=None, maxsize=100000, maxbytes=None):
+        """Class Memo constructor
+
+        :param function: function of canonical form, may be omitted if memo
+                         is used with get() only
+        :type function: callable
+        :param maxsize: maximal number of stored results
+        :type maxsize: int
+        :param maxbytes: maximal size of stored results and their keys in
+                         bytes, default = no limit
+        :type maxbytes: int
+        """
+        self.function = function
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        # Key is mapped to result and its size
+        self.results = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, form):
+        """Get result for canonical form, calculate it if needed
+
+        :param form: canonical form
+        :type form: tuple
+
+        :return: result of the function
+        """
+        return self.get(form, self.function, form)
+
+    def get(self, key, function, *args):
+        """Get result by key, calculate it as function(*args) if needed
+
+        :param key: key of result, e.g. canonical form with other parameters
+                    of calculation
+        :type key: hashable
+        :param function: function that calculates result
+        :type function: callable
+
+        :return: result of the function
+        """
+        with self.lock:
+            try:
+                self.results.move_to_end(key)
+                result = self.results[key][0]
+                self.hits += 1
+                return result
+            except KeyError:
+                self.misses += 1
+        result = function(*args)
+        size = sizeof(key) + sizeof(result)
+        with self.lock:
+            # Another thread may have stored the same key meanwhile
+            if key in self.results:
+                self.nbytes -= self.results.pop(key)[1]
+            self.results[key] = (result, size)
+            self.nbytes += size
+            while len(self.results) > self.maxsize or (
+                    self.maxbytes is not None
+                    and self.nbytes > self.maxbytes):
+                _, (_, size) = self.results.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+        return result
+
+    def stats(self):
+        """Get counters of memo
+
+        :return: numbers of hits, misses and evictions, number of stored
+                 results and their approximate size in bytes
+        :type: MemoStats
+        """
+        with self.lock:
+            return MemoStats(hits=self.hits, misses=self.misses,
+                             evictions=self.evictions,
+                             size=len(self.results), nbytes=self.nbytes)
+
+    def clear(self):
+        """Drop all results, counters are kept"""
+        with self.lock:
+            self.results.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.results)
@@ -0,0 +1,111 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Deck of cards kept as compact array of card codes
+
+Cards are dealt by partial Fisher–Yates shuffle: a random card of the rest
+of the deck is swapped with the top one and the top is moved down, so every
+card costs one random number and one swap. Deck is reset by moving the top
+back, cards are not reallocated; order left by previous rounds does not
+matter, since every dealt card is taken uniformly from the rest.
+
+deal() deals many rounds at once as rows of an array, for the simulator and
+multi-play.
+"""
+
+import numpy as np
+from .base import deck_size
+from .rng import CryptoGenerator
+
+
+class Deck:
+    """Deck of card codes"""
+
+    def __init__(self, cards=None, rng=None):
+        """Class Deck constructor
+
+        :param cards: card codes of the deck, default = all 52 cards (see
+                      BaseEngine.deck)
+        :type cards: iterable
+        :param rng: random generator with method integers(low, high) that
+                    takes array of lower bounds, default = new
+                    numpy.random.Generator
+        :type rng: numpy.random.Generator
+        """
+        self.cards = bytearray(range(deck_size) if cards is None else cards)
+        self.initial = bytes(self.cards)
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.top = 0
+
+    def __len__(self):
+        """Number of cards left in the deck"""
+        return len(self.cards) - self.top
+
+    def reset(self, rng=None):
+        """Return all dealt cards to the deck
+
+        :param rng: new random generator, deck gets initial order of cards
+                    with it, so its deals depend on the generator only,
+                    default = keep generator and order of cards
+        :type rng: numpy.random.Generator
+        """
+        if rng is not None:
+            self.rng = rng
+            self.cards[:] = self.initial
+        self.top = 0
+
+    def deal(self, k=1):
+        """Deal cards from the deck
+
+        :param k: number of cards, default = 1
+        :type k: int
+
+        :return: card codes
+        :type: list
+
+        :raise ValueError: deck has less than k cards
+        """
+        cards, top, size = self.cards, self.top, len(self.cards)
+        if k > size - top:
+            raise ValueError('Not enough cards in the deck: ', size - top)
+        # Random positions of all k cards are drawn at once
+        positions = self.rng.integers(np.arange(top, top + k), size).tolist()
+        for i, j in enumerate(positions, start=top):
+            cards[i], cards[j] = cards[j], cards[i]
+        self.top = top + k
+        return list(cards[top:top + k])
+
+
+def deal(rng, n, k=10, deck=None):
+    """Take first k cards of n shuffled decks (partial Fisher–Yates shuffle)
+
+    :param rng: random generator
+    :type rng: numpy.random.Generator or CryptoGenerator
+    :param n: number of decks
+    :type n: int
+    :param k: number of cards to take from every deck
+    :type k: int
+    :param deck: card codes of a deck, default = all 52 cards
+    :type deck: array_like
+
+    :return: n×k array of card codes without repeats in a row
+    :type: numpy.ndarray
+    """
+    if deck is None:
+        deck = np.arange(deck_size, dtype=np.int8)
+    deck = np.asarray(deck, dtype=np.int8)
+    decks = np.tile(deck, (n, 1))
+    # Cards are swapped in the flat array, by offsets of rows
+    cards = decks.reshape(-1)
+    rows = np.arange(0, cards.size, len(deck))
+    if isinstance(rng, CryptoGenerator):
+        # Words of all k columns are taken from the buffer at once
+        offsets = rng.below_rows(len(deck) - np.arange(k), n)
+        positions = (i + offsets[i] for i in range(k))
+    else:
+        positions = (rng.integers(i, len(deck), size=n) for i in range(k))
+    for i, j in enumerate(positions):
+        top, other = rows + i, rows + j
+        cards[top], cards[other] = cards[other], cards[top]
+    return decks[:, :k]
@@ -0,0 +1,55 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Deuces and Joker Wild engine, 53-card deck where deuces and joker are
+wild cards
+
+The engine is for analysis only (engine.returns, engine.simulator and
+others): the game can not be played, since the game window has no joker card,
+so it is not registered (see engine.registry) and has no caption or color.
+"""
+
+import collections
+from .base import combination_enum, build_paytable
+from .wild import WildEngine
+
+
+# Table of winnings
+poker_winnings = collections.OrderedDict((
+    ('Natural Royal Flush', [250, 500, 750, 1000, 4000]),
+    ('Five Wild Cards',     [2000, 4000, 6000, 8000, 10000]),
+    ('Four Deuces',         [25,  50,  75,  100,  125]),
+    ('Wild Royal Flush',    [12,  24,  36,  48,   60]),
+    ('Five of a Kind',      [9,   18,  27,  36,   45]),
+    ('Straight Flush',      [6,   12,  18,  24,   30]),
+    ('Four of a Kind',      [3,   6,   9,   12,   15]),
+    ('Full House',          [3,   6,   9,   12,   15]),
+    ('Flush',               [3,   6,   9,   12,   15]),
+    ('Straight',            [2,   4,   6,   8,    10]),
+    ('Three of a Kind',     [1,   2,   3,   4,    5])
+))
+combination_names = poker_winnings.keys()
+# Integer combination IDs and table of winnings indexed by them
+Combination = combination_enum(combination_names)
+paytable = build_paytable(poker_winnings)
+
+
+class DeucesJokerWild(WildEngine):
+    """Class for 'Deuces and Joker Wild' engine"""
+    rules = (
+        ('natural_royal_flush', None),
+        ('wild_cards', 5),
+        ('wild_ranks', 4),
+        ('wild_royal_flush', None),
+        ('five_of_a_kind', None),
+        ('straight_flush', None),
+        ('four_of_a_kind', None),
+        ('full_house', None),
+        ('flush', None),
+        ('straight', None),
+        ('three_of_a_kind', None)
+    )
+    wild_ranks = ('2',)
+    joker = True
+    combinations = tuple(combination_names)
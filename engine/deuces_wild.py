@@ -5,12 +5,11 @@
 """Deuces Wild engine"""
 
 import collections
-from .base import suits, suit_list, ranks, BaseEngine
+from .base import suits, suit_list, ranks, code_suits, code_ranks, \
+    code_primes, rank_indexes, rank_key, rank_histogram, combination_enum, \
+    build_paytable, BaseEngine
 
 
-CAPTION = 'Deuces Wild'
-BACKGROUND_COLOR = (50, 0, 10)
-
 # Table of winnings
 poker_winnings = collections.OrderedDict((
     ('Natural Royal Flush', [250, 500, 750, 1000, 4000]),
@@ -25,14 +24,30 @@ poker_winnings = collections.OrderedDict((
     ('Three of a Kind',     [1,   2,   3,   4,    5])
 ))
 combination_names = poker_winnings.keys()
+# Integer combination IDs and table of winnings indexed by them
+Combination = combination_enum(combination_names)
+paytable = build_paytable(poker_winnings)
 
 
 class DeucesWild(BaseEngine):
     """Deuces Wild game engine
     """
     ranks_straight = [set(ranks[i:i+5]) for i in range(1, 9)]
+    # Rank masks of the same straights and of royal flush, used in histogram
+    # mode
+    straight_masks = tuple(0b11111 << i for i in range(1, 9))
+    royal_mask = straight_masks[-1]
+    wild_ranks = ('2',)
+    combinations = tuple(combination_names)
+
+    def __init__(self, mode='sequence'):
+        """Class DeucesWild constructor
 
-    def __init__(self):
+        :param mode: evaluation mode, see BaseEngine. Lookup table is keyed
+                     by ranks of all cards (i.e. number of deuces and ranks
+                     of other cards) and suited flag of non-deuce cards
+        :type mode: str
+        """
         self.analytical_sequence = (
             self.natural_royal_flush,
             self.four_deuces,
@@ -45,6 +60,7 @@ class DeucesWild(BaseEngine):
             self.straight,
             self.three_of_a_kind
         )
+        super().__init__(mode)
 
     def __call__(self, card_suits, card_ranks):
         """Check for winning combination and return result if any, deuces are
@@ -54,6 +70,102 @@ class DeucesWild(BaseEngine):
         :type: str
         """
         super().__call__(card_suits, card_ranks)
+        if self.table is not None:
+            return self.table[rank_key(card_ranks)][
+                self.suited(card_suits, card_ranks)]
+        if self.mode == 'histogram':
+            return self.classify(
+                [rank_indexes[rank] for rank in card_ranks if rank != '2'],
+                card_ranks.count('2'), self.suited(card_suits, card_ranks))
+        return self.analyze(card_suits, card_ranks)
+
+    def evaluate(self, cards):
+        """Check for winning combination of five card codes without checks
+
+        :param cards: five card codes
+        :type cards: sequence
+
+        :return: winning combination
+        :type: str
+        """
+        if self.table is not None:
+            a, b, c, d, e = cards
+            # Deuces have codes 0..3
+            return self.table[
+                code_primes[a] * code_primes[b] * code_primes[c] *
+                code_primes[d] * code_primes[e]
+            ][len({code & 3 for code in cards if code > 3}) == 1]
+        if self.mode == 'histogram':
+            naturals = [code for code in cards if code > 3]
+            return self.classify([code >> 2 for code in naturals],
+                                 5 - len(naturals),
+                                 len({code & 3 for code in naturals}) == 1)
+        return self.analyze([code_suits[code] for code in cards],
+                            [code_ranks[code] for code in cards])
+
+    def evaluate_batch(self, cards):
+        """Check for winning combinations of many hands at once
+
+        :param cards: N×5 array of card codes
+        :type cards: array_like
+
+        :return: N-length array of combination indexes, see BaseEngine
+        :type: numpy.ndarray
+        """
+        # Batch module imports this one, so it is imported on demand
+        from . import batch
+        return batch.deuces_wild(cards)
+
+    def classify(self, card_ranks, deuces, suited):
+        """Classify hand by histogram of ranks of non-deuce cards, gives
+        the same results as analytical sequence
+
+        :param card_ranks: rank indexes of non-deuce cards
+        :type card_ranks: sequence
+        :param deuces: number of deuces
+        :type deuces: int
+        :param suited: True if there are non-deuce cards and all of them have
+                       the same suit
+        :type suited: bool
+
+        :return: winning combination
+        :type: str
+        """
+        histogram, mask = rank_histogram(card_ranks)
+        if not deuces and suited and mask == self.royal_mask:
+            return 'Natural Royal Flush'
+        if deuces == 4:
+            return 'Four Deuces'
+        if deuces and suited and mask & ~self.royal_mask == 0:
+            return 'Deuces Royal Flush'
+        if 5 - deuces in histogram:
+            return 'Five of a Kind'
+        # Windows of straight flush depend on number of deuces
+        if suited and any(mask & ~window == 0 for window
+                          in self.straight_masks[:len(self.straight_masks)
+                                                 - deuces - 1]):
+            return 'Straight Flush'
+        if 4 - deuces in histogram:
+            return 'Four of a Kind'
+        shape = set(histogram) - {0}
+        if (deuces, shape) in ((2, {1, 2}), (1, {2}), (0, {2, 3})):
+            return 'Full House'
+        if suited:
+            return 'Flush'
+        if deuces and max(histogram) <= 1 and any(
+                mask & ~window == 0 for window in self.straight_masks) \
+                or not deuces and mask in self.straight_masks:
+            return 'Straight'
+        if 3 - deuces in histogram:
+            return 'Three of a Kind'
+        return ''
+
+    def analyze(self, card_suits, card_ranks):
+        """Run analytical sequence for checked cards
+
+        :return: winning combination
+        :type: str
+        """
         self.deuces = 0
         self.card_suits = []
         self.card_ranks = []
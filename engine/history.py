@@ -0,0 +1,167 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Hand history: append-only binary log of played rounds
+
+File starts with a 16-byte header (magic, version, size of record) followed
+by fixed-width records of 24 bytes, one per round:
+- session: row ID of the session in the database, 0 for sessions that are
+  not kept (see vpoker.Dbase)
+- round: round number in the session, a round of a kept session is
+  regenerated by session.replay()
+- game: code of the game in registry (see registry.Game)
+- coins: number of coins bet on every hand
+- hands: number of hands of multi-play
+- hold: hold mask, bit i is set when i-th card is held
+- dealt: five dealt card codes
+- drawn: card code drawn to every position, NO_CARD for held cards
+- combination: combination ID of the main hand (see BaseEngine.evaluate_id)
+- reserved: zero
+
+Records are never changed, so the file is read by memory mapping as a NumPy
+structured array without parsing. A record cut by a crash is ignored by
+load() and cut off when the file is opened for appending, so next records
+stay aligned.
+"""
+
+import os
+import struct
+import numpy as np
+
+MAGIC = b'VPHIST'
+VERSION = 2
+NO_CARD = 0xFF
+record = np.dtype([
+    ('session', '<u4'),
+    ('round', '<u4'),
+    ('game', np.uint8),
+    ('coins', np.uint8),
+    ('hands', np.uint8),
+    ('hold', np.uint8),
+    ('dealt', np.uint8, 5),
+    ('drawn', np.uint8, 5),
+    ('combination', np.uint8),
+    ('reserved', np.uint8)
+])
+header = struct.Struct('<6sHH6x')
+# Layout of record for writing
+row = struct.Struct('<II4B5B5BBx')
+
+
+class History:
+    """Writer of hand history"""
+
+    def __init__(self, path):
+        """Class History constructor, opens file for appending, writes
+        header to a new file and cuts off a record or a header cut by a
+        crash
+
+        :param path: path to history file
+        :type path: str
+
+        :raise ValueError: file is not a hand history of this version
+        """
+        self.path = path
+        self.file = open(path, 'ab')
+        size = self.file.tell()
+        expected = header.pack(MAGIC, VERSION, record.itemsize)
+        try:
+            if size < header.size:
+                with open(path, 'rb') as f:
+                    if not expected.startswith(f.read()):
+                        raise ValueError('Not a hand history file: ', path)
+                self.file.truncate(0)
+                self.file.write(expected)
+                self.file.flush()
+            else:
+                check_header(path)
+                torn = (size - header.size) % record.itemsize
+                if torn:
+                    self.file.truncate(size - torn)
+        except ValueError:
+            self.file.close()
+            raise
+
+    def append(self, session, number, game, coins, hands, dealt, hold, drawn,
+               combination):
+        """Write a round
+
+        :param session: row ID of the session in the database, 0 if the
+                        session is not kept
+        :type session: int
+        :param number: round number in the session
+        :type number: int
+        :param game: code of the game in registry
+        :type game: int
+        :param coins: number of coins, 1..5
+        :type coins: int
+        :param hands: number of hands of multi-play, 1..255
+        :type hands: int
+        :param dealt: five dealt card codes
+        :type dealt: sequence
+        :param hold: hold mask
+        :type hold: int
+        :param drawn: drawn card codes in order of positions that are not
+                      held
+        :type drawn: sequence
+        :param combination: combination ID of the main hand
+        :type combination: int
+        """
+        drawn = iter(drawn)
+        slots = [NO_CARD if hold >> i & 1 else next(drawn) for i in range(5)]
+        self.file.write(row.pack(session, number, game, coins, hands, hold,
+                                 *dealt, *slots, combination))
+        # Every round is on disk before the next one is dealt
+        self.file.flush()
+
+    def close(self):
+        """Close history file"""
+        self.file.close()
+
+
+def check_header(path):
+    """Check header of history file
+
+    :param path: path to history file
+    :type path: str
+
+    :raise ValueError: file is not a hand history of this version
+    """
+    with open(path, 'rb') as f:
+        data = f.read(header.size)
+    if len(data) < header.size or \
+            header.unpack(data) != (MAGIC, VERSION, record.itemsize):
+        raise ValueError('Not a hand history file: ', path)
+
+
+def load(path):
+    """Map history file into memory, records are read by OS on access
+
+    :param path: path to history file
+    :type path: str
+
+    :return: structured array of records, see record, read-only
+    :type: numpy.ndarray
+
+    :raise ValueError: file is not a hand history of this version
+    """
+    check_header(path)
+    n = (os.path.getsize(path) - header.size) // record.itemsize
+    if n == 0:
+        return np.zeros(0, dtype=record)
+    return np.memmap(path, dtype=record, mode='r', offset=header.size,
+                     shape=(n,))
+
+
+def final_hands(records):
+    """Get final cards of main hands
+
+    :param records: records, see load()
+    :type records: numpy.ndarray
+
+    :return: N×5 array of card codes
+    :type: numpy.ndarray
+    """
+    held = (records['hold'][:, None] >> np.arange(5) & 1).astype(bool)
+    return np.where(held, records['dealt'], records['drawn'])
@@ -8,9 +8,6 @@ import collections
 from .base import *
 
 
-CAPTION = 'Jacks or Better'
-BACKGROUND_COLOR = (0, 65, 15)
-
 # Table of winnings
 poker_winnings = collections.OrderedDict((
     ('Royal Flush',     [250, 500, 750, 1000, 4000]),
@@ -24,10 +21,15 @@ poker_winnings = collections.OrderedDict((
     ('Jacks or Better', [1,   2,   3,   4,    5])
 ))
 combination_names = poker_winnings.keys()
+# Integer combination IDs and table of winnings indexed by them
+Combination = combination_enum(combination_names)
+paytable = build_paytable(poker_winnings)
 
 
 class JacksOrBetter(RankOrBetter):
     """Class for 'Jacks or Better' engine"""
+    pair_ranks = ('J', 'Q', 'K', 'A')
+    combinations = tuple(combination_names)
 
     def rank_or_better(self):
         """Check for Jacks or Better
@@ -35,7 +37,7 @@ class JacksOrBetter(RankOrBetter):
         :return: 'Jacks or Better'
         :type: str
         """
-        for rank in ['J', 'Q', 'K', 'A']:
+        for rank in self.pair_ranks:
             if self.card_ranks.count(rank) == 2:
                 return 'Jacks or Better'
         return ''
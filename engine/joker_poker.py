@@ -0,0 +1,56 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Joker Poker (Kings or Better) engine, 53-card deck with joker as the only
+wild card
+
+The engine is for analysis only (engine.returns, engine.simulator and
+others): the game can not be played, since the game window has no joker card,
+so it is not registered (see engine.registry) and has no caption or color.
+"""
+
+import collections
+from .base import combination_enum, build_paytable
+from .wild import straight_masks, wheel_mask, WildEngine
+
+
+# Table of winnings
+poker_winnings = collections.OrderedDict((
+    ('Royal Flush',      [250, 500, 750, 1000, 4000]),
+    ('Five of a Kind',   [200, 400, 600, 800,  1000]),
+    ('Wild Royal Flush', [100, 200, 300, 400,  500]),
+    ('Straight Flush',   [50,  100, 150, 200,  250]),
+    ('Four of a Kind',   [20,  40,  60,  80,   100]),
+    ('Full House',       [7,   14,  21,  28,   35]),
+    ('Flush',            [5,   10,  15,  20,   25]),
+    ('Straight',         [3,   6,   9,   12,   15]),
+    ('Three of a Kind',  [2,   4,   6,   8,    10]),
+    ('Two Pairs',        [1,   2,   3,   4,    5]),
+    ('Kings or Better',  [1,   2,   3,   4,    5])
+))
+combination_names = poker_winnings.keys()
+# Integer combination IDs and table of winnings indexed by them
+Combination = combination_enum(combination_names)
+paytable = build_paytable(poker_winnings)
+
+
+class JokerPoker(WildEngine):
+    """Class for 'Joker Poker' engine"""
+    rules = (
+        ('natural_royal_flush', None),
+        ('five_of_a_kind', None),
+        ('wild_royal_flush', None),
+        ('straight_flush', None),
+        ('four_of_a_kind', None),
+        ('full_house', None),
+        ('flush', None),
+        ('straight', None),
+        ('three_of_a_kind', None),
+        ('two_pairs', None),
+        ('rank_or_better', 'K')
+    )
+    joker = True
+    # A-2-3-4-5 is a straight in Joker Poker
+    straights = straight_masks + (wheel_mask,)
+    combinations = tuple(combination_names)
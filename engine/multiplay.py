@@ -0,0 +1,70 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Multi-play: one hold is applied to many hands
+
+All hands get the same dealt cards and the same hold. Every hand draws its
+cards from its own copy of the rest of the deck, so draws of hands are
+independent. Draws are dealt and evaluated for all hands at once.
+"""
+
+import numpy as np
+from .base import deck_size
+from .deck import deal
+
+
+def draw_hands(rng, dealt, hold, n, deck=None):
+    """Draw cards of n hands
+
+    :param rng: random generator
+    :type rng: numpy.random.Generator
+    :param dealt: five dealt card codes
+    :type dealt: sequence
+    :param hold: hold mask, bit i is set when i-th card stays on hand
+    :type hold: int
+    :param n: number of hands
+    :type n: int
+    :param deck: card codes of a deck, default = all 52 cards
+    :type deck: array_like
+
+    :return: n×5 array of final hands, held cards keep their positions
+    :type: numpy.ndarray
+    """
+    dealt = np.asarray(dealt, dtype=np.int8)
+    held = (hold >> np.arange(5) & 1).astype(bool)
+    if deck is None:
+        deck = np.arange(deck_size, dtype=np.int8)
+    rest = np.setdiff1d(np.asarray(deck, dtype=np.int8), dealt)
+    hands = np.tile(dealt, (n, 1))
+    hands[:, ~held] = deal(rng, n, int((~held).sum()), rest)
+    return hands
+
+
+def play_hands(engine, paytable, rng, dealt, hold, n, coins):
+    """Draw and evaluate n hands
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param paytable: winnings by combination ID and number of coins, see
+                     build_paytable()
+    :type paytable: numpy.ndarray
+    :param rng: random generator
+    :type rng: numpy.random.Generator
+    :param dealt: five dealt card codes
+    :type dealt: sequence
+    :param hold: hold mask, bit i is set when i-th card stays on hand
+    :type hold: int
+    :param n: number of hands
+    :type n: int
+    :param coins: number of coins bet on every hand, 1..5
+    :type coins: int
+
+    :return: final hands (n×5), numbers of hands by combination ID and total
+             winning (in creds)
+    :type: tuple
+    """
+    hands = draw_hands(rng, dealt, hold, n, engine.deck)
+    combinations = engine.evaluate_batch(hands)
+    return (hands, np.bincount(combinations, minlength=len(paytable)),
+            int(paytable[combinations, coins-1].sum()))
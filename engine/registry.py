@@ -0,0 +1,180 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Registry of games
+
+Every game is registered with its code, caption and background color and
+with names of its engine module and engine class. Code is a stable number of
+the game in files (see engine.history), it does not depend on order of
+registration and is never reused. Engine module is imported (and
+its tables are built) only when the game is chosen, so a menu of games costs
+nothing. Registry is the only source of captions and colors, engine modules
+do not have them.
+
+Engine modules do not register themselves, since that would import all of
+them to show the menu: to add a game, write its engine module and register
+it below. Engines of games with joker (engine.joker_poker,
+engine.deuces_joker_wild) are for analysis only and are not registered,
+since the game window can not show a joker.
+"""
+
+import collections
+import importlib
+
+
+class Game:
+    """Registered game"""
+
+    def __init__(self, name, code, caption, background_color, module,
+                 engine_class):
+        """Class Game constructor
+
+        :param name: game name, e.g. 'jacks_or_better'
+        :type name: str
+        :param code: stable number of the game, 1..255
+        :type code: int
+        :param caption: caption shown to player
+        :type caption: str
+        :param background_color: RGB background color of game window
+        :type background_color: tuple
+        :param module: full name of engine module, it must have
+                       poker_winnings, combination_names, Combination and
+                       paytable (see engine.jacks_or_better)
+        :type module: str
+        :param engine_class: name of engine class in the module
+        :type engine_class: str
+        """
+        self.name = name
+        self.code = code
+        self.caption = caption
+        self.background_color = background_color
+        self.module_name = module
+        self.engine_class_name = engine_class
+        self._module = None
+
+    @property
+    def module(self):
+        """Engine module, imported on first access
+
+        :type: module
+        """
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    @property
+    def engine_class(self):
+        """Engine class
+
+        :type: type
+        """
+        return getattr(self.module, self.engine_class_name)
+
+    @property
+    def poker_winnings(self):
+        """Table of winnings
+
+        :type: collections.OrderedDict
+        """
+        return self.module.poker_winnings
+
+    @property
+    def combination_names(self):
+        """Names of winning combinations in order of table of winnings
+
+        :type: list
+        """
+        return list(self.module.combination_names)
+
+    @property
+    def combinations(self):
+        """Enumeration of combination IDs, see base.combination_enum()
+
+        :type: enum.IntEnum
+        """
+        return self.module.Combination
+
+    @property
+    def paytable(self):
+        """Table of winnings indexed by combination ID and number of coins,
+        see base.build_paytable()
+
+        :type: numpy.ndarray
+        """
+        return self.module.paytable
+
+    def create(self, mode='sequence'):
+        """Create engine of the game
+
+        :param mode: evaluation mode, see BaseEngine
+        :type mode: str
+
+        :return: engine
+        :type: BaseEngine
+        """
+        return self.engine_class(mode)
+
+
+games = collections.OrderedDict()
+
+
+def register(name, code, caption, background_color, module, engine_class):
+    """Register a game, parameters are the same as of Game
+
+    :return: registered game
+    :type: Game
+
+    :raise ValueError: game or its code is already registered, or code is
+                       out of range
+    """
+    if name in games:
+        raise ValueError('Game is already registered: ', name)
+    if not 1 <= code <= 255:
+        raise ValueError('Game code must be 1..255: ', code)
+    if any(game.code == code for game in games.values()):
+        raise ValueError('Game code is already registered: ', code)
+    games[name] = Game(name, code, caption, background_color, module,
+                       engine_class)
+    return games[name]
+
+
+def get(name):
+    """Get registered game
+
+    :param name: game name
+    :type name: str
+
+    :return: game
+    :type: Game
+
+    :raise KeyError: game is not registered
+    """
+    if name not in games:
+        raise KeyError('Unknown game: ', name)
+    return games[name]
+
+
+def get_by_code(code):
+    """Get registered game by its code
+
+    :param code: game code
+    :type code: int
+
+    :return: game
+    :type: Game
+
+    :raise KeyError: game is not registered
+    """
+    for game in games.values():
+        if game.code == code:
+            return game
+    raise KeyError('Unknown game code: ', code)
+
+
+register('tens_or_better', 1, 'Tens or Better', (0, 25, 50),
+         'engine.tens_or_better', 'TensOrBetter')
+register('jacks_or_better', 2, 'Jacks or Better', (0, 65, 15),
+         'engine.jacks_or_better', 'JacksOrBetter')
+register('deuces_wild', 3, 'Deuces Wild', (50, 0, 10),
+         'engine.deuces_wild', 'DeucesWild')
@@ -0,0 +1,197 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Exact theoretical return of a game under optimal play
+
+Every suit-isomorphic class of deals is solved once and weighted by number of
+deals in it. Classes are spread across a pool of processes.
+
+Usage:
+    python -m engine.returns jacks_or_better --coins 5 --processes 8
+"""
+
+import argparse
+import collections
+import importlib
+import math
+import multiprocessing
+import numpy as np
+from . import registry
+from .base import deck_size, BaseEngine, build_paytable
+from .canonical import canonical_deals
+from .solver import Solver
+
+Report = collections.namedtuple(
+    'Report', ('return_rate', 'hit_frequency', 'probabilities'))
+Risk = collections.namedtuple(
+    'Risk', ('variance', 'standard_deviation', 'covariance', 'contributions'))
+
+# Solver of a worker process
+_solver = None
+
+
+def load_game(name):
+    """Create engine of a registered game (see registry) or import engine
+    module and create its engine
+
+    :param name: game name or name of module in engine package, e.g.
+                 'jacks_or_better'
+    :type name: str
+
+    :return: engine and its table of winnings
+    :type: tuple
+
+    :raise ImportError: engine module does not exist
+    :raise ValueError: module has no engine
+    """
+    if name in registry.games:
+        game = registry.get(name)
+        return game.create(), game.poker_winnings
+    module = importlib.import_module('engine.' + name)
+    if not hasattr(module, 'poker_winnings'):
+        raise ValueError('No table of winnings in module: ', name)
+    for value in vars(module).values():
+        if isinstance(value, type) and issubclass(value, BaseEngine) \
+                and value.__module__ == module.__name__:
+            return value(), module.poker_winnings
+    raise ValueError('No engine in module: ', name)
+
+
+def init_worker(engine, poker_winnings):
+    """Create solver in a worker process
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param poker_winnings: table of winnings of the engine
+    :type poker_winnings: collections.OrderedDict
+    """
+    global _solver
+    _solver = Solver(engine, poker_winnings)
+
+
+def solve_deals(task):
+    """Play deals optimally and sum probabilities of final combinations
+
+    :param task: array of deals, array of their weights, number of coins
+    :type task: tuple
+
+    :return: weighted sum of combination probabilities
+    :type: numpy.ndarray
+    """
+    deals, weights, coins = task
+    pays = _solver.pays(coins)
+    total = np.zeros(len(_solver.combinations))
+    for cards, weight in zip(deals.tolist(), weights.tolist()):
+        probabilities = _solver.hold_probabilities(cards)
+        total += weight * probabilities[(probabilities @ pays).argmax()]
+    return total
+
+
+def calculate(engine, poker_winnings, coins=5, processes=None,
+              deals=None, chunk_size=500):
+    """Calculate return, hit frequency and probabilities of combinations
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param poker_winnings: table of winnings of the engine
+    :type poker_winnings: collections.OrderedDict
+    :param coins: number of coins, 1..5, default = 5
+    :type coins: int
+    :param processes: number of worker processes, default = number of CPUs,
+                      1 means no pool at all
+    :type processes: int
+    :param deals: deals and their weights, default = all suit-isomorphic
+                  classes of deals (see canonical_deals())
+    :type deals: tuple
+    :param chunk_size: number of deals solved by a worker at once
+    :type chunk_size: int
+
+    :return: return (as a share of bet), hit frequency and probabilities of
+             combinations ('' for no winning combination)
+    :type: Report
+
+    :raise ValueError: engine is played with other deck than 52 cards
+    """
+    if len(engine.deck) != deck_size:
+        raise ValueError('Only games with 52-card deck can be solved: ',
+                         type(engine).__name__)
+    if deals is None:
+        deals = canonical_deals()
+    deals, weights = deals
+    tasks = [(deals[i:i+chunk_size], weights[i:i+chunk_size], coins)
+             for i in range(0, len(deals), chunk_size)]
+    if processes == 1:
+        init_worker(engine, poker_winnings)
+        results = map(solve_deals, tasks)
+        total = sum(results, np.zeros(len(poker_winnings) + 1))
+    else:
+        with multiprocessing.Pool(processes, init_worker,
+                                  (engine, poker_winnings)) as pool:
+            total = sum(pool.imap_unordered(solve_deals, tasks),
+                        np.zeros(len(poker_winnings) + 1))
+    probabilities = total / weights.sum()
+    pays = [winnings[coins-1] for winnings in poker_winnings.values()]
+    return Report(
+        return_rate=float(probabilities[:-1] @ pays) / coins,
+        hit_frequency=float(1 - probabilities[-1]),
+        probabilities=collections.OrderedDict(
+            zip(list(poker_winnings) + [''], probabilities.tolist()))
+    )
+
+
+def risk(report, poker_winnings, coins=5):
+    """Calculate variance of winning of a round under optimal play
+
+    :param report: report of calculate() for the same table of winnings
+                   and number of coins
+    :type report: Report
+    :param poker_winnings: table of winnings of the engine
+    :type poker_winnings: collections.OrderedDict
+    :param coins: number of coins, 1..5, default = 5
+    :type coins: int
+
+    :return: variance and standard deviation of winning (in bets, i.e. as a
+             share of bet), covariance matrix of winnings of combinations
+             (in order of table of winnings; its sum is the variance) and
+             contribution of every combination to the variance
+    :type: Risk
+    """
+    probabilities = np.array([report.probabilities[name]
+                              for name in poker_winnings])
+    pays = build_paytable(poker_winnings)[:-1, coins-1] / coins
+    covariance = -np.outer(probabilities * pays, probabilities * pays)
+    covariance[np.diag_indices_from(covariance)] += probabilities * pays**2
+    variance = float(covariance.sum())
+    return Risk(
+        variance=variance,
+        standard_deviation=math.sqrt(variance),
+        covariance=covariance,
+        contributions=collections.OrderedDict(
+            zip(poker_winnings, covariance.sum(axis=1).tolist()))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Calculate exact return of a video poker game')
+    parser.add_argument('game', help='engine module, e.g. jacks_or_better')
+    parser.add_argument('--coins', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+    engine, poker_winnings = load_game(args.game)
+    report = calculate(engine, poker_winnings, args.coins, args.processes)
+    print('Return:        {:.6%}'.format(report.return_rate))
+    print('Hit frequency: {:.6%}'.format(report.hit_frequency))
+    variance = risk(report, poker_winnings, args.coins)
+    print('Variance:      {:.4f}'.format(variance.variance))
+    print('Std deviation: {:.4f}'.format(variance.standard_deviation))
+    print('{:<20} {:>12} {:>12}'.format('', 'Probability', 'Variance'))
+    for name, probability in report.probabilities.items():
+        print('{:<20} {:.10f} {:>12.4f}'.format(
+            name or 'Nothing', probability,
+            variance.contributions.get(name, 0)))
+
+
+if __name__ == '__main__':
+    main()
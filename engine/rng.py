@@ -0,0 +1,323 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Random generators of dealing
+
+Backends:
+- 'default': numpy.random.Generator with PCG64, seeded streams (see
+  session), rounds can be replayed
+- 'mt19937': numpy.random.Generator with Mersenne Twister, seeded streams
+- 'crypto': CryptoGenerator, cryptographically secure random numbers of
+  OpenSSL (ssl.RAND_bytes, NIST SP 800-90A DRBG seeded and reseeded by the
+  operating system), or of the operating system (os.urandom) if Python has
+  no ssl module, it can not be seeded
+
+CryptoGenerator reads random bytes in large blocks, so a call is made once
+per thousands of cards; OpenSSL makes them about ten times faster than the
+system call of os.urandom. Bounded integers are made from the shortest
+words that fit a range (a byte per card) by rejection sampling with
+multiplication instead of division (Lemire's method): a word maps to value
+of the range by high bits of word × range, words that would map to a value
+once more than others are dropped, so all values are equally likely. Words
+of many rows of ranges (positions of all cards of deck.deal()) are taken
+from the buffer at once.
+"""
+
+import os
+import math
+import numpy as np
+try:
+    from ssl import RAND_bytes as random_bytes
+except ImportError:
+    random_bytes = os.urandom
+
+backends = ('default', 'mt19937', 'crypto')
+# Size of a block of random bytes read at once
+BLOCK_SIZE = 1 << 16
+# Maximal number of integers drawn one by one, bigger arrays are vectorized
+SMALL_SIZE = 16
+# Unsigned types of words by size in bytes and types of their products
+word_types = {1: (np.uint8, np.uint16), 2: (np.uint16, np.uint32),
+              4: (np.uint32, np.uint64)}
+
+
+class CryptoGenerator:
+    """Buffered cryptographically secure generator with a subset of
+    interface of numpy.random.Generator used by dealing
+    """
+
+    def __init__(self, block_size=BLOCK_SIZE):
+        """Class CryptoGenerator constructor
+
+        :param block_size: number of random bytes read at once
+        :type block_size: int
+        """
+        self.block_size = block_size
+        self.buffer = b''
+        self.position = 0
+
+    def refill(self, size):
+        """Read a new block of entropy, keeping the rest of the buffer
+
+        :param size: minimal number of bytes in the buffer
+        :type size: int
+        """
+        rest = self.buffer[self.position:]
+        self.buffer = rest + random_bytes(
+            max(self.block_size, size - len(rest)))
+        self.position = 0
+
+    def take(self, n, dtype=np.uint32):
+        """Take random words from buffer, buffer is refilled when it has
+        not enough bytes
+
+        :param n: number of words
+        :type n: int
+        :param dtype: unsigned integer type of words
+        :type dtype: numpy.dtype
+
+        :return: n words, read-only view of the buffer
+        :type: numpy.ndarray
+        """
+        size = n * np.dtype(dtype).itemsize
+        if self.position + size > len(self.buffer):
+            self.refill(size)
+        words = np.frombuffer(self.buffer, dtype=dtype, count=n,
+                              offset=self.position)
+        self.position += size
+        return words
+
+    def integers(self, low, high=None, size=None):
+        """Draw integers uniformly from [low, high)
+
+        :param low: lowest value, or exclusive upper bound if high is None
+        :type low: int or array_like
+        :param high: exclusive upper bound
+        :type high: int or array_like
+        :param size: shape of result, default = broadcast shape of bounds
+        :type size: int or tuple
+
+        :return: integers, int if bounds are numbers and size is None
+        :type: numpy.ndarray or int
+
+        :raise ValueError: range is empty or wider than 2**32
+        """
+        if high is None:
+            low, high = 0, low
+        low = np.asarray(low, dtype=np.int64)
+        spans = np.asarray(high, dtype=np.int64) - low
+        if size is None:
+            shape = spans.shape
+        else:
+            shape = (size,) if isinstance(size, int) else tuple(size)
+        n = math.prod(shape)
+        if n <= SMALL_SIZE:
+            if spans.shape != shape:
+                spans = np.broadcast_to(spans, shape)
+            values = np.array(self.below_list(spans.ravel().tolist()),
+                              dtype=np.int64)
+        elif spans.min() < 1 or spans.max() > 1 << 32:
+            raise ValueError('Range must have 1..2**32 values')
+        elif spans.min() == spans.max():
+            values = self.below_array(int(spans.flat[0]), n)
+        elif len(shape) == 2 and spans.shape == (shape[0], 1):
+            values = self.below_rows(spans[:, 0], shape[1])
+        else:
+            values = self.below_arrays(spans, shape)
+        # Sum of int64 and uint64 would be float
+        values = low + values.reshape(shape).astype(np.int64, copy=False)
+        return int(values) if values.ndim == 0 else values
+
+    def below(self, span):
+        """Draw one integer uniformly from [0, span)
+
+        :param span: number of values, 1..2**32
+        :type span: int
+
+        :return: integer
+        :type: int
+
+        :raise ValueError: range is empty or wider than 2**32
+        """
+        return self.below_list((span,))[0]
+
+    def below_list(self, spans):
+        """Draw integers uniformly from [0, span) one by one, it is faster
+        than arrays for a few integers
+
+        :param spans: number of values of every integer, 1..2**32
+        :type spans: iterable
+
+        :return: integers
+        :type: list
+
+        :raise ValueError: range is empty or wider than 2**32
+        """
+        values = []
+        buffer, position = self.buffer, self.position
+        for span in spans:
+            if not 1 <= span <= 1 << 32:
+                self.position = position
+                raise ValueError('Range must have 1..2**32 values')
+            size = word_size(span)
+            bits = 8 * size
+            mask, threshold = (1 << bits) - 1, (1 << bits) % span
+            while True:
+                if position + size > len(buffer):
+                    self.position = position
+                    self.refill(size)
+                    buffer, position = self.buffer, self.position
+                if size == 1:
+                    product = buffer[position] * span
+                else:
+                    product = int.from_bytes(
+                        buffer[position:position + size], 'little') * span
+                position += size
+                if product & mask >= threshold:
+                    values.append(product >> bits)
+                    break
+        self.position = position
+        return values
+
+    def below_array(self, span, n):
+        """Draw integers uniformly from [0, span)
+
+        :param span: number of values, 1..2**32
+        :type span: int
+        :param n: number of integers
+        :type n: int
+
+        :return: integers, unsigned
+        :type: numpy.ndarray
+        """
+        return self.below_rows(np.array([span]), n)[0]
+
+    def below_rows(self, spans, n):
+        """Draw rows of integers uniformly from [0, span) of every row, all
+        words are taken from the buffer at once
+
+        :param spans: number of values of every row, 1..2**32
+        :type spans: numpy.ndarray
+        :param n: number of integers in a row
+        :type n: int
+
+        :return: len(spans)×n array of integers, unsigned
+        :type: numpy.ndarray
+        """
+        size = word_size(int(spans.max()))
+        bits = 8 * size
+        word, wide = word_types[size]
+        mask = wide((1 << bits) - 1)
+        thresholds = [(1 << bits) % span for span in spans.tolist()]
+        # Values are independent, so words of every row are drawn with a
+        # margin for rejected ones and accepted values are packed
+        counts = [int(n * (1 << bits) / ((1 << bits) - threshold) * 1.01)
+                  + 16 for threshold in thresholds]
+        words = self.take(sum(counts), word)
+        values = np.empty((len(spans), n), dtype=wide)
+        start = 0
+        for row, (span, threshold, count) in enumerate(
+                zip(spans.tolist(), thresholds, counts)):
+            products = words[start:start + count] * wide(span)
+            # numpy.compress() packs much faster than boolean indexing
+            accepted = np.compress(products & mask >= threshold, products)
+            # The margin is short very rarely, then the rest is drawn
+            while len(accepted) < n:
+                products = self.take(n - len(accepted) + 16, word) \
+                    * wide(span)
+                accepted = np.concatenate((accepted, np.compress(
+                    products & mask >= threshold, products)))
+            values[row] = accepted[:n] >> bits
+            start += count
+        return values
+
+    def below_arrays(self, spans, shape):
+        """Draw integers uniformly from [0, span) for every span
+
+        :param spans: numbers of values, 1..2**32, broadcastable to shape
+        :type spans: numpy.ndarray
+        :param shape: shape of result
+        :type shape: tuple
+
+        :return: integers, unsigned
+        :type: numpy.ndarray
+        """
+        spans = np.broadcast_to(spans, shape).ravel()
+        size = word_size(int(spans.max()))
+        bits = 8 * size
+        word, wide = word_types[size]
+        mask = wide((1 << bits) - 1)
+        spans = spans.astype(wide)
+        thresholds = wide(1 << bits) % spans
+        values = np.empty(len(spans), dtype=wide)
+        pending = np.arange(len(spans))
+        # Rejected words are drawn again
+        while pending.size:
+            products = self.take(pending.size, word) * spans[pending]
+            accepted = products & mask >= thresholds[pending]
+            values[pending[accepted]] = products[accepted] >> bits
+            pending = pending[~accepted]
+        return values
+
+    def random(self, size=None):
+        """Draw floats uniformly from [0, 1) with 53 random bits
+
+        :param size: shape of result, default = one float
+        :type size: int or tuple
+
+        :return: floats
+        :type: numpy.ndarray or float
+        """
+        n = 1 if size is None else int(np.prod(size))
+        values = (self.take(n, np.uint64) >> np.uint64(11)) / float(1 << 53)
+        return float(values[0]) if size is None else values.reshape(size)
+
+
+def word_size(span):
+    """Pick the shortest word for a range, so few bytes of entropy are spent
+    and at most a quarter of words is rejected
+
+    :param span: number of values, 1..2**32
+    :type span: int
+
+    :return: size of word in bytes
+    :type: int
+    """
+    if span <= 1 << 6:
+        return 1
+    if span <= 1 << 14:
+        return 2
+    return 4
+
+
+# Generator of 'crypto' backend shared by a process, it has no seed; child
+# processes get their own generator, so they never reuse buffered words
+_crypto = {}
+
+
+def generator(backend='default', seed=None):
+    """Create random generator
+
+    :param backend: name of backend, see backends
+    :type backend: str
+    :param seed: seed (int or numpy.random.SeedSequence), ignored by
+                 'crypto' backend, default = fresh entropy
+    :type seed: int
+
+    :return: random generator
+    :type: numpy.random.Generator or CryptoGenerator
+
+    :raise ValueError: unknown backend
+    """
+    if backend == 'default':
+        return np.random.default_rng(seed)
+    if backend == 'mt19937':
+        return np.random.Generator(np.random.MT19937(seed))
+    if backend == 'crypto':
+        pid = os.getpid()
+        if pid not in _crypto:
+            _crypto.clear()
+            _crypto[pid] = CryptoGenerator()
+        return _crypto[pid]
+    raise ValueError('Unknown random backend: ', backend)
@@ -0,0 +1,343 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Paytable sensitivity analysis
+
+Counts of final combinations of every hold of every suit-isomorphic class of
+deals do not depend on table of winnings, so they are calculated once and
+kept. Return of any table of winnings is then a re-weighting of kept counts
+and a choice of the best hold of every class. As in returns.calculate(), the
+hold with the lowest mask is taken when several holds have the maximal
+expected winning. A hold which probabilities of every winning combination
+are not greater than ones of a hold with lower mask is never taken for table
+of winnings without negative values, so it is not kept.
+
+Usage:
+    python -m engine.sensitivity jacks_or_better --cache job.npz \\
+        --variant "Full House=8" --variant "Flush=5" \\
+        --variant "Royal Flush=250,500,750,1000,4800"
+"""
+
+import argparse
+import collections
+import multiprocessing
+import os
+import numpy as np
+from .base import build_paytable
+from .canonical import canonical_deals
+from .solver import Solver, draws
+from .returns import Report, load_game, risk
+
+# Solver of a worker process
+_solver = None
+
+
+def init_worker(engine, poker_winnings):
+    """Create solver in a worker process
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param poker_winnings: table of winnings of the engine
+    :type poker_winnings: collections.OrderedDict
+    """
+    global _solver
+    _solver = Solver(engine, poker_winnings)
+
+
+def useful_holds(counts):
+    """Find holds that may be the best for some table of winnings
+
+    :param counts: 32×(number of combinations + 1) array of counts of final
+                   combinations, see Solver.hold_counts()
+    :type counts: numpy.ndarray
+
+    :return: hold masks in increasing order; a hold is dropped if a hold
+             with lower mask has not less probability of every winning
+             combination, since that hold has not less expected winning and
+             wins ties
+    :type: numpy.ndarray
+    """
+    # Probabilities are compared as exact fractions: counts[g]/draws[g]
+    # against counts[h]/draws[h]
+    winning = counts[:, :-1]
+    not_less = (winning[:, None, :] * draws[None, :, None]
+                >= winning[None, :, :] * draws[:, None, None]).all(axis=2)
+    return np.flatnonzero(~np.triu(not_less, 1).any(axis=0))
+
+
+def count_deals(task):
+    """Count final combinations of useful holds of deals
+
+    :param task: array of deals
+    :type task: numpy.ndarray
+
+    :return: deal number in task, hold mask and counts of every kept hold
+    :type: tuple
+    """
+    rows, masks, counts = [], [], []
+    for row, cards in enumerate(task.tolist()):
+        hold_counts = _solver.hold_counts(cards)
+        useful = useful_holds(hold_counts)
+        rows.append(np.full(len(useful), row, dtype=np.int32))
+        masks.append(useful.astype(np.uint8))
+        counts.append(hold_counts[useful].astype(np.int32))
+    return np.concatenate(rows), np.concatenate(masks), np.concatenate(counts)
+
+
+class Analyzer:
+    """Return of a game under optimal play for many tables of winnings"""
+
+    def __init__(self, combinations, deals, weights, rows, masks, counts):
+        """Class Analyzer constructor, use Analyzer.solve() or
+        Analyzer.load() to create an analyzer
+
+        :param combinations: names of winning combinations in order of
+                             table of winnings
+        :type combinations: list
+        :param deals: N×5 array of suit-isomorphic classes of deals
+        :type deals: numpy.ndarray
+        :param weights: number of deals in every class
+        :type weights: numpy.ndarray
+        :param rows: class number of every kept hold, non-decreasing
+        :type rows: numpy.ndarray
+        :param masks: hold mask of every kept hold
+        :type masks: numpy.ndarray
+        :param counts: counts of final combinations of every kept hold, the
+                       last column is for hands without winning combination
+        :type counts: numpy.ndarray
+        """
+        self.combinations = list(combinations)
+        self.deals = deals
+        self.weights = weights
+        self.rows = rows
+        self.masks = masks
+        self.counts = counts
+        # The first kept hold of every class
+        self.offsets = np.searchsorted(rows, np.arange(len(deals)))
+
+    @classmethod
+    def solve(cls, engine, poker_winnings, processes=None, deals=None,
+              chunk_size=500):
+        """Count final combinations of every class of deals
+
+        :param engine: game engine
+        :type engine: BaseEngine
+        :param poker_winnings: table of winnings of the engine, its values
+                               are not used
+        :type poker_winnings: collections.OrderedDict
+        :param processes: number of worker processes, default = number of
+                          CPUs, 1 means no pool at all
+        :type processes: int
+        :param deals: deals and their weights, default = all suit-isomorphic
+                      classes of deals (see canonical_deals())
+        :type deals: tuple
+        :param chunk_size: number of deals solved by a worker at once
+        :type chunk_size: int
+
+        :return: analyzer
+        :type: Analyzer
+        """
+        if deals is None:
+            deals = canonical_deals()
+        deals, weights = deals
+        tasks = [deals[i:i+chunk_size]
+                 for i in range(0, len(deals), chunk_size)]
+        if processes == 1:
+            init_worker(engine, poker_winnings)
+            results = list(map(count_deals, tasks))
+        else:
+            with multiprocessing.Pool(processes, init_worker,
+                                      (engine, poker_winnings)) as pool:
+                results = pool.map(count_deals, tasks)
+        rows = np.concatenate([result[0] + i*chunk_size
+                               for i, result in enumerate(results)])
+        masks = np.concatenate([result[1] for result in results])
+        counts = np.concatenate([result[2] for result in results])
+        return cls(poker_winnings, deals, weights, rows, masks, counts)
+
+    @classmethod
+    def load(cls, path):
+        """Load analyzer saved by save()
+
+        :param path: file path
+        :type path: str
+
+        :return: analyzer
+        :type: Analyzer
+        """
+        with np.load(path) as data:
+            return cls(data['combinations'].tolist(), data['deals'],
+                       data['weights'], data['rows'], data['masks'],
+                       data['counts'])
+
+    def save(self, path):
+        """Save counts to a file
+
+        :param path: file path, should end with .npz
+        :type path: str
+        """
+        np.savez_compressed(
+            path, combinations=np.array(self.combinations), deals=self.deals,
+            weights=self.weights, rows=self.rows, masks=self.masks,
+            counts=self.counts)
+
+    def pays(self, poker_winnings, coins):
+        """Get winnings of every combination for a bet
+
+        :param poker_winnings: table of winnings
+        :type poker_winnings: collections.OrderedDict
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: winnings by combination index, the last one is 0
+        :type: numpy.ndarray
+
+        :raise ValueError: combinations differ from analyzed ones or
+                           winnings are negative
+        """
+        if list(poker_winnings) != self.combinations:
+            raise ValueError('Combinations differ from analyzed ones: ',
+                             list(poker_winnings))
+        pays = build_paytable(poker_winnings)[:, coins-1]
+        if (pays < 0).any():
+            raise ValueError('Winnings must not be negative: ', pays)
+        return pays
+
+    def best_holds(self, poker_winnings, coins=5):
+        """Find the best kept hold of every class of deals
+
+        :param poker_winnings: table of winnings
+        :type poker_winnings: collections.OrderedDict
+        :param coins: number of coins, 1..5, default = 5
+        :type coins: int
+
+        :return: index of the best kept hold of every class, the one with
+                 the lowest mask is taken if several holds have the same
+                 expected winning (see returns.calculate())
+        :type: numpy.ndarray
+
+        :raise: see pays()
+        """
+        values = self.counts @ self.pays(poker_winnings, coins) \
+            / draws[self.masks]
+        best = values >= np.maximum.reduceat(values, self.offsets)[self.rows]
+        candidates = np.flatnonzero(best)
+        _, first = np.unique(self.rows[candidates], return_index=True)
+        return candidates[first]
+
+    def analyze(self, poker_winnings, coins=5):
+        """Calculate return, hit frequency and probabilities of combinations
+
+        :param poker_winnings: table of winnings with the same combinations
+                               as analyzed one
+        :type poker_winnings: collections.OrderedDict
+        :param coins: number of coins, 1..5, default = 5
+        :type coins: int
+
+        :return: see returns.calculate()
+        :type: Report
+
+        :raise: see pays()
+        """
+        best = self.best_holds(poker_winnings, coins)
+        probabilities = self.weights @ (
+            self.counts[best] / draws[self.masks[best], None]) \
+            / self.weights.sum()
+        return Report(
+            return_rate=float(
+                probabilities @ self.pays(poker_winnings, coins)) / coins,
+            hit_frequency=float(1 - probabilities[-1]),
+            probabilities=collections.OrderedDict(
+                zip(self.combinations + [''], probabilities.tolist()))
+        )
+
+    def sweep(self, variants, coins=5):
+        """Analyze many tables of winnings
+
+        :param variants: tables of winnings
+        :type variants: iterable
+        :param coins: number of coins, 1..5, default = 5
+        :type coins: int
+
+        :return: report of every table of winnings
+        :type: list
+
+        :raise: see pays()
+        """
+        return [self.analyze(variant, coins) for variant in variants]
+
+
+def vary(poker_winnings, name, pay):
+    """Copy table of winnings with changed winnings of a combination
+
+    :param poker_winnings: table of winnings
+    :type poker_winnings: collections.OrderedDict
+    :param name: combination name
+    :type name: str
+    :param pay: winnings for 1 coin, winnings for more coins are multiples;
+                or winnings for 1..5 coins, e.g. with a bonus for 5 coins
+    :type pay: int or sequence
+
+    :return: new table of winnings
+    :type: collections.OrderedDict
+
+    :raise KeyError: combination does not exist
+    :raise ValueError: winnings for 1 coin are given for a combination with
+                       a bonus for 5 coins, or there are not 5 winnings
+    """
+    if name not in poker_winnings:
+        raise KeyError('Unknown combination: {}'.format(name))
+    variant = collections.OrderedDict(poker_winnings)
+    if np.ndim(pay) == 0:
+        row = poker_winnings[name]
+        if list(row) != [row[0] * coins for coins in range(1, 6)]:
+            raise ValueError('Winnings of {} are not multiples, give them '
+                             'for 1..5 coins: {}'.format(name, list(row)))
+        variant[name] = [pay * coins for coins in range(1, 6)]
+    else:
+        if len(pay) != 5:
+            raise ValueError('Winnings for 1..5 coins are needed: '
+                             '{}'.format(list(pay)))
+        variant[name] = list(pay)
+    return variant
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Calculate return of a video poker game for changed '
+                    'tables of winnings')
+    parser.add_argument('game', help='engine module, e.g. jacks_or_better')
+    parser.add_argument('--coins', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--cache', help='file to keep counts in (.npz), '
+                                        'it is created if does not exist')
+    parser.add_argument('--variant', action='append', default=[],
+                        metavar='NAME=PAY',
+                        help='winnings of a combination for 1 coin, or '
+                             'for 1..5 coins separated by commas')
+    args = parser.parse_args()
+    engine, poker_winnings = load_game(args.game)
+    if args.cache and os.path.exists(args.cache):
+        analyzer = Analyzer.load(args.cache)
+    else:
+        analyzer = Analyzer.solve(engine, poker_winnings,
+                                  processes=args.processes)
+        if args.cache:
+            analyzer.save(args.cache)
+    variants = [('Original', poker_winnings)]
+    for variant in args.variant:
+        name, pay = variant.rsplit('=', 1)
+        pay = [int(value) for value in pay.split(',')]
+        variants.append((variant, vary(poker_winnings, name,
+                                       pay[0] if len(pay) == 1 else pay)))
+    for title, variant in variants:
+        report = analyzer.analyze(variant, args.coins)
+        print('{:<30} return {:.6%}, hit frequency {:.6%}, '
+              'variance {:.4f}'.format(
+                  title, report.return_rate, report.hit_frequency,
+                  risk(report, variant, args.coins).variance))
+
+
+if __name__ == '__main__':
+    main()
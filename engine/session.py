@@ -0,0 +1,151 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Seeded sessions and replay of rounds
+
+Session has one seed. Every round of every table of a session gets its own
+random streams derived from (seed, table, round number, substream), so
+streams are independent and any round can be regenerated without replaying
+the rounds before it. A round is kept as its number and hold mask only:
+dealt cards, drawn cards and draws of other hands of multi-play are
+regenerated by replay().
+
+Sessions with 'crypto' random backend (see rng) have no seed: all rounds are
+dealt from the generator of the operating system and can not be replayed.
+"""
+
+import collections
+import numpy as np
+from .deck import Deck
+from .multiplay import draw_hands
+from .rng import generator
+
+# Substreams of a round
+DEAL = 0  # Dealt and drawn cards of the main hand
+MULTIPLAY = 1  # Draws of other hands of multi-play
+
+Round = collections.namedtuple(
+    'Round', ('number', 'dealt', 'hold', 'final', 'combination', 'hands'))
+
+
+class Session:
+    """Random streams of a session"""
+
+    def __init__(self, seed=None, table=0, backend='default'):
+        """Class Session constructor
+
+        :param seed: seed of the session, default = fresh entropy (see seed
+                     attribute to reproduce the session)
+        :type seed: int
+        :param table: number of table (or worker) of the session, tables
+                      have independent streams
+        :type table: int
+        :param backend: random backend, see rng.backends, seed is None with
+                        'crypto' backend
+        :type backend: str
+        """
+        self.backend = backend
+        self.seed = None if backend == 'crypto' \
+            else np.random.SeedSequence(seed).entropy
+        self.table = table
+        self.rounds = 0
+
+    def stream(self, number, substream=DEAL):
+        """Get random generator of a round
+
+        :param number: round number, from 0
+        :type number: int
+        :param substream: substream of the round, DEAL or MULTIPLAY
+        :type substream: int
+
+        :return: random generator, the same for the same arguments unless
+                 session has no seed
+        :type: numpy.random.Generator or CryptoGenerator
+        """
+        if self.seed is None:
+            return generator(self.backend)
+        return generator(self.backend, np.random.SeedSequence(
+            self.seed, spawn_key=(self.table, number, substream)))
+
+    def tables(self, n):
+        """Get sessions of n tables with the same seed
+
+        :param n: number of tables
+        :type n: int
+
+        :return: sessions of tables 0..n-1
+        :type: list
+        """
+        return [Session(self.seed, table, self.backend)
+                for table in range(n)]
+
+    def new_round(self):
+        """Start a new round
+
+        :return: round number
+        :type: int
+        """
+        number = self.rounds
+        self.rounds += 1
+        return number
+
+    def deal(self, deck, number):
+        """Reset deck with the stream of a round and deal five cards, the
+        rest of the round is drawn from the same deck
+
+        :param deck: deck of the game
+        :type deck: Deck
+        :param number: round number
+        :type number: int
+
+        :return: five card codes
+        :type: list
+        """
+        deck.reset(self.stream(number, DEAL))
+        return deck.deal(5)
+
+
+def replay(engine, seed, number, hold, table=0, hands=1,
+           backend='default'):
+    """Regenerate a round
+
+    :param engine: game engine of the session
+    :type engine: BaseEngine
+    :param seed: seed of the session
+    :type seed: int
+    :param number: round number
+    :type number: int
+    :param hold: hold mask of the round
+    :type hold: int
+    :param table: table of the session, default = 0
+    :type table: int
+    :param hands: number of hands of multi-play, default = 1
+    :type hands: int
+    :param backend: random backend of the session, default = 'default'
+    :type backend: str
+
+    :return: round number, dealt cards, hold mask, final cards, combination
+             ID of the main hand and (hands-1)×5 array of final cards of
+             other hands
+    :type: Round
+
+    :raise ValueError: session has no seed
+    """
+    if seed is None or backend == 'crypto':
+        raise ValueError('Rounds of unseeded session can not be replayed')
+    session = Session(seed, table, backend)
+    deck = Deck(engine.deck)
+    dealt = session.deal(deck, number)
+    drawn = iter(deck.deal(5 - bin(hold).count('1')))
+    final = [code if hold >> i & 1 else next(drawn)
+             for i, code in enumerate(dealt)]
+    return Round(
+        number=number,
+        dealt=dealt,
+        hold=hold,
+        final=final,
+        combination=engine.evaluate_id(final),
+        hands=draw_hands(session.stream(number, MULTIPLAY), dealt, hold,
+                         hands - 1, engine.deck)
+    )
@@ -0,0 +1,249 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Headless Monte Carlo simulation of many rounds
+
+Rounds are played in batches: deals and draws are taken from partially
+shuffled decks, hold strategy picks hold masks for the whole batch and final
+hands are scored by evaluate_batch() of the engine. Work is split into
+shards, every shard has its own RNG stream spawned from one seed, so results
+do not depend on number of processes. With 'crypto' random backend (see
+rng) seed is ignored and results can not be reproduced.
+
+Usage:
+    python -m engine.simulator jacks_or_better --hands 10000000 --seed 1
+"""
+
+import argparse
+import collections
+import itertools
+import multiprocessing
+import numpy as np
+from settings import RNG_BACKEND
+from .base import build_paytable
+from .deck import deal
+from .returns import load_game
+from .rng import backends, generator
+from .strategy import Strategy
+
+Report = collections.namedtuple(
+    'Report', ('hands', 'bet', 'won', 'combinations', 'payouts'))
+
+
+def hold_nothing(dealt):
+    """Strategy: draw five new cards
+
+    :param dealt: N×5 array of dealt card codes
+    :type dealt: numpy.ndarray
+
+    :return: N-length array of hold masks
+    :type: numpy.ndarray
+    """
+    return np.zeros(len(dealt), dtype=np.intp)
+
+
+def hold_everything(dealt):
+    """Strategy: keep dealt hand
+
+    :param dealt: N×5 array of dealt card codes
+    :type dealt: numpy.ndarray
+
+    :return: N-length array of hold masks
+    :type: numpy.ndarray
+    """
+    return np.full(len(dealt), 31, dtype=np.intp)
+
+
+def hold_pairs(dealt):
+    """Strategy: keep cards which rank is dealt more than once
+
+    :param dealt: N×5 array of dealt card codes
+    :type dealt: numpy.ndarray
+
+    :return: N-length array of hold masks
+    :type: numpy.ndarray
+    """
+    card_ranks = np.ascontiguousarray(dealt.T >> 2)
+    held = np.zeros(len(dealt), dtype=np.intp)
+    for i, j in itertools.combinations(range(5), 2):
+        held |= (card_ranks[i] == card_ranks[j]) * (1 << i | 1 << j)
+    return held
+
+
+strategies = collections.OrderedDict((
+    ('nothing', hold_nothing),
+    ('everything', hold_everything),
+    ('pairs', hold_pairs)
+))
+
+
+def deal_chunks(rng, n, chunk_size=100000, k=10, deck=None):
+    """Generate cards of n rounds in chunks, see deal(). Every row is an
+    independent uniformly shuffled deck, so a row has the same distribution
+    as k cards dealt one by one without replacement. Memory is bounded by
+    chunk size for any number of rounds
+
+    :param rng: random generator
+    :type rng: numpy.random.Generator
+    :param n: number of rounds
+    :type n: int
+    :param chunk_size: maximal number of rounds in a chunk
+    :type chunk_size: int
+    :param k: number of cards of a round, default = 10 (five dealt and five
+              drawn cards)
+    :type k: int
+    :param deck: card codes of a deck, default = all 52 cards
+    :type deck: array_like
+
+    :return: generator of chunk_size×k arrays of card codes, the last chunk
+             may be shorter
+    :type: generator
+    """
+    for start in range(0, n, chunk_size):
+        yield deal(rng, min(chunk_size, n - start), k, deck)
+
+
+def play(engine, paytable, cards, coins, strategy):
+    """Play rounds
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param paytable: winnings by combination ID and number of coins, see
+                     build_paytable()
+    :type paytable: numpy.ndarray
+    :param cards: N×10 array of card codes of rounds: five dealt cards and
+                  five cards to draw from, see deal_chunks()
+    :type cards: numpy.ndarray
+    :param coins: number of coins, 1..5
+    :type coins: int
+    :param strategy: hold strategy, see hold_nothing()
+    :type strategy: callable
+
+    :return: numbers of combinations by index and winnings by round
+    :type: tuple
+    """
+    dealt, draws = cards[:, :5], cards[:, 5:]
+    held = (strategy(dealt)[:, None] >> np.arange(5) & 1).astype(bool)
+    combinations = engine.evaluate_batch(np.where(held, dealt, draws))
+    return (np.bincount(combinations, minlength=len(paytable)),
+            paytable[combinations, coins-1])
+
+
+def run_shard(task):
+    """Play rounds of one shard in chunks
+
+    :param task: engine, table of winnings, number of rounds, number of
+                 coins, strategy, seed sequence, chunk size and random
+                 backend
+    :type task: tuple
+
+    :return: numbers of combinations by index and numbers of rounds by
+             winning
+    :type: tuple
+    """
+    (engine, poker_winnings, n, coins, strategy, seed, chunk_size,
+     backend) = task
+    paytable = build_paytable(poker_winnings)
+    rng = generator(backend, seed)
+    combinations = np.zeros(len(paytable), dtype=np.int64)
+    payouts = np.zeros(paytable.max() + 1, dtype=np.int64)
+    for cards in deal_chunks(rng, n, chunk_size, deck=engine.deck):
+        counts, won = play(engine, paytable, cards, coins, strategy)
+        combinations += counts
+        payouts += np.bincount(won, minlength=len(payouts))
+    return combinations, payouts
+
+
+def simulate(engine, poker_winnings, hands, coins=5, strategy=hold_nothing,
+             seed=None, processes=None, shard_size=1000000,
+             chunk_size=100000, backend=RNG_BACKEND):
+    """Simulate rounds
+
+    :param engine: game engine
+    :type engine: BaseEngine
+    :param poker_winnings: table of winnings of the engine
+    :type poker_winnings: collections.OrderedDict
+    :param hands: number of rounds
+    :type hands: int
+    :param coins: number of coins, 1..5, default = 5
+    :type coins: int
+    :param strategy: hold strategy, gets N×5 array of dealt card codes and
+                     returns N-length array of hold masks (bit i is set when
+                     i-th card stays on hand), must be picklable
+    :type strategy: callable
+    :param seed: seed of RNG streams, default = fresh entropy
+    :type seed: int
+    :param processes: number of worker processes, default = number of CPUs,
+                      1 means no pool at all
+    :type processes: int
+    :param shard_size: number of rounds with one RNG stream
+    :type shard_size: int
+    :param chunk_size: number of rounds played at once
+    :type chunk_size: int
+    :param backend: random backend, see rng.backends, default = RNG_BACKEND
+    :type backend: str
+
+    :return: number of rounds, bet and won creds, numbers of combinations
+             ('' for no winning combination) and numbers of rounds by
+             winning
+    :type: Report
+    """
+    shards = [min(shard_size, hands - start)
+              for start in range(0, hands, shard_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+    tasks = [(engine, poker_winnings, n, coins, strategy, s, chunk_size,
+              backend) for n, s in zip(shards, seeds)]
+    if processes == 1:
+        results = list(map(run_shard, tasks))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(run_shard, tasks)
+    combinations = sum((c for c, _ in results),
+                       np.zeros(len(poker_winnings) + 1, dtype=np.int64))
+    payouts = collections.Counter()
+    for _, p in results:
+        for won in np.flatnonzero(p):
+            payouts[int(won)] += int(p[won])
+    return Report(
+        hands=hands,
+        bet=hands * coins,
+        won=sum(won * n for won, n in payouts.items()),
+        combinations=collections.OrderedDict(
+            zip(list(poker_winnings) + [''], combinations.tolist())),
+        payouts=collections.OrderedDict(sorted(payouts.items()))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate rounds of a video poker game')
+    parser.add_argument('game', help='engine module, e.g. jacks_or_better')
+    parser.add_argument('--hands', type=int, default=1000000)
+    parser.add_argument('--coins', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--strategy', default='pairs', choices=strategies)
+    parser.add_argument('--strategy-file',
+                        help='compiled strategy (.npz), see engine.strategy; '
+                             'overrides --strategy')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--rng', default=RNG_BACKEND, choices=backends)
+    args = parser.parse_args()
+    engine, poker_winnings = load_game(args.game)
+    if args.strategy_file:
+        strategy = Strategy.load(args.strategy_file)
+    else:
+        strategy = strategies[args.strategy]
+    report = simulate(engine, poker_winnings, args.hands, args.coins,
+                      strategy, args.seed, args.processes, backend=args.rng)
+    print('Hands:  {}'.format(report.hands))
+    print('Return: {:.4%}'.format(report.won / report.bet))
+    for name, n in report.combinations.items():
+        print('{:<20} {}'.format(name or 'Nothing', n))
+    print('Payouts:')
+    for won, n in report.payouts.items():
+        print('{:>6} {}'.format(won, n))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Exact expected value of every hold for a dealt hand
+
+Hold is a 5-bit mask, bit i is set when i-th dealt card stays on hand. Cards
+are drawn from the remaining 47 cards of the deck. Draws are not enumerated
+one by one: every multiset of drawn ranks is taken at once, number of draws
+with such ranks is a product of binomial coefficients, and number of suited
+draws among them is counted per suit. Then winning combination of the whole
+group is taken from the lookup table of the engine.
+"""
+
+import itertools
+import math
+import numpy as np
+from .base import suits, ranks, rank_primes, deck_size, build_paytable
+from .canonical import canonicalize, canonical_holds, Memo
+
+holds = range(32)
+# Hold masks grouped by number of drawn cards
+hold_groups = tuple([hold for hold in holds if 5 - bin(hold).count('1') == n]
+                    for n in range(6))
+# Number of possible draws by hold mask
+draws = np.array([math.comb(deck_size - 5, 5 - bin(hold).count('1'))
+                  for hold in holds], dtype=np.int64)
+
+
+def held_cards(cards, hold):
+    """Get cards that stay on hand
+
+    :param cards: five card codes
+    :type cards: sequence
+    :param hold: hold mask
+    :type hold: int
+
+    :return: held card codes
+    :type: list
+    """
+    return [code for i, code in enumerate(cards) if hold >> i & 1]
+
+
+def hold_mask(held):
+    """Make hold mask from flags of held cards
+
+    :param held: five flags, True if card stays on hand
+    :type held: iterable
+
+    :return: hold mask
+    :type: int
+    """
+    return sum(1 << i for i, flag in enumerate(held) if flag)
+
+
+class Solver:
+    """Solver for one engine and table of winnings"""
+
+    def __init__(self, engine, poker_winnings, cache_size=0):
+        """Class Solver constructor
+
+        :param engine: game engine
+        :type engine: BaseEngine
+        :param poker_winnings: table of winnings of the engine
+        :type poker_winnings: collections.OrderedDict
+        :param cache_size: number of suit-isomorphic classes of hands which
+                           counts are kept, default = 0 (no cache)
+        :type cache_size: int
+
+        :raise ValueError: engine is played with other deck than 52 cards
+        """
+        if len(engine.deck) != deck_size:
+            raise ValueError('Only games with 52-card deck can be solved: ',
+                             type(engine).__name__)
+        self.engine_class = type(engine)
+        self.poker_winnings = poker_winnings
+        self.paytable = build_paytable(poker_winnings)
+        # Winning combinations by index, the last one means no winning
+        self.combinations = list(poker_winnings) + ['']
+        table = engine.lookup_table()
+        keys = np.array(sorted(table), dtype=np.int64)
+        classes = np.array(
+            [[self.combinations.index(table[key][suited]) for key in keys]
+             for suited in (False, True)], dtype=np.intp)
+        self.wild = np.array([rank in engine.wild_ranks for rank in ranks])
+        # Multisets of drawn ranks for every number of drawn cards: ranks,
+        # number of the same rank before every card, product of factorials
+        # of rank counts and rank keys
+        self.draw_ranks = []
+        self.draw_repeats = []
+        self.draw_factorials = []
+        draw_keys = []
+        for n in range(6):
+            multisets = list(itertools.combinations_with_replacement(
+                range(len(ranks)), n))
+            shape = (len(multisets), n)
+            self.draw_ranks.append(
+                np.array(multisets, dtype=np.intp).reshape(shape))
+            self.draw_repeats.append(np.array(
+                [[m[:i].count(rank) for i, rank in enumerate(m)]
+                 for m in multisets], dtype=np.intp).reshape(shape))
+            self.draw_factorials.append(np.array(
+                [math.prod(math.factorial(m.count(rank)) for rank in set(m))
+                 for m in multisets], dtype=np.int64))
+            draw_keys.append(np.array(
+                [math.prod(rank_primes[ranks[rank]] for rank in m)
+                 for m in multisets], dtype=np.int64))
+        # Winning combinations of unsuited and suited final hands for every
+        # multiset of held ranks (by its rank key) and every draw
+        self.outcomes = {}
+        for k in range(6):
+            for multiset in itertools.combinations_with_replacement(
+                    ranks, k):
+                key = math.prod(rank_primes[rank] for rank in multiset)
+                self.outcomes[key] = classes[
+                    :, np.searchsorted(keys, key * draw_keys[5-k])]
+        self.memo = Memo(self.count_holds, cache_size) if cache_size \
+            else None
+
+    def pays(self, coins):
+        """Get winnings of every combination for a bet
+
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: winnings by combination index, the last one is 0
+        :type: numpy.ndarray
+        """
+        return self.paytable[:, coins-1]
+
+    def hold_counts(self, cards):
+        """Count final hands of every winning combination for every hold,
+        hands of the same suit-isomorphic class are counted once if cache is
+        enabled
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+
+        :return: 32×(number of combinations + 1) array, row is hold mask,
+                 column is combination index, the last column is for hands
+                 without winning combination
+        :type: numpy.ndarray
+        """
+        if self.memo is None:
+            return self.count_holds(cards)
+        form, positions, _ = canonicalize(cards)
+        return self.memo(form)[canonical_holds(positions)]
+
+    def count_holds(self, cards):
+        """Count final hands of every winning combination for every hold
+        without cache, see hold_counts()
+        """
+        dealt = np.zeros((len(ranks), len(suits)), dtype=bool)
+        for code in cards:
+            dealt[code >> 2, code & 3] = True
+        available = len(suits) - dealt.sum(axis=1)
+        # Number of ways to draw i-th card of a rank when the same rank was
+        # drawn j times before: in total and as suited card of every suit
+        # (a natural rank can be drawn only once then, wild ranks any way)
+        factors = np.zeros((len(suits) + 1, len(ranks), 5), dtype=np.int64)
+        factors[0] = np.maximum(available[:, None] - np.arange(5), 0)
+        factors[1:, :, 0] = ~dealt.T
+        factors[1:, self.wild] = factors[0, self.wild]
+        size = len(self.combinations)
+        result = np.zeros((len(holds), size), dtype=np.int64)
+        # Holds with the same number of drawn cards are counted together
+        for n, group in enumerate(hold_groups):
+            ways = factors[:, self.draw_ranks[n], self.draw_repeats[n]].prod(
+                axis=2) // self.draw_factorials[n]
+            # Suits of drawn cards that keep the hand suited, by hold
+            suit_choice = np.zeros((len(group), len(suits)), dtype=np.int64)
+            outcomes = []
+            for row, hold in enumerate(group):
+                held = held_cards(cards, hold)
+                key = 1
+                for code in held:
+                    key *= rank_primes[ranks[code >> 2]]
+                outcomes.append(self.outcomes[key])
+                held_suits = {code & 3 for code in held
+                              if not self.wild[code >> 2]}
+                if not held_suits:
+                    suit_choice[row] = 1
+                elif len(held_suits) == 1:
+                    suit_choice[row, held_suits.pop()] = 1
+            suited = suit_choice @ ways[1:]
+            outcomes = np.array(outcomes)
+            offset = np.arange(len(group))[:, None] * size
+            counts = np.bincount(
+                (offset + outcomes[:, 0]).ravel(),
+                weights=(ways[0] - suited).ravel(),
+                minlength=len(group) * size
+            ) + np.bincount(
+                (offset + outcomes[:, 1]).ravel(),
+                weights=suited.ravel(), minlength=len(group) * size
+            )
+            result[group] = counts.round().astype(np.int64).reshape(-1, size)
+        return result
+
+    def hold_probabilities(self, cards):
+        """Calculate exact distribution of final combinations of every hold
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+
+        :return: 32×(number of combinations + 1) array, row is hold mask,
+                 column is combination index, the last column is for hands
+                 without winning combination, every row sums to 1
+        :type: numpy.ndarray
+        """
+        return self.hold_counts(cards) / draws[:, None]
+
+    def hold_values(self, cards, coins):
+        """Calculate expected winning of every hold
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: expected winning (in creds) by hold mask
+        :type: numpy.ndarray
+        """
+        return self.hold_counts(cards) @ self.pays(coins) / draws
+
+    def hold_variances(self, cards, coins):
+        """Calculate variance of winning of every hold
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: variance of winning (in creds squared) by hold mask
+        :type: numpy.ndarray
+        """
+        probabilities = self.hold_probabilities(cards)
+        pays = self.pays(coins)
+        means = probabilities @ pays
+        return probabilities @ pays**2 - means**2
+
+    def best_hold(self, cards, coins):
+        """Find hold with maximal expected winning
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: hold mask and its expected winning
+        :type: tuple
+        """
+        values = self.hold_values(cards, coins)
+        hold = int(values.argmax())
+        return hold, float(values[hold])
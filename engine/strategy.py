@@ -0,0 +1,221 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Compiled optimal strategy
+
+The best hold of every suit-isomorphic class of deals is found once for an
+engine and a table of winnings (see sensitivity.Analyzer) and kept in a table
+keyed by packed canonical form of the deal. The best hold of any deal is then
+a table lookup. Strategy is also summarized as a list of hold patterns ranked
+by expected winning.
+
+Usage:
+    python -m engine.strategy jacks_or_better --cache job.npz \\
+        --output job_strategy.npz --list job_strategy.txt
+"""
+
+import argparse
+import collections
+import os
+import numpy as np
+from .base import code_ranks, code_suits
+from .canonical import canonicalize, canonicalize_batch, pack_forms, \
+    unpack_forms
+from .solver import draws
+from .sensitivity import Analyzer
+from .returns import load_game
+
+HoldPattern = collections.namedtuple(
+    'HoldPattern', ('pattern', 'value', 'frequency'))
+
+
+def describe_hold(cards, hold, wild_ranks=()):
+    """Describe held cards without their suits
+
+    :param cards: five dealt card codes
+    :type cards: sequence
+    :param hold: hold mask, bit i is set when i-th card stays on hand
+    :type hold: int
+    :param wild_ranks: ranks of wild cards, they do not affect suitedness
+    :type wild_ranks: tuple
+
+    :return: held ranks from the highest one, with 'suited' if at least two
+             non-wild cards are held and all of them have the same suit
+    :type: str
+    """
+    held = sorted((code for i, code in enumerate(cards) if hold >> i & 1),
+                  reverse=True)
+    if not held:
+        return 'Draw five cards'
+    pattern = ' '.join(code_ranks[code] for code in held)
+    held_suits = [code_suits[code] for code in held
+                  if code_ranks[code] not in wild_ranks]
+    if len(held_suits) > 1 and len(set(held_suits)) == 1:
+        pattern += ' suited'
+    return pattern
+
+
+class Strategy:
+    """Best hold of every suit-isomorphic class of deals"""
+
+    def __init__(self, keys, masks, values, weights):
+        """Class Strategy constructor, use compile_strategy() or
+        Strategy.load() to create a strategy
+
+        :param keys: packed canonical forms of classes, see pack_forms()
+        :type keys: numpy.ndarray
+        :param masks: the best hold mask of every class, bit i is set when
+                      i-th card of canonical form stays on hand
+        :type masks: numpy.ndarray
+        :param values: expected winning of the best hold of every class
+        :type values: numpy.ndarray
+        :param weights: number of deals in every class
+        :type weights: numpy.ndarray
+        """
+        order = np.argsort(keys)
+        self.keys = np.asarray(keys, dtype=np.int64)[order]
+        self.masks = np.asarray(masks, dtype=np.uint8)[order]
+        self.values = np.asarray(values, dtype=np.float64)[order]
+        self.weights = np.asarray(weights, dtype=np.int64)[order]
+        self.table = dict(zip(self.keys.tolist(), self.masks.tolist()))
+
+    @classmethod
+    def load(cls, path):
+        """Load strategy saved by save()
+
+        :param path: file path
+        :type path: str
+
+        :return: strategy
+        :type: Strategy
+        """
+        with np.load(path) as data:
+            return cls(data['keys'], data['masks'], data['values'],
+                       data['weights'])
+
+    def save(self, path):
+        """Save strategy to a file
+
+        :param path: file path, should end with .npz
+        :type path: str
+        """
+        np.savez_compressed(path, keys=self.keys, masks=self.masks,
+                            values=self.values, weights=self.weights)
+
+    def hold(self, cards):
+        """Get the best hold of a deal
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+
+        :return: hold mask, bit i is set when i-th card stays on hand
+        :type: int
+
+        :raise KeyError: class of the deal is not compiled
+        """
+        form, positions, _ = canonicalize(cards)
+        mask = self.table[int(pack_forms([form])[0])]
+        return sum(1 << i for i, position in enumerate(positions)
+                   if mask >> position & 1)
+
+    def __call__(self, dealt):
+        """Get the best holds of many deals, strategy can be passed to
+        simulator.simulate()
+
+        :param dealt: N×5 array of dealt card codes
+        :type dealt: numpy.ndarray
+
+        :return: N-length array of hold masks
+        :type: numpy.ndarray
+
+        :raise KeyError: class of a deal is not compiled
+        """
+        keys, positions = canonicalize_batch(dealt)
+        index = np.searchsorted(self.keys, keys).clip(0, len(self.keys) - 1)
+        if (self.keys[index] != keys).any():
+            raise KeyError('Deal is not compiled')
+        masks = self.masks[index].astype(np.intp)
+        return (masks[:, None] >> positions & 1) @ (1 << np.arange(5))
+
+    def ranked_holds(self, wild_ranks=()):
+        """Summarize strategy as hold patterns
+
+        :param wild_ranks: ranks of wild cards of the engine
+        :type wild_ranks: tuple
+
+        :return: patterns with mean expected winning and share of deals where
+                 the pattern is held, from the most valuable pattern
+        :type: list
+        """
+        weights = collections.Counter()
+        totals = collections.Counter()
+        for cards, mask, value, weight in zip(
+                unpack_forms(self.keys).tolist(), self.masks.tolist(),
+                self.values.tolist(), self.weights.tolist()):
+            pattern = describe_hold(cards, mask, wild_ranks)
+            weights[pattern] += weight
+            totals[pattern] += value * weight
+        deals = sum(weights.values())
+        result = [HoldPattern(pattern, totals[pattern] / weight,
+                              weight / deals)
+                  for pattern, weight in weights.items()]
+        result.sort(key=lambda item: (-item.value, item.pattern))
+        return result
+
+
+def compile_strategy(analyzer, poker_winnings, coins=5):
+    """Find the best hold of every class of deals analyzed
+
+    :param analyzer: counts of final combinations, see sensitivity.Analyzer
+    :type analyzer: Analyzer
+    :param poker_winnings: table of winnings
+    :type poker_winnings: collections.OrderedDict
+    :param coins: number of coins, 1..5, default = 5
+    :type coins: int
+
+    :return: strategy
+    :type: Strategy
+
+    :raise: see Analyzer.pays()
+    """
+    best = analyzer.best_holds(poker_winnings, coins)
+    masks = analyzer.masks[best]
+    values = analyzer.counts[best] @ analyzer.pays(poker_winnings, coins) \
+        / draws[masks]
+    return Strategy(pack_forms(analyzer.deals), masks, values,
+                    analyzer.weights)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compile optimal strategy of a video poker game')
+    parser.add_argument('game', help='engine module, e.g. jacks_or_better')
+    parser.add_argument('--coins', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--cache', help='file with counts (.npz), see '
+                                        'engine.sensitivity')
+    parser.add_argument('--output', required=True,
+                        help='file to save strategy to (.npz)')
+    parser.add_argument('--list', help='file to write ranked holds to')
+    args = parser.parse_args()
+    engine, poker_winnings = load_game(args.game)
+    if args.cache and os.path.exists(args.cache):
+        analyzer = Analyzer.load(args.cache)
+    else:
+        analyzer = Analyzer.solve(engine, poker_winnings,
+                                  processes=args.processes)
+        if args.cache:
+            analyzer.save(args.cache)
+    strategy = compile_strategy(analyzer, poker_winnings, args.coins)
+    strategy.save(args.output)
+    if args.list:
+        with open(args.list, 'w', encoding='utf-8') as f:
+            for i, item in enumerate(
+                    strategy.ranked_holds(engine.wild_ranks), start=1):
+                f.write('{:>4}. {:<30} {:>12.4f} {:>10.4%}\n'.format(
+                    i, item.pattern, item.value, item.frequency))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,6 @@ import collections
 from .base import *
 
 
-CAPTION = 'Tens or Better'
-BACKGROUND_COLOR = (0, 25, 50)
-
 # Table of winnings
 poker_winnings = collections.OrderedDict((
     ('Royal Flush',     [500, 1000, 2000, 3000, 4000]),
@@ -24,10 +21,15 @@ poker_winnings = collections.OrderedDict((
     ('Tens or Better',  [1,   2,    3,    4,    5])
 ))
 combination_names = poker_winnings.keys()
+# Integer combination IDs and table of winnings indexed by them
+Combination = combination_enum(combination_names)
+paytable = build_paytable(poker_winnings)
 
 
 class TensOrBetter(RankOrBetter):
     """Class for 'Tens or Better' engine"""
+    pair_ranks = ('10', 'J', 'Q', 'K', 'A')
+    combinations = tuple(combination_names)
 
     def rank_or_better(self):
         """Check for Tens or Better
@@ -35,7 +37,7 @@ class TensOrBetter(RankOrBetter):
         :return: 'Tens or Better'
         :type: str
         """
-        for rank in ['10', 'J', 'Q', 'K', 'A']:
+        for rank in self.pair_ranks:
             if self.card_ranks.count(rank) == 2:
                 return 'Tens or Better'
         return ''
@@ -0,0 +1,98 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Strategy trainer: every hold of a player is compared with the optimal one
+
+Expected winnings of all holds of a dealt hand are taken from the shared
+cache (see cache), so a hand is solved once, in a few milliseconds, and the
+player's hold is graded by a table lookup.
+"""
+
+import collections
+from .cache import shared
+from .strategy import describe_hold
+
+Decision = collections.namedtuple(
+    'Decision', ('hold', 'best_hold', 'value', 'best_value', 'loss',
+                 'best_pattern'))
+
+
+class Trainer:
+    """Grades holds of a session and keeps error rate and cost"""
+
+    def __init__(self, solver, cache=shared, tolerance=1e-9):
+        """Class Trainer constructor
+
+        :param solver: solver of the game
+        :type solver: Solver
+        :param cache: cache of expected winnings, default = shared cache
+        :type cache: Cache
+        :param tolerance: hold is an error if it loses more than tolerance
+                          (in creds), so equal holds are not errors
+        :type tolerance: float
+        """
+        self.solver = solver
+        self.cache = cache
+        self.tolerance = tolerance
+        self.wild_ranks = solver.engine_class.wild_ranks
+        # Session counters, cost is in creds
+        self.decisions = 0
+        self.errors = 0
+        self.cost = 0.0
+
+    def hold_values(self, cards, coins):
+        """Calculate expected winning of every hold, should be called right
+        after the deal, so grade() does not solve the hand again
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param coins: number of coins, 1..5
+        :type coins: int
+
+        :return: expected winning (in creds) by hold mask
+        :type: numpy.ndarray
+        """
+        return self.cache.hold_values(self.solver, cards, coins)
+
+    def grade(self, cards, hold, coins, hands=1):
+        """Compare hold of player with the optimal hold and count it
+
+        :param cards: five dealt card codes
+        :type cards: sequence
+        :param hold: hold mask of player
+        :type hold: int
+        :param coins: number of coins bet on every hand, 1..5
+        :type coins: int
+        :param hands: number of hands played with the hold, default = 1
+        :type hands: int
+
+        :return: hold of player, optimal hold, their expected winnings and
+                 loss of a hand (in creds) and description of optimal hold
+        :type: Decision
+        """
+        values = self.hold_values(cards, coins)
+        best_hold = int(values.argmax())
+        loss = float(values[best_hold] - values[hold])
+        self.decisions += 1
+        if loss > self.tolerance:
+            self.errors += 1
+            self.cost += loss * hands
+        else:
+            loss = 0.0
+        return Decision(
+            hold=hold,
+            best_hold=best_hold,
+            value=float(values[hold]),
+            best_value=float(values[best_hold]),
+            loss=loss,
+            best_pattern=describe_hold(cards, best_hold, self.wild_ranks)
+        )
+
+    @property
+    def error_rate(self):
+        """Share of holds that are errors
+
+        :type: float
+        """
+        return self.errors / self.decisions if self.decisions else 0.0
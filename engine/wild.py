@@ -0,0 +1,273 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Generic engine for games with wild cards
+
+A game is described by data: ranks of wild cards, an extra joker card and a
+list of rules in order of table of winnings. Every rule is a pair of rule
+kind and its parameter, e.g. ('rank_or_better', 'K'). Hand is classified by
+counts of natural (non-wild) ranks, mask of natural ranks, number of wild
+cards and suited flag of natural cards, so every game is evaluated by the
+same code, both analytically and by lookup table.
+
+Joker is card code 52 (after the 52 cards of the deck), its suit is '*' and
+its rank is 'Joker'. Games with joker are played with a 53-card deck, see
+BaseEngine.deck.
+"""
+
+import itertools
+import numpy as np
+from . import batch
+from .base import ranks, rank_primes, deck_size, code_suits, \
+    code_ranks, code_primes, rank_indexes, check_cards, BaseEngine
+
+# Joker card
+JOKER = deck_size
+JOKER_SUIT = '*'
+JOKER_RANK = 'Joker'
+JOKER_PRIME = 43
+# Suits, ranks and rank primes of codes of 53-card deck
+wild_code_suits = code_suits + (JOKER_SUIT,)
+wild_code_ranks = code_ranks + (JOKER_RANK,)
+wild_code_primes = code_primes + (JOKER_PRIME,)
+# Rank masks of straights: five ranks in a row, from 2-6 up to 10-A
+straight_masks = tuple(0b11111 << i for i in range(len(ranks) - 4))
+# Rank mask of A-2-3-4-5, a straight in some games
+wheel_mask = 1 << rank_indexes['A'] | 0b1111
+royal_mask = straight_masks[-1]
+# Kinds of rules, see WildEngine.classify()
+rule_kinds = ('natural_royal_flush', 'wild_royal_flush', 'wild_ranks',
+              'wild_cards', 'five_of_a_kind', 'straight_flush',
+              'four_of_a_kind', 'full_house', 'flush', 'straight',
+              'three_of_a_kind', 'two_pairs', 'rank_or_better')
+
+
+def check_wild_cards(card_suits, card_ranks, joker):
+    """Check that card suits and ranks describe a hand of 5 cards, joker is
+    allowed once
+
+    :param card_suits: card suits
+    :type card_suits: list
+    :param card_ranks: card ranks
+    :type card_ranks: list
+    :param joker: True if deck has joker
+    :type joker: bool
+
+    :raise: see check_cards()
+    :raise: KeyError: joker is not in deck or hand has more than one joker
+    """
+    if type(card_suits) != list or type(card_ranks) != list \
+            or JOKER_RANK not in card_ranks:
+        check_cards(card_suits, card_ranks)
+        return
+    if not joker or card_ranks.count(JOKER_RANK) > 1:
+        raise KeyError('Unknown card rank: ', JOKER_RANK)
+    i = card_ranks.index(JOKER_RANK)
+    if len(card_suits) > i and card_suits[i] != JOKER_SUIT:
+        raise KeyError('Unknown card suit: ', card_suits[i])
+    # Joker is checked, the rest of the hand is checked with a natural card
+    # in its place
+    check_cards(card_suits[:i] + ['S'] + card_suits[i+1:],
+                card_ranks[:i] + ['A'] + card_ranks[i+1:])
+
+
+class WildEngine(BaseEngine):
+    """Abstract engine for games with wild cards. Subclasses set rules,
+    wild_ranks, joker and combinations (names of rules in the same order)
+    """
+    # Pairs of rule kind and parameter in order of table of winnings
+    rules = ()
+    # True if deck has joker
+    joker = False
+    # Rank masks of straights
+    straights = straight_masks
+
+    def __init__(self, mode='sequence'):
+        """Class WildEngine constructor
+
+        :param mode: evaluation mode, see BaseEngine. Lookup table is keyed
+                     by ranks of all cards (joker has its own prime) and
+                     suited flag of natural cards
+        :type mode: str
+
+        :raise ValueError: unknown rule kind or rules do not match
+                           combinations
+        """
+        if len(self.rules) != len(self.combinations):
+            raise ValueError('Rules do not match combinations: ',
+                             type(self).__name__)
+        for kind, _ in self.rules:
+            if kind not in rule_kinds:
+                raise ValueError('Unknown rule kind: ', kind)
+        # Flags of wild card codes
+        self.wild = tuple(rank == JOKER_RANK or rank in self.wild_ranks
+                          for rank in wild_code_ranks)
+        # Sorted keys and results of lookup table for evaluate_batch(),
+        # built on its first call
+        self.batch_table = None
+        super().__init__(mode)
+
+    @property
+    def deck(self):
+        """Card codes of the deck
+
+        :type: tuple
+        """
+        return tuple(range(deck_size + self.joker))
+
+    def __call__(self, card_suits, card_ranks):
+        """Check for winning combination and return result if any
+
+        :param card_suits: card suits, '*' for joker
+        :type card_suits: list
+        :param card_ranks: card ranks, 'Joker' for joker
+        :type card_ranks: list
+
+        :return: winning combination
+        :type: str
+
+        :raise: see check_wild_cards()
+        """
+        check_wild_cards(card_suits, card_ranks, self.joker)
+        if self.table is not None:
+            key = 1
+            for rank in card_ranks:
+                key *= rank_primes.get(rank, JOKER_PRIME)
+            return self.table[key][self.suited(card_suits, card_ranks)]
+        naturals = [rank_indexes[r] for r in card_ranks
+                    if r != JOKER_RANK and r not in self.wild_ranks]
+        return self.classify(
+            naturals, self.suited(card_suits, card_ranks),
+            sum(r in self.wild_ranks for r in card_ranks),
+            card_ranks.count(JOKER_RANK))
+
+    def evaluate(self, cards):
+        """Check for winning combination of five card codes without checks
+
+        :param cards: five card codes, 52 for joker
+        :type cards: sequence
+
+        :return: winning combination
+        :type: str
+        """
+        wild = self.wild
+        suited = len({code & 3 for code in cards if not wild[code]}) <= 1
+        if self.table is not None:
+            a, b, c, d, e = cards
+            return self.table[
+                wild_code_primes[a] * wild_code_primes[b] *
+                wild_code_primes[c] * wild_code_primes[d] *
+                wild_code_primes[e]
+            ][suited]
+        return self.classify(
+            [code >> 2 for code in cards if not wild[code]], suited,
+            sum(wild[code] for code in cards if code != JOKER),
+            sum(code == JOKER for code in cards))
+
+    def evaluate_batch(self, cards):
+        """Check for winning combinations of many hands at once
+
+        :param cards: N×5 array of card codes, 52 for joker
+        :type cards: array_like
+
+        :return: N-length array of combination indexes, see BaseEngine
+        :type: numpy.ndarray
+        """
+        if self.batch_table is None:
+            table = self.lookup_table()
+            keys = np.array(sorted(table), dtype=np.int64)
+            results = np.array(
+                [[self.combination_ids[table[key][suited]] for key in keys]
+                 for suited in (False, True)], dtype=np.intp)
+            size = len(self.deck)
+            self.batch_table = (
+                np.array(wild_code_primes[:size], dtype=np.int64),
+                np.array(self.wild[:size]), keys, results)
+        return batch.table_lookup(cards, *self.batch_table)
+
+    def suited(self, card_suits, card_ranks):
+        """Check if all natural cards have the same suit
+
+        :return: True if hand is suited
+        :type: bool
+        """
+        return len({s for s, r in zip(card_suits, card_ranks)
+                    if r != JOKER_RANK and r not in self.wild_ranks}) <= 1
+
+    def classify(self, naturals, suited, wild_ranked, jokers):
+        """Find the first rule the hand satisfies
+
+        :param naturals: rank indexes of natural cards
+        :type naturals: list
+        :param suited: True if natural cards have the same suit
+        :type suited: bool
+        :param wild_ranked: number of cards of wild ranks
+        :type wild_ranked: int
+        :param jokers: number of jokers
+        :type jokers: int
+
+        :return: winning combination
+        :type: str
+        """
+        wilds = wild_ranked + jokers
+        counts = sorted((naturals.count(r) for r in set(naturals)),
+                        reverse=True) + [0, 0]
+        distinct = len(set(naturals)) == len(naturals)
+        mask = 0
+        for rank in naturals:
+            mask |= 1 << rank
+        straight = distinct and any(mask & s == mask for s in self.straights)
+        checks = {
+            'natural_royal_flush': lambda _: (
+                not wilds and suited and mask == royal_mask),
+            'wild_royal_flush': lambda _: (
+                wilds and suited and distinct and mask & royal_mask == mask),
+            'wild_ranks': lambda n: wild_ranked >= n,
+            'wild_cards': lambda n: wilds >= n,
+            'five_of_a_kind': lambda _: counts[0] + wilds >= 5,
+            'straight_flush': lambda _: suited and straight,
+            'four_of_a_kind': lambda _: counts[0] + wilds >= 4,
+            'full_house': lambda _: (
+                counts[2] == 0 and counts[0] <= 3 and counts[1] <= 2
+                and counts[0] + wilds >= 3),
+            'flush': lambda _: suited,
+            'straight': lambda _: straight,
+            'three_of_a_kind': lambda _: counts[0] + wilds >= 3,
+            'two_pairs': lambda _: (
+                max(0, 2 - counts[0]) + max(0, 2 - counts[1]) <= wilds),
+            'rank_or_better': lambda rank: wilds >= 2 or any(
+                naturals.count(r) + wilds >= 2
+                for r in naturals if r >= rank_indexes[rank])
+        }
+        for (kind, param), name in zip(self.rules, self.combinations):
+            if checks[kind](param):
+                return name
+        return ''
+
+    def build_lookup_table(self):
+        """Classify every multiset of 5 ranks (with at most one joker if
+        deck has it) both as unsuited and as suited hand
+
+        :return: lookup table, see lookup_table()
+        :type: dict
+        """
+        table = {}
+        hand_ranks = list(ranks) + [JOKER_RANK] * self.joker
+        for multiset in itertools.combinations_with_replacement(hand_ranks,
+                                                                5):
+            jokers = multiset.count(JOKER_RANK)
+            if jokers > 1:
+                continue
+            naturals = [rank_indexes[r] for r in multiset
+                        if r != JOKER_RANK and r not in self.wild_ranks]
+            wild_ranked = sum(r in self.wild_ranks for r in multiset)
+            key = 1
+            for rank in multiset:
+                key *= rank_primes.get(rank, JOKER_PRIME)
+            suited = self.classify(naturals, True, wild_ranked, jokers)
+            # Hand with less than 2 natural cards is always suited
+            table[key] = (
+                self.classify(naturals, False, wild_ranked, jokers)
+                if len(naturals) > 1 else suited, suited)
+        return table
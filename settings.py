@@ -64,4 +64,23 @@ ANTIALIASING = 0
 # Player options
 #
 DB_FILE = os.path.join(BASE_DIR, 'vpoker.db')
+# Binary log of played rounds, see engine.history
+HISTORY_FILE = os.path.join(BASE_DIR, 'history.bin')
 INITIAL_CREDS = 120
+# Numbers of hands played with one deal (multi-play)
+HANDS_PER_DEAL = (1, 3, 10, 50, 100)
+#
+# Cache of results of engines and solvers (see engine.cache)
+#
+CACHE_SIZE = 100000
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+#
+# Random streams
+#
+# Seed of game sessions, None = fresh entropy every session (seed is kept in
+# the database, see engine.session.replay())
+SEED = None
+# Random backend of dealing (see engine.rng): 'default', 'mt19937' or
+# 'crypto' (generator of the operating system, sessions have no seed and can
+# not be replayed); rounds are replayed with the backend they were dealt with
+RNG_BACKEND = 'default'
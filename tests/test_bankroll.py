@@ -0,0 +1,90 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for bankroll simulator"""
+
+import collections
+import unittest
+import numpy as np
+
+from engine.jacks_or_better import poker_winnings
+from engine.bankroll import payout_distribution, simulate
+
+
+def exact_ruin(winnings, probabilities, hands, bankroll, coins):
+    """Risk of ruin by walking over every bankroll round by round"""
+    states = {bankroll: 1.0}
+    ruined = 0.0
+    for _ in range(hands):
+        following = collections.defaultdict(float)
+        for value, probability in states.items():
+            for winning, p in zip(winnings, probabilities):
+                if value + winning < coins:
+                    ruined += probability * p
+                else:
+                    following[value + winning] += probability * p
+        states = following
+    return ruined
+
+
+class TestBankroll(unittest.TestCase):
+    """Tests for payout_distribution() and simulate()"""
+
+    def test_payout_distribution(self):
+        """Net winnings follow paytable, probabilities are normalized
+        """
+        probabilities = dict.fromkeys(list(poker_winnings) + [''], 1)
+        winnings, weights = payout_distribution(probabilities,
+                                                poker_winnings, 5)
+        self.assertEqual(
+            [w[4] - 5 for w in poker_winnings.values()] + [-5],
+            winnings.tolist())
+        self.assertAlmostEqual(1, weights.sum())
+        del probabilities['']
+        self.assertRaises(KeyError, payout_distribution, probabilities,
+                          poker_winnings)
+
+    def test_losing(self):
+        """Every path is ruined when bankroll is spent
+        """
+        report = simulate(np.array([-5]), np.array([1.0]), 10, 100,
+                          bankroll=120, coins=5, seed=1)
+        self.assertEqual(1, report.risk_of_ruin)
+        self.assertEqual([24]*10, report.bust_times.tolist())
+        self.assertEqual([0]*10, report.final.tolist())
+        self.assertEqual([120]*5, report.curves[0].tolist())
+        self.assertEqual([0]*5, report.curves[-1].tolist())
+
+    def test_risk_of_ruin(self):
+        """Risk of ruin is close to exact one
+        """
+        winnings = np.array([-2, 0, 3])
+        probabilities = np.array([0.5, 0.2, 0.3])
+        report = simulate(winnings, probabilities, 20000, 30, bankroll=6,
+                          coins=2, seed=2, chunk_size=7)
+        expected = exact_ruin(winnings, probabilities, 30, 6, 2)
+        self.assertAlmostEqual(expected, report.risk_of_ruin, delta=0.015)
+        self.assertEqual(len(report.bust_times),
+                         round(report.risk_of_ruin * 20000))
+        self.assertTrue(np.all(report.bust_times <= 30))
+
+    def test_curves(self):
+        """Curves are taken at every step, percentiles are ordered, results
+        depend on seed only
+        """
+        winnings, probabilities = np.array([-5, 5]), np.array([0.5, 0.5])
+        report = simulate(winnings, probabilities, 500, 250, step=100,
+                          seed=3, chunk_size=64)
+        self.assertEqual([0, 100, 200, 250], report.checkpoints.tolist())
+        self.assertEqual((4, 5), report.curves.shape)
+        self.assertTrue(np.all(np.diff(report.curves, axis=1) >= 0))
+        again = simulate(winnings, probabilities, 500, 250, step=100,
+                         seed=3, chunk_size=64)
+        self.assertEqual(report.final.tolist(), again.final.tolist())
+        self.assertRaises(ValueError, simulate, winnings, probabilities,
+                          10, 10, bankroll=4, coins=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
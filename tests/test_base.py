@@ -0,0 +1,133 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for card codes, Hand and combination IDs"""
+
+import random
+import unittest
+import ddt
+from tests import tools
+
+from engine.base import suit_list, ranks, deck_size, encode_card, \
+    decode_card, Hand
+from engine import tens_or_better, jacks_or_better, deuces_wild
+
+
+@ddt.ddt
+class TestCardCodes(unittest.TestCase):
+    """Tests for encode_card() and decode_card()"""
+
+    def test_codes(self):
+        """Every card has unique code in range 0..51 and is decoded back
+        """
+        codes = set()
+        for suit in suit_list:
+            for rank in ranks:
+                code = encode_card(suit, rank)
+                self.assertTrue(0 <= code < deck_size)
+                self.assertEqual((suit, rank), decode_card(code))
+                self.assertEqual(ranks.index(rank), code >> 2)
+                codes.add(code)
+        self.assertEqual(deck_size, len(codes))
+
+    @ddt.data(*tools.prepare_test_data(
+        ('wrong_suit', 'X', '10'),
+        ('wrong_rank', 'S', '1')
+    ))
+    @ddt.unpack
+    def test_encode_negative(self, suit, rank):
+        """Negative test for encode_card(): suit - {0}, rank - {1}
+        """
+        self.assertRaises(KeyError, encode_card, suit, rank)
+
+
+@ddt.ddt
+class TestHand(unittest.TestCase):
+    """Tests for Hand"""
+
+    def test_from_strings(self):
+        """Hand created from strings gives the same strings back
+        """
+        _suits = tools.generate_random_suits()
+        _ranks = tools.generate_random_ranks()
+        hand = Hand.from_strings(_suits, _ranks)
+        self.assertEqual(_suits, hand.suits)
+        self.assertEqual(_ranks, hand.ranks)
+        self.assertEqual(hand, Hand(hand))
+
+    @ddt.data(*tools.prepare_test_data(
+        ('wrong_length', (1, 2, 3), ValueError),
+        ('wrong_type', (1, 2, 3, 4, '5'), KeyError),
+        ('negative_code', (1, 2, 3, 4, -1), KeyError),
+        ('big_code', (1, 2, 3, 4, deck_size), KeyError)
+    ))
+    @ddt.unpack
+    def test_init_negative(self, cards, expected):
+        """Negative test for constructor: cards - {0}, expected - {1}
+        """
+        self.assertRaises(expected, Hand, cards)
+
+    def test_from_strings_negative(self):
+        """Negative test for from_strings()
+        """
+        self.assertRaises(TypeError, Hand.from_strings,
+                          3, tools.generate_random_ranks())
+        self.assertRaises(KeyError, Hand.from_strings,
+                          tools.generate_random_suits(), ['1']*5)
+
+
+class TestCombinationIds(unittest.TestCase):
+    """Tests for combination IDs and paytables of engine modules"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.games = [
+            (tens_or_better, tens_or_better.TensOrBetter()),
+            (jacks_or_better, jacks_or_better.JacksOrBetter('table')),
+            (deuces_wild, deuces_wild.DeucesWild())
+        ]
+
+    def test_enum(self):
+        """IDs follow order of table of winnings, NOTHING is the last one
+        """
+        for module, _ in self.games:
+            names = list(module.combination_names)
+            self.assertEqual(len(names) + 1, len(module.Combination))
+            for i, name in enumerate(names):
+                member = module.Combination[name.upper().replace(' ', '_')]
+                self.assertEqual(i, member)
+            self.assertEqual(len(names), module.Combination.NOTHING)
+
+    def test_paytable(self):
+        """Paytable row of every combination is the same as winnings
+        """
+        for module, _ in self.games:
+            self.assertEqual((len(module.Combination), 5),
+                             module.paytable.shape)
+            for combination in module.Combination:
+                if combination == module.Combination.NOTHING:
+                    self.assertEqual([0]*5,
+                                     module.paytable[combination].tolist())
+                    continue
+                name = list(module.combination_names)[combination]
+                self.assertEqual(module.poker_winnings[name],
+                                 module.paytable[combination].tolist())
+
+    def test_evaluate_id(self):
+        """ID of combination is the same as evaluate() and evaluate_batch()
+        give
+        """
+        rng = random.Random(0)
+        for module, engine in self.games:
+            hands = [Hand(rng.sample(range(deck_size), 5))
+                     for _ in range(1000)]
+            expected = engine.evaluate_batch(hands).tolist()
+            names = list(module.combination_names) + ['']
+            for hand, combination in zip(hands, expected):
+                self.assertEqual(combination, engine.evaluate_id(hand))
+                self.assertEqual(names[combination], engine.evaluate(hand))
+
+
+if __name__ == '__main__':
+    unittest.main()
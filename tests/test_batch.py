@@ -0,0 +1,93 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for batch evaluation of hands"""
+
+import itertools
+import unittest
+import numpy as np
+
+from engine.base import ranks, suit_list, encode_card
+from engine import tens_or_better, jacks_or_better, deuces_wild
+
+engines = (
+    (tens_or_better.TensOrBetter, tens_or_better.poker_winnings),
+    (jacks_or_better.JacksOrBetter, jacks_or_better.poker_winnings),
+    (deuces_wild.DeucesWild, deuces_wild.poker_winnings)
+)
+
+
+def random_hands(n):
+    """Deal n random hands without repeated cards
+
+    :return: n×5 array of card codes
+    :type: numpy.ndarray
+    """
+    rng = np.random.default_rng()
+    return np.argsort(rng.random((n, 52)), axis=1)[:, :5]
+
+
+def rank_multiset_hands():
+    """Make hands for every possible multiset of ranks, suited where possible
+
+    :return: array of card codes
+    :type: numpy.ndarray
+    """
+    suits = list(suit_list)
+    hands = []
+    for _ranks in itertools.combinations_with_replacement(ranks, 5):
+        if max(_ranks.count(rank) for rank in _ranks) > 4:
+            continue
+        _suits = [suits[_ranks[:i].count(rank)]
+                  for i, rank in enumerate(_ranks)]
+        hands.append([encode_card(*c) for c in zip(_suits, _ranks)])
+        if len(set(_ranks)) == 5:
+            hands.append([encode_card('S', rank) for rank in _ranks])
+    return np.array(hands)
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    """Tests for evaluate_batch() of all engines"""
+
+    def check(self, hands):
+        for engine_class, poker_winnings in engines:
+            engine = engine_class(mode='table')
+            names = list(poker_winnings) + ['']
+            expected = [names.index(engine.evaluate(hand))
+                        for hand in hands.tolist()]
+            self.assertEqual(expected, engine.evaluate_batch(hands).tolist())
+
+    def test_random_hands(self):
+        """Batch evaluation matches evaluate() for random hands
+        """
+        self.check(random_hands(20000))
+
+    def test_rank_multisets(self):
+        """Batch evaluation matches evaluate() for every multiset of ranks
+        """
+        self.check(rank_multiset_hands())
+
+    def test_empty(self):
+        """Empty batch gives empty result
+        """
+        for engine_class, _ in engines:
+            result = engine_class().evaluate_batch(np.zeros((0, 5), int))
+            self.assertEqual((0,), result.shape)
+
+    def test_negative(self):
+        """Negative scenarios
+        """
+        for engine_class, _ in engines:
+            engine = engine_class()
+            self.assertRaises(ValueError, engine.evaluate_batch, [1, 2, 3])
+            self.assertRaises(ValueError, engine.evaluate_batch,
+                              [[1, 2, 3, 4]])
+            self.assertRaises(KeyError, engine.evaluate_batch,
+                              [[1, 2, 3, 4, 52]])
+            self.assertRaises(KeyError, engine.evaluate_batch,
+                              [[-1, 2, 3, 4, 5]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for benchmarks of engines and random backends"""
+
+import unittest
+
+from engine.deuces_wild import DeucesWild
+from benchmarks.engines import prepare_cases, measure, compare
+from benchmarks.rng import costs
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests for benchmark helpers"""
+
+    def test_prepare_cases(self):
+        """Every check of analytical sequence gets hands that hit it
+        """
+        engine = DeucesWild()
+        cases = prepare_cases(engine, n=10)
+        for i, check in enumerate(engine.analytical_sequence):
+            self.assertEqual(10, len(cases[check.__name__]))
+            for hand in cases[check.__name__]:
+                self.assertEqual(i, engine.evaluate_batch([hand])[0])
+        for hand in cases['worst']:
+            self.assertEqual('', engine.evaluate(hand))
+        self.assertEqual(10, len(cases['random']))
+
+    def test_measure(self):
+        """Throughput is positive
+        """
+        self.assertGreater(measure(len, [(0, 1, 2, 3, 4)] * 10), 0)
+
+    def test_compare(self):
+        """Drops beyond tolerance are reported
+        """
+        baseline = {'game': {'table': {'random': 100, 'worst': 100},
+                             'batch': {'random': 1000}}}
+        results = {'game': {'table': {'random': 85, 'worst': 70},
+                            'batch': {'random': 2000}}}
+        self.assertEqual([('game', 'table', 'worst', 100, 70)],
+                         compare(results, baseline, 0.2))
+        self.assertEqual([], compare(results, baseline, 0.5))
+        self.assertEqual([], compare({}, baseline))
+
+    def test_costs(self):
+        """Cost of a random backend is drop of throughput against reference
+        backend
+        """
+        results = {'mt19937': {'simulator': 100, 'deck': 200},
+                   'crypto': {'simulator': 75, 'deck': 300}}
+        self.assertEqual({'simulator': 0.25, 'deck': -0.5},
+                         costs(results, 'crypto'))
+
+
+if __name__ == '__main__':
+    unittest.main()
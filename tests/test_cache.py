@@ -0,0 +1,89 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for shared cache of engines and solvers"""
+
+import random
+import unittest
+
+from engine.base import Hand
+from engine.cache import Cache, IDS_SIZE
+from engine.solver import Solver
+from engine.sensitivity import vary
+from engine import jacks_or_better, deuces_wild
+
+
+class TestCache(unittest.TestCase):
+    """Tests for Cache"""
+
+    def test_evaluate(self):
+        """Suit-isomorphic hands are evaluated once per engine class
+        """
+        cache = Cache()
+        jacks = jacks_or_better.JacksOrBetter()
+        deuces = deuces_wild.DeucesWild()
+        card_suits, card_ranks = ['S', 'S', 'H', 'S', 'S'], \
+            ['2', 'Q', 'Q', 'K', 'A']
+        self.assertEqual('Jacks or Better',
+                         cache.evaluate(jacks, card_suits, card_ranks))
+        self.assertEqual('Jacks or Better', cache.evaluate(
+            jacks, ['D', 'D', 'C', 'D', 'D'], card_ranks))
+        self.assertEqual('Three of a Kind',
+                         cache.evaluate(deuces, card_suits, card_ranks))
+        self.assertEqual((1, 2, 0, 2), cache.stats()[:4])
+        self.assertRaises(KeyError, cache.evaluate, jacks, card_suits,
+                          ['1', 'Q', 'Q', 'K', 'A'])
+
+    def test_hold_values(self):
+        """Cached values are the same as values of solver, they are kept by
+        engine, table of winnings and number of coins
+        """
+        cache = Cache()
+        engine = jacks_or_better.JacksOrBetter()
+        poker_winnings = jacks_or_better.poker_winnings
+        solver = Solver(engine, poker_winnings)
+        other = Solver(engine, vary(poker_winnings, 'Full House', 8))
+        cards = Hand(random.sample(range(52), 5))
+        renamed = [code ^ 2 for code in reversed(cards)]
+        for hand in (cards, renamed):
+            for s in (solver, other):
+                for coins in (1, 5):
+                    self.assertEqual(
+                        s.hold_values(hand, coins).tolist(),
+                        cache.hold_values(s, hand, coins).tolist())
+        self.assertEqual((4, 4, 0, 4), cache.stats()[:4])
+        self.assertEqual(solver.best_hold(cards, 5)[1],
+                         cache.best_hold(solver, cards, 5)[1])
+
+    def test_limits(self):
+        """Least recently used results are dropped over the limits
+        """
+        engine = jacks_or_better.JacksOrBetter()
+        solver = Solver(engine, jacks_or_better.poker_winnings)
+        cache = Cache(maxsize=3)
+        for _ in range(5):
+            cache.hold_values(solver, random.sample(range(52), 5), 5)
+        self.assertEqual(3, cache.stats().size)
+        self.assertEqual(cache.stats().misses - 3, cache.stats().evictions)
+        cache = Cache(maxbytes=2000)
+        for _ in range(10):
+            cache.hold_values(solver, random.sample(range(52), 5), 5)
+            self.assertLessEqual(cache.stats().nbytes, 2000)
+
+    def test_ids(self):
+        """Numbers of tables of winnings are bounded and never reused
+        """
+        cache = Cache()
+        engine = jacks_or_better.JacksOrBetter()
+        numbers = set()
+        for pay in range(IDS_SIZE + 10):
+            variant = vary(jacks_or_better.poker_winnings, 'Flush', pay)
+            numbers.add(cache._id(type(engine), str(variant)))
+        self.assertEqual(IDS_SIZE + 10, len(numbers))
+        self.assertEqual(IDS_SIZE, len(cache.ids))
+        self.assertEqual(IDS_SIZE + 9, cache._id(type(engine), str(variant)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for suit-isomorphic classes of hands"""
+
+import random
+import threading
+import unittest
+import numpy as np
+
+from engine.canonical import suit_permutations, canonicalize, \
+    canonical_form, canonical_hold, canonical_holds, canonical_deals, Memo
+
+
+def permute_suits(cards, permutation):
+    """Rename suits of cards
+    """
+    return [code & ~3 | permutation[code & 3] for code in cards]
+
+
+class TestCanonicalForm(unittest.TestCase):
+    """Tests for canonical_form()"""
+
+    def test_permutations(self):
+        """All suit permutations of a hand have the same canonical form
+        """
+        random.seed(None)
+        for _ in range(100):
+            cards = random.sample(range(52), 5)
+            form = canonical_form(cards)
+            self.assertEqual(sorted(form), list(form))
+            for permutation in suit_permutations:
+                self.assertEqual(
+                    form, canonical_form(permute_suits(cards, permutation)))
+
+    def test_positions(self):
+        """Positions point to renamed cards in canonical form
+        """
+        for _ in range(100):
+            cards = random.sample(range(52), 5)
+            form, positions, _ = canonicalize(cards)
+            for code, position in zip(cards, positions):
+                self.assertEqual(code >> 2, form[position] >> 2)
+            self.assertEqual(list(range(5)), sorted(positions))
+
+    def test_multiplicity(self):
+        """Number of different hands in a class
+        """
+        for cards in ([0, 4, 8, 12, 16], [0, 4, 8, 12, 17],
+                      [0, 1, 2, 3, 4], random.sample(range(52), 5)):
+            self.assertEqual(
+                len({tuple(sorted(permute_suits(cards, permutation)))
+                     for permutation in suit_permutations}),
+                canonicalize(cards)[2])
+
+    def test_different_classes(self):
+        """Hands that are not suit permutations of each other differ
+        """
+        self.assertNotEqual(canonical_form([0, 4, 8, 12, 16]),
+                            canonical_form([0, 4, 8, 12, 17]))
+
+
+class TestCanonicalHold(unittest.TestCase):
+    """Tests for canonical_hold() and canonical_holds()"""
+
+    def test_canonical_hold(self):
+        """Suit permutations of a hand with a hold have the same canonical
+        form, different holds of a hand may have different forms
+        """
+        for _ in range(20):
+            cards = random.sample(range(52), 5)
+            for hold in range(32):
+                form = canonical_hold(cards, hold)
+                for permutation in suit_permutations:
+                    self.assertEqual(form, canonical_hold(
+                        permute_suits(cards, permutation), hold))
+                held, discarded, n = form
+                self.assertEqual(bin(hold).count('1'), len(held))
+                self.assertEqual(5 - len(held), len(discarded))
+        # Held spades and discarded hearts differ from held and discarded
+        # spades
+        self.assertNotEqual(canonical_hold([0, 4, 8, 14, 18], 0b00111),
+                            canonical_hold([0, 4, 8, 12, 16], 0b00111))
+
+    def test_canonical_holds(self):
+        """Canonical hold keeps the same cards of canonical form
+        """
+        cards = random.sample(range(52), 5)
+        form, positions, _ = canonicalize(cards)
+        holds = canonical_holds(positions)
+        self.assertEqual(list(range(32)), sorted(holds))
+        for hold in range(32):
+            self.assertEqual(
+                sorted(positions[i] for i in range(5) if hold >> i & 1),
+                [i for i in range(5) if holds[hold] >> i & 1])
+
+
+class TestMemo(unittest.TestCase):
+    """Tests for Memo"""
+
+    def test_memo(self):
+        """Results are calculated once and least recently used ones are
+        dropped
+        """
+        calls = []
+
+        def function(form):
+            calls.append(form)
+            return sum(form)
+
+        memo = Memo(function, maxsize=2)
+        self.assertEqual(3, memo((1, 2)))
+        self.assertEqual(3, memo((1, 2)))
+        self.assertEqual(7, memo((3, 4)))
+        self.assertEqual(3, memo((1, 2)))
+        self.assertEqual(11, memo((5, 6)))
+        self.assertEqual(2, len(memo))
+        self.assertEqual(7, memo((3, 4)))
+        self.assertEqual([(1, 2), (3, 4), (5, 6), (3, 4)], calls)
+        stats = memo.stats()
+        self.assertEqual((2, 4, 2, 2),
+                         (stats.hits, stats.misses, stats.evictions,
+                          stats.size))
+
+    def test_maxbytes(self):
+        """Results are dropped when their size is over the limit
+        """
+        memo = Memo(lambda form: np.zeros(100), maxbytes=1500)
+        for i in range(10):
+            memo((i,))
+            self.assertLessEqual(memo.stats().nbytes, 1500)
+        self.assertEqual(1, len(memo))
+        self.assertEqual(9, memo.stats().evictions)
+        self.assertEqual(0, memo.get('key', lambda: 0))
+        memo.clear()
+        self.assertEqual((0, 0), memo.stats()[3:])
+
+    def test_threads(self):
+        """Counters and size stay consistent when memo is shared by threads
+        """
+        memo = Memo(lambda form: np.zeros(form[0] % 7), maxsize=20)
+
+        def work(seed):
+            rng = random.Random(seed)
+            for _ in range(2000):
+                memo((rng.randrange(50),))
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = memo.stats()
+        self.assertEqual(16000, stats.hits + stats.misses)
+        self.assertEqual(20, stats.size)
+        self.assertEqual(sum(size for _, size in memo.results.values()),
+                         stats.nbytes)
+
+
+class TestCanonicalDeals(unittest.TestCase):
+    """Tests for canonical_deals()"""
+
+    def test_canonical_deals(self):
+        """134,459 classes cover all 2,598,960 deals
+        """
+        deals, counts = canonical_deals()
+        self.assertEqual(134459, len(deals))
+        self.assertEqual(2598960, counts.sum())
+        for i in random.sample(range(len(deals)), 100):
+            self.assertEqual(tuple(deals[i]), canonical_form(deals[i]))
+            self.assertEqual(
+                counts[i],
+                len({tuple(sorted(permute_suits(deals[i], permutation)))
+                     for permutation in suit_permutations}))
+
+
+if __name__ == '__main__':
+    unittest.main()
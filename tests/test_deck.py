@@ -0,0 +1,68 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for deck of cards"""
+
+import unittest
+import numpy as np
+
+from engine.deck import Deck
+
+
+class TestDeck(unittest.TestCase):
+    """Tests for Deck"""
+
+    def test_deal(self):
+        """Cards are dealt without repeats until the deck is empty
+        """
+        deck = Deck()
+        dealt = deck.deal(5) + deck.deal() + deck.deal(46)
+        self.assertEqual(list(range(52)), sorted(dealt))
+        self.assertEqual(0, len(deck))
+        self.assertRaises(ValueError, deck.deal)
+        cards = deck.cards
+        deck.reset()
+        self.assertIs(cards, deck.cards)
+        self.assertEqual(52, len(deck))
+        self.assertEqual(5, len(set(deck.deal(5))))
+
+    def test_cards(self):
+        """Deck of other cards deals them only
+        """
+        deck = Deck(range(10, 20))
+        self.assertEqual(list(range(10, 20)), sorted(deck.deal(10)))
+
+    def test_seed(self):
+        """Deals depend on random generator only
+        """
+        first = Deck(rng=np.random.default_rng(5))
+        second = Deck(rng=np.random.default_rng(5))
+        for _ in range(10):
+            first.reset()
+            second.reset()
+            self.assertEqual(first.deal(10), second.deal(10))
+
+    def test_reset(self):
+        """Deck with new generator deals as a new deck
+        """
+        deck = Deck()
+        deck.deal(30)
+        deck.reset(np.random.default_rng(3))
+        self.assertEqual(Deck(rng=np.random.default_rng(3)).deal(10),
+                         deck.deal(10))
+
+    def test_uniform(self):
+        """Every card is equally likely at every position, deck is not
+        reshuffled between rounds
+        """
+        deck = Deck(range(4), np.random.default_rng(7))
+        counts = np.zeros((4, 4))
+        for _ in range(8000):
+            deck.reset()
+            counts[np.arange(4), deck.deal(4)] += 1
+        self.assertTrue(np.all(np.abs(counts - 2000) < 200))
+
+
+if __name__ == '__main__':
+    unittest.main()
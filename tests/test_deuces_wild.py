@@ -10,7 +10,7 @@ import unittest
 import ddt
 from tests import tools
 
-from engine.base import suit_list, ranks
+from engine.base import suit_list, ranks, Hand
 from engine.deuces_wild import DeucesWild
 
 suit_list = list(suit_list)
@@ -279,6 +279,17 @@ class TestDeucesWild(unittest.TestCase):
         """
         self.assertEqual('', self.deuces_wild(test_suites, test_ranks))
 
+    def test_evaluate(self):
+        """Trusted entry point gives the same result as string one
+        """
+        for _ in range(1000):
+            _suits = tools.generate_random_suits()
+            _ranks = tools.generate_random_ranks()
+            self.assertEqual(
+                self.deuces_wild(_suits, _ranks),
+                self.deuces_wild.evaluate(Hand.from_strings(_suits, _ranks))
+            )
+
     def test_pair_negative(self):
         """Test Rank or Better (pair) (negative test)
         """
@@ -379,5 +390,70 @@ class TestDeucesWild(unittest.TestCase):
         )
 
 
+class TestTableMode(unittest.TestCase):
+    """Tests for table evaluation mode of DeucesWild"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sequence = DeucesWild()
+        cls.table = DeucesWild(mode='table')
+
+    def test_every_rank_multiset(self):
+        """Table gives the same result as analytical sequence for every rank
+        multiset, with suited and unsuited non-deuce cards
+        """
+        for _ranks in itertools.combinations_with_replacement(ranks, 5):
+            _ranks = list(_ranks)
+            for _suits in (['S']*5, suit_list[:1] + ['H']*4,
+                           tools.generate_different_suits()):
+                self.assertEqual(self.sequence(_suits, _ranks),
+                                 self.table(_suits, _ranks))
+
+    def test_random_hands(self):
+        """Table gives the same result as analytical sequence for random
+        hands
+        """
+        for _ in range(1000):
+            _suits = tools.generate_random_suits()
+            _ranks = tools.generate_random_ranks()
+            hand = Hand.from_strings(_suits, _ranks)
+            expected = self.sequence(_suits, _ranks)
+            self.assertEqual(expected, self.table(_suits, _ranks))
+            self.assertEqual(expected, self.table.evaluate(hand))
+
+
+class TestHistogramMode(unittest.TestCase):
+    """Tests for histogram evaluation mode of DeucesWild"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sequence = DeucesWild()
+        cls.histogram = DeucesWild(mode='histogram')
+
+    def test_every_rank_multiset(self):
+        """Histogram gives the same result as analytical sequence for every
+        rank multiset, with suited and unsuited non-deuce cards
+        """
+        self.assertIsNone(self.histogram.table)
+        for _ranks in itertools.combinations_with_replacement(ranks, 5):
+            _ranks = list(_ranks)
+            for _suits in (['S']*5, suit_list[:1] + ['H']*4,
+                           tools.generate_different_suits()):
+                self.assertEqual(self.sequence(_suits, _ranks),
+                                 self.histogram(_suits, _ranks))
+
+    def test_random_hands(self):
+        """Histogram gives the same result as analytical sequence for random
+        hands
+        """
+        for _ in range(1000):
+            _suits = tools.generate_random_suits()
+            _ranks = tools.generate_random_ranks()
+            hand = Hand.from_strings(_suits, _ranks)
+            expected = self.sequence(_suits, _ranks)
+            self.assertEqual(expected, self.histogram(_suits, _ranks))
+            self.assertEqual(expected, self.histogram.evaluate(hand))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for hand history"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from engine.history import History, load, final_hands, record, header, \
+    row, NO_CARD
+from engine.jacks_or_better import JacksOrBetter
+from engine.deck import Deck
+
+
+class TestHistory(unittest.TestCase):
+    """Tests for History and load()"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'history.bin')
+
+    def test_record(self):
+        """Record is 24 bytes, so records and their 4-byte fields are
+        aligned after the header
+        """
+        self.assertEqual(24, record.itemsize)
+        self.assertEqual(record.itemsize, row.size)
+        self.assertEqual(16, header.size)
+
+    def test_rounds(self):
+        """Rounds are read back as written, final hands are restored
+        """
+        engine = JacksOrBetter()
+        deck = Deck(rng=np.random.default_rng(1))
+        history = History(self.path)
+        played = []
+        for i in range(100):
+            deck.reset()
+            dealt = deck.deal(5)
+            hold = i % 32
+            drawn = deck.deal(5 - bin(hold).count('1'))
+            cards = iter(drawn)
+            final = [code if hold >> j & 1 else next(cards)
+                     for j, code in enumerate(dealt)]
+            combination = engine.evaluate_id(final)
+            history.append(7, 1000 + i, 2, i % 5 + 1, 10, dealt, hold, drawn,
+                           combination)
+            played.append((dealt, hold, final, combination))
+        history.close()
+        self.assertEqual(16 + 100 * 24, os.path.getsize(self.path))
+        records = load(self.path)
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(100, len(records))
+        self.assertTrue(np.all(records['session'] == 7))
+        self.assertEqual(list(range(1000, 1100)), records['round'].tolist())
+        self.assertTrue(np.all(records['game'] == 2))
+        self.assertTrue(np.all(records['hands'] == 10))
+        self.assertEqual([i % 5 + 1 for i in range(100)],
+                         records['coins'].tolist())
+        hands = final_hands(records)
+        for r, h, (dealt, hold, final, combination) in zip(
+                records, hands, played):
+            self.assertEqual(dealt, r['dealt'].tolist())
+            self.assertEqual(hold, r['hold'])
+            self.assertEqual(final, h.tolist())
+            self.assertEqual(combination, r['combination'])
+            self.assertEqual(bin(hold).count('1'),
+                             np.count_nonzero(r['drawn'] == NO_CARD))
+        self.assertTrue(np.array_equal(
+            records['combination'], engine.evaluate_batch(hands)))
+
+    def test_append(self):
+        """Reopened file is appended, a record cut by a crash is ignored
+        by load() and cut off by the next writer
+        """
+        History(self.path).close()
+        self.assertEqual(0, len(load(self.path)))
+        for number in range(2):
+            history = History(self.path)
+            history.append(0, number, 1, 5, 1, [0, 1, 2, 3, 4], 31, [], 10)
+            history.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00' * 7)
+        records = load(self.path)
+        self.assertEqual(2, len(records))
+        self.assertEqual([NO_CARD] * 5, records[1]['drawn'].tolist())
+        history = History(self.path)
+        history.append(0, 2, 1, 5, 1, [5, 6, 7, 8, 9], 0, [10, 11, 12, 13, 14],
+                       0)
+        history.close()
+        self.assertEqual(16 + 3 * 24, os.path.getsize(self.path))
+        records = load(self.path)
+        self.assertEqual([0, 1, 2], records['round'].tolist())
+        self.assertEqual([5, 6, 7, 8, 9], records[2]['dealt'].tolist())
+        self.assertEqual([10, 11, 12, 13, 14], records[2]['drawn'].tolist())
+
+    def test_torn_header(self):
+        """Header cut by a crash is written again
+        """
+        with open(self.path, 'wb') as f:
+            f.write(header.pack(b'VPHIST', 2, 24)[:9])
+        History(self.path).close()
+        self.assertEqual(16, os.path.getsize(self.path))
+        self.assertEqual(0, len(load(self.path)))
+
+    def test_invalid(self):
+        """Other files are not read or appended
+        """
+        with open(self.path, 'wb') as f:
+            f.write(b'SQLite format 3\x00')
+        self.assertRaises(ValueError, load, self.path)
+        self.assertRaises(ValueError, History, self.path)
+        # Files of other versions are not appended
+        with open(self.path, 'wb') as f:
+            f.write(header.pack(b'VPHIST', 1, 16))
+        self.assertRaises(ValueError, History, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'VX')
+        self.assertRaises(ValueError, History, self.path)
+        self.assertEqual(2, os.path.getsize(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
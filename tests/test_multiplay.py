@@ -0,0 +1,63 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for multi-play"""
+
+import sys
+import subprocess
+import unittest
+import numpy as np
+
+from engine.deuces_wild import DeucesWild, paytable
+from engine.multiplay import draw_hands, play_hands
+
+
+class TestMultiplay(unittest.TestCase):
+    """Tests for draw_hands() and play_hands()"""
+
+    def test_draw_hands(self):
+        """Held cards stay on their positions, drawn cards are taken from
+        the rest of the deck
+        """
+        rng = np.random.default_rng()
+        dealt = [0, 9, 22, 35, 51]
+        hands = draw_hands(rng, dealt, 0b10010, 1000)
+        self.assertEqual((1000, 5), hands.shape)
+        self.assertTrue(np.all(hands[:, 1] == 9))
+        self.assertTrue(np.all(hands[:, 4] == 51))
+        for hand in hands.tolist():
+            self.assertEqual(5, len(set(hand)))
+            for code in (hand[0], hand[2], hand[3]):
+                self.assertNotIn(code, dealt)
+        # Hands draw independently, so they are not all the same
+        self.assertGreater(len({tuple(hand) for hand in hands.tolist()}),
+                           900)
+        self.assertEqual([dealt]*3,
+                         draw_hands(rng, dealt, 31, 3).tolist())
+
+    def test_imports(self):
+        """Game does not import the simulator with multi-play
+        """
+        code = ('import sys, engine.multiplay; '
+                'print("engine.simulator" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual('False', output.stdout.strip())
+
+    def test_play_hands(self):
+        """Hands are counted by combination and paid for every hand
+        """
+        engine = DeucesWild()
+        # Four deuces are held
+        hands, counts, won = play_hands(
+            engine, paytable, np.random.default_rng(), [0, 1, 2, 3, 40],
+            0b01111, 100, 3)
+        self.assertEqual(100, counts.sum())
+        self.assertEqual(100, counts[1])
+        self.assertEqual(100 * paytable[1, 2], won)
+        self.assertEqual(engine.evaluate_batch(hands).tolist(), [1]*100)
+
+
+if __name__ == '__main__':
+    unittest.main()
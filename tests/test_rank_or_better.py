@@ -13,7 +13,7 @@ import unittest
 import ddt
 from tests import tools
 
-from engine.base import suit_list, ranks, RankOrBetter
+from engine.base import suit_list, ranks, Hand, RankOrBetter
 from engine.tens_or_better import TensOrBetter
 from engine.jacks_or_better import JacksOrBetter
 
@@ -403,5 +403,101 @@ class TestJacksOrBetter(unittest.TestCase):
         )
 
 
+class TestTableMode(unittest.TestCase):
+    """Tests for table evaluation mode of RankOrBetter engines"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engines = [
+            (engine_class(), engine_class(mode='table'))
+            for engine_class in (TensOrBetter, JacksOrBetter)
+        ]
+
+    def test_unknown_mode(self):
+        """Unknown evaluation mode is rejected
+        """
+        self.assertRaises(ValueError, TensOrBetter, mode='unknown')
+
+    def test_every_rank_multiset(self):
+        """Table gives the same result as analytical sequence for every rank
+        multiset, both suited and unsuited
+        """
+        for sequence, table in self.engines:
+            for _ranks in itertools.combinations_with_replacement(ranks, 5):
+                for _suits in (['S']*5, tools.generate_different_suits()):
+                    _ranks = tools.shuffle(_ranks)
+                    self.assertEqual(sequence(_suits, _ranks),
+                                     table(_suits, _ranks))
+
+    def test_random_hands(self):
+        """Table gives the same result as analytical sequence for random
+        hands
+        """
+        for sequence, table in self.engines:
+            for _ in range(1000):
+                _suits = tools.generate_random_suits()
+                _ranks = tools.generate_random_ranks()
+                self.assertEqual(sequence(_suits, _ranks),
+                                 table(_suits, _ranks))
+
+    def test_evaluate(self):
+        """Trusted entry point gives the same result as string one
+        """
+        for sequence, table in self.engines:
+            for _ in range(1000):
+                _suits = tools.generate_random_suits()
+                _ranks = tools.generate_random_ranks()
+                hand = Hand.from_strings(_suits, _ranks)
+                expected = sequence(_suits, _ranks)
+                self.assertEqual(expected, sequence.evaluate(hand))
+                self.assertEqual(expected, table.evaluate(hand))
+                self.assertEqual(expected, table.evaluate(list(hand)))
+
+    def test_negative(self):
+        """Input is checked in table mode too
+        """
+        _, table = self.engines[0]
+        self.assertRaises(TypeError, table, 3, tools.generate_random_ranks())
+        self.assertRaises(ValueError, table,
+                          tools.generate_random_suits(), ['2', '3'])
+        self.assertRaises(KeyError, table,
+                          tools.generate_random_suits(), ['1']*5)
+
+
+class TestHistogramMode(unittest.TestCase):
+    """Tests for histogram evaluation mode of RankOrBetter engines"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engines = [
+            (engine_class(), engine_class(mode='histogram'))
+            for engine_class in (TensOrBetter, JacksOrBetter)
+        ]
+
+    def test_every_rank_multiset(self):
+        """Histogram gives the same result as analytical sequence for every
+        rank multiset, both suited and unsuited
+        """
+        for sequence, histogram in self.engines:
+            self.assertIsNone(histogram.table)
+            for _ranks in itertools.combinations_with_replacement(ranks, 5):
+                for _suits in (['S']*5, tools.generate_different_suits()):
+                    _ranks = tools.shuffle(_ranks)
+                    self.assertEqual(sequence(_suits, _ranks),
+                                     histogram(_suits, _ranks))
+
+    def test_evaluate(self):
+        """Trusted entry point gives the same result as analytical sequence
+        """
+        for sequence, histogram in self.engines:
+            for _ in range(1000):
+                _suits = tools.generate_random_suits()
+                _ranks = tools.generate_random_ranks()
+                hand = Hand.from_strings(_suits, _ranks)
+                expected = sequence(_suits, _ranks)
+                self.assertEqual(expected, histogram(_suits, _ranks))
+                self.assertEqual(expected, histogram.evaluate(hand))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for registry of games"""
+
+import sys
+import importlib
+import unittest
+
+from engine import registry
+from engine.base import BaseEngine
+
+
+class TestRegistry(unittest.TestCase):
+    """Tests for registry of games"""
+
+    def test_games(self):
+        """Registered games give tables and engines of their modules
+        """
+        self.assertEqual(['tens_or_better', 'jacks_or_better', 'deuces_wild'],
+                         list(registry.games))
+        # Engines for analysis only are not registered and have no metadata
+        for name in ('joker_poker', 'deuces_joker_wild'):
+            self.assertNotIn(name, registry.games)
+            module = importlib.import_module('engine.' + name)
+            self.assertFalse(hasattr(module, 'CAPTION'))
+            self.assertFalse(hasattr(module, 'BACKGROUND_COLOR'))
+        for name, game in registry.games.items():
+            module = importlib.import_module('engine.' + name)
+            # Registry is the only source of metadata shown in the menu
+            self.assertFalse(hasattr(module, 'CAPTION'))
+            self.assertFalse(hasattr(module, 'BACKGROUND_COLOR'))
+            self.assertIs(module.poker_winnings, game.poker_winnings)
+            self.assertIs(module.paytable, game.paytable)
+            self.assertIs(module.Combination, game.combinations)
+            self.assertEqual(list(module.poker_winnings),
+                             game.combination_names)
+            engine = game.create('table')
+            self.assertIsInstance(engine, BaseEngine)
+            self.assertEqual('table', engine.mode)
+
+    def test_lazy_import(self):
+        """Engine module is imported on first access only
+        """
+        game = registry.Game('lazy', 200, 'Lazy', (0, 0, 0),
+                             'engine.no_such_module', 'NoSuchEngine')
+        self.assertEqual('Lazy', game.caption)
+        self.assertNotIn('engine.no_such_module', sys.modules)
+        with self.assertRaises(ImportError):
+            game.create()
+
+    def test_codes(self):
+        """Games have fixed codes, they are kept in hand history
+        """
+        self.assertEqual({'tens_or_better': 1, 'jacks_or_better': 2,
+                          'deuces_wild': 3},
+                         {name: game.code
+                          for name, game in registry.games.items()})
+        for game in registry.games.values():
+            self.assertIs(game, registry.get_by_code(game.code))
+
+    def test_negative(self):
+        """Unknown and duplicate games and codes are rejected
+        """
+        self.assertRaises(KeyError, registry.get, 'unknown_poker')
+        self.assertRaises(KeyError, registry.get_by_code, 0)
+        self.assertRaises(ValueError, registry.register, 'deuces_wild', 4,
+                          'Deuces Wild', (50, 0, 10), 'engine.deuces_wild',
+                          'DeucesWild')
+        for code in (0, 2, 256):
+            self.assertRaises(ValueError, registry.register, 'other_poker',
+                              code, 'Other Poker', (0, 0, 0),
+                              'engine.other_poker', 'OtherPoker')
+        self.assertNotIn('other_poker', registry.games)
+
+
+if __name__ == '__main__':
+    unittest.main()
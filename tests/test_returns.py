@@ -0,0 +1,75 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for return calculator"""
+
+import random
+import unittest
+import numpy as np
+
+from engine.jacks_or_better import JacksOrBetter
+from engine.solver import Solver
+from engine.returns import load_game, calculate, risk
+
+
+class TestReturns(unittest.TestCase):
+    """Tests for calculate() and load_game()"""
+
+    def test_load_game(self):
+        """Engine and its table of winnings are loaded by module name
+        """
+        engine, poker_winnings = load_game('jacks_or_better')
+        self.assertIsInstance(engine, JacksOrBetter)
+        self.assertEqual('Royal Flush', list(poker_winnings)[0])
+        self.assertRaises(ImportError, load_game, 'unknown_poker')
+        self.assertRaises(ValueError, load_game, 'base')
+
+    def test_calculate(self):
+        """Return of a set of deals is the mean of their best values
+        """
+        random.seed(None)
+        engine, poker_winnings = load_game('deuces_wild')
+        deals = np.array([random.sample(range(52), 5) for _ in range(20)])
+        weights = np.array([random.randint(1, 24) for _ in range(20)])
+        for coins in (1, 5):
+            report = calculate(engine, poker_winnings, coins, processes=1,
+                               deals=(deals, weights), chunk_size=7)
+            solver = Solver(engine, poker_winnings)
+            expected = sum(w * solver.best_hold(cards, coins)[1]
+                           for cards, w in zip(deals, weights))
+            self.assertAlmostEqual(expected / weights.sum() / coins,
+                                   report.return_rate)
+            self.assertAlmostEqual(1, sum(report.probabilities.values()))
+            self.assertAlmostEqual(1 - report.probabilities[''],
+                                   report.hit_frequency)
+
+    def test_risk(self):
+        """Variance of winning is the same as variance of mixture of final
+        combinations
+        """
+        engine, poker_winnings = load_game('jacks_or_better')
+        deals = np.array([random.sample(range(52), 5) for _ in range(10)])
+        weights = np.ones(10, dtype=int)
+        for coins in (1, 5):
+            report = calculate(engine, poker_winnings, coins, processes=1,
+                               deals=(deals, weights))
+            result = risk(report, poker_winnings, coins)
+            probabilities = list(report.probabilities.values())
+            pays = [winnings[coins-1] / coins
+                    for winnings in poker_winnings.values()] + [0]
+            mean = np.dot(probabilities, pays)
+            self.assertAlmostEqual(mean, report.return_rate)
+            self.assertAlmostEqual(
+                np.dot(probabilities, np.square(pays)) - mean**2,
+                result.variance)
+            self.assertAlmostEqual(result.variance,
+                                   sum(result.contributions.values()))
+            self.assertAlmostEqual(result.variance**0.5,
+                                   result.standard_deviation)
+            self.assertTrue(np.allclose(result.covariance,
+                                        result.covariance.T))
+
+
+if __name__ == '__main__':
+    unittest.main()
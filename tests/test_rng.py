@@ -0,0 +1,173 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for random backends"""
+
+import unittest
+import ddt
+import numpy as np
+
+from engine.rng import CryptoGenerator, generator, backends, word_size
+from engine.deck import Deck
+from engine.session import Session, replay
+from engine.simulator import deal, simulate
+from engine.jacks_or_better import JacksOrBetter, poker_winnings
+
+
+@ddt.ddt
+class TestCryptoGenerator(unittest.TestCase):
+    """Tests for CryptoGenerator"""
+
+    def setUp(self):
+        self.rng = CryptoGenerator()
+
+    @ddt.data(1, 2, 43, 52, 53, 64, 65, 1000, 1 << 14, 70000, 1 << 32)
+    def test_bounds(self, span):
+        """Values stay in range, one by one and as array
+        """
+        values = self.rng.integers(7, 7 + span, size=1000)
+        self.assertEqual(np.int64, values.dtype)
+        self.assertTrue(np.all((values >= 7) & (values < 7 + span)))
+        for _ in range(20):
+            self.assertIn(self.rng.integers(7, 7 + span),
+                          range(7, 7 + span))
+
+    def assertUniform(self, values, span):
+        """Chi-square test of values, 0.1% significance level by
+        Wilson–Hilferty
+        """
+        counts = np.bincount(values, minlength=span)
+        expected = len(values) / span
+        statistic = ((counts - expected) ** 2 / expected).sum()
+        df = span - 1
+        limit = df * (1 - 2 / (9 * df) + 3.09 * (2 / (9 * df)) ** 0.5) ** 3
+        self.assertLess(statistic, limit)
+
+    @ddt.data(3, 52, 100, 1000)
+    def test_uniform(self, span):
+        """All values are equally likely, also for ranges that do not
+        divide number of words
+        """
+        self.assertUniform(self.rng.integers(span, size=2000 * span), span)
+        rows = self.rng.integers([[0], [1]], span + 1, size=(2, 2000 * span))
+        self.assertUniform(rows[0], span + 1)
+        self.assertUniform(rows[1] - 1, span)
+
+    def test_rows(self):
+        """Rows of ranges are drawn from one take of words, every row from
+        its own range
+        """
+        spans = np.array([52, 43, 1, 1000])
+        values = self.rng.below_rows(spans, 5000)
+        self.assertEqual((4, 5000), values.shape)
+        self.assertTrue(np.all(values < spans[:, None]))
+        self.assertEqual(list(range(52)), np.unique(values[0]).tolist())
+        takes, take = [], self.rng.take
+        self.rng.take = lambda n, dtype: takes.append(n) or take(n, dtype)
+        values = self.rng.integers(np.arange(10)[:, None], 52,
+                                   size=(10, 100000))
+        self.assertEqual((10, 100000), values.shape)
+        self.assertTrue(np.all((values >= np.arange(10)[:, None])
+                               & (values < 52)))
+        self.assertEqual(1, len(takes))
+
+    def test_unbiased(self):
+        """Words that would make some values more likely are rejected:
+        every value of 52 is taken by 4 words of 256
+        """
+        self.rng.buffer, self.rng.position = bytes(range(256)), 0
+        self.rng.block_size = 0
+        values = [self.rng.below(52) for _ in range(208)]
+        self.assertEqual([4] * 52, np.bincount(values).tolist())
+        self.rng.buffer, self.rng.position = bytes(range(256)) * 2, 0
+        values = self.rng.integers(52, size=208)
+        self.assertEqual([4] * 52, np.bincount(values).tolist())
+
+    def test_arrays(self):
+        """Bounds are broadcast, as by numpy.random.Generator
+        """
+        low = np.arange(40)
+        values = self.rng.integers(low, 52)
+        self.assertEqual((40,), values.shape)
+        self.assertTrue(np.all((values >= low) & (values < 52)))
+        values = self.rng.integers(low[:5], [10, 20, 30, 40, 50])
+        self.assertTrue(np.all(values < [10, 20, 30, 40, 50]))
+        self.assertEqual((2, 3), self.rng.integers(5, size=(2, 3)).shape)
+        self.assertIsInstance(self.rng.integers(5), int)
+        floats = self.rng.random(1000)
+        self.assertTrue(np.all((floats >= 0) & (floats < 1)))
+        self.assertIsInstance(self.rng.random(), float)
+
+    def test_invalid(self):
+        """Empty or too wide ranges are rejected
+        """
+        self.assertRaises(ValueError, self.rng.integers, 5, 5)
+        self.assertRaises(ValueError, self.rng.integers, 0, (1 << 32) + 1)
+        self.assertRaises(ValueError, self.rng.integers, 5, 5, size=100)
+        # Words taken before the error are not used again
+        self.rng.buffer, self.rng.position = bytes([200, 0, 100]), 0
+        self.assertRaises(ValueError, self.rng.integers, [0, 5, 0], 5)
+        self.assertEqual(1, self.rng.position)
+
+    def test_buffer(self):
+        """Entropy is read in blocks and requests longer than a block are
+        served
+        """
+        rng = CryptoGenerator(block_size=64)
+        self.assertEqual(10, len(rng.take(10)))
+        self.assertEqual(64, len(rng.buffer))
+        self.assertEqual(100, len(rng.take(100, np.uint8)))
+        self.assertEqual(1000, len(rng.take(1000, np.uint16)))
+        self.assertEqual(1, word_size(64))
+        self.assertEqual(2, word_size(65))
+        self.assertEqual(4, word_size(1 << 15))
+
+
+class TestBackends(unittest.TestCase):
+    """Tests for backends of dealing"""
+
+    def test_generator(self):
+        """Seeded backends are reproducible, crypto backend is not seeded
+        """
+        for backend in ('default', 'mt19937'):
+            self.assertEqual(generator(backend, 3).integers(1 << 60),
+                             generator(backend, 3).integers(1 << 60))
+        self.assertIsInstance(generator('crypto', 3), CryptoGenerator)
+        self.assertIs(generator('crypto'), generator('crypto'))
+        self.assertRaises(ValueError, generator, 'unknown')
+
+    def test_deck(self):
+        """Deck deals every card of the deck with any backend
+        """
+        for backend in backends:
+            deck = Deck(JacksOrBetter().deck, generator(backend, 1))
+            self.assertEqual(list(range(52)), sorted(deck.deal(52)))
+            self.assertEqual(list(range(52)), sorted(
+                deal(generator(backend, 1), 100, k=52)[-1].tolist()))
+
+    def test_session(self):
+        """Sessions of crypto backend have no seed and can not be replayed,
+        other backends replay rounds
+        """
+        engine = JacksOrBetter()
+        session = Session(backend='crypto')
+        self.assertIsNone(session.seed)
+        self.assertEqual(5, len(set(session.deal(Deck(), 0))))
+        self.assertRaises(ValueError, replay, engine, session.seed, 0, 0)
+        session = Session(backend='mt19937')
+        deck = Deck()
+        dealt = session.deal(deck, 4)
+        self.assertEqual(dealt, replay(engine, session.seed, 4, 0,
+                                       backend='mt19937').dealt)
+
+    def test_simulate(self):
+        """Simulator plays with crypto backend
+        """
+        report = simulate(JacksOrBetter(), poker_winnings, 10000, seed=1,
+                          processes=1, backend='crypto')
+        self.assertEqual(10000, sum(report.combinations.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
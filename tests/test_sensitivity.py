@@ -0,0 +1,118 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for paytable sensitivity analysis"""
+
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+
+from engine.solver import Solver
+from engine.returns import load_game, calculate
+from engine.sensitivity import Analyzer, useful_holds, vary
+
+
+class TestAnalyzer(unittest.TestCase):
+    """Tests for Analyzer"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        cls.deals = (
+            np.array([rng.sample(range(52), 5) for _ in range(30)]),
+            np.array([rng.randint(1, 24) for _ in range(30)])
+        )
+        cls.games = {}
+        for name in ('tens_or_better', 'jacks_or_better', 'deuces_wild'):
+            engine, poker_winnings = load_game(name)
+            cls.games[name] = (engine, poker_winnings, Analyzer.solve(
+                engine, poker_winnings, processes=1, deals=cls.deals,
+                chunk_size=7))
+
+    def test_useful_holds(self):
+        """The best hold is kept for any table of winnings
+        """
+        engine, poker_winnings, _ = self.games['deuces_wild']
+        solver = Solver(engine, poker_winnings)
+        for cards in self.deals[0].tolist():
+            useful = useful_holds(solver.hold_counts(cards))
+            self.assertIn(solver.best_hold(cards, 5)[0], useful)
+            self.assertEqual(sorted(useful), useful.tolist())
+
+    def test_ties(self):
+        """Holds with the same expected winning are broken by the lowest
+        mask, as in returns.calculate()
+        """
+        engine, poker_winnings, analyzer = self.games['jacks_or_better']
+        variant = vary(poker_winnings, 'Straight', 0)
+        solver = Solver(engine, variant)
+        pays = solver.pays(5)
+        best = analyzer.masks[analyzer.best_holds(variant, 5)]
+        for cards, mask in zip(self.deals[0].tolist(), best.tolist()):
+            expected = (solver.hold_probabilities(cards) @ pays).argmax()
+            self.assertEqual(expected, mask)
+
+    def test_variants(self):
+        """Re-weighted counts give the same report as solving from scratch
+        """
+        for engine, poker_winnings, analyzer in self.games.values():
+            variants = [poker_winnings,
+                        vary(poker_winnings, 'Full House', 8),
+                        vary(poker_winnings, 'Straight', 0)]
+            for variant, report in zip(variants,
+                                       analyzer.sweep(variants, 5)):
+                expected = calculate(engine, variant, 5, processes=1,
+                                     deals=self.deals)
+                self.assertAlmostEqual(expected.return_rate,
+                                       report.return_rate)
+                self.assertAlmostEqual(expected.hit_frequency,
+                                       report.hit_frequency)
+                for name, probability in expected.probabilities.items():
+                    self.assertAlmostEqual(probability,
+                                           report.probabilities[name])
+
+    def test_save_load(self):
+        """Saved analyzer gives the same reports
+        """
+        _, poker_winnings, analyzer = self.games['jacks_or_better']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'counts.npz')
+            analyzer.save(path)
+            loaded = Analyzer.load(path)
+        self.assertEqual(analyzer.analyze(poker_winnings, 1),
+                         loaded.analyze(poker_winnings, 1))
+
+    def test_negative(self):
+        """Other combinations and negative winnings are rejected
+        """
+        _, poker_winnings, analyzer = self.games['jacks_or_better']
+        _, other_winnings, _ = self.games['deuces_wild']
+        self.assertRaises(ValueError, analyzer.analyze, other_winnings)
+        self.assertRaises(ValueError, analyzer.analyze,
+                          vary(poker_winnings, 'Flush', -1))
+        self.assertRaises(KeyError, vary, poker_winnings, 'Four Deuces', 1)
+        with self.assertRaisesRegex(KeyError, 'Unknown combination: Five'):
+            vary(poker_winnings, 'Five of a Kind', 1)
+
+    def test_vary(self):
+        """Bonus for 5 coins is not dropped silently, full rows are taken
+        """
+        _, poker_winnings, _ = self.games['jacks_or_better']
+        self.assertEqual([8, 16, 24, 32, 40],
+                         vary(poker_winnings, 'Full House', 8)['Full House'])
+        self.assertRaises(ValueError, vary, poker_winnings, 'Royal Flush',
+                          300)
+        row = [250, 500, 750, 1000, 4800]
+        variant = vary(poker_winnings, 'Royal Flush', row)
+        self.assertEqual(row, variant['Royal Flush'])
+        self.assertEqual([250, 500, 750, 1000, 4000],
+                         poker_winnings['Royal Flush'])
+        self.assertRaises(ValueError, vary, poker_winnings, 'Royal Flush',
+                          row[:4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for seeded sessions and replay"""
+
+import unittest
+
+from engine.deck import Deck
+from engine.session import Session, replay, MULTIPLAY
+from engine.multiplay import draw_hands
+from engine.jacks_or_better import JacksOrBetter
+
+
+class TestSession(unittest.TestCase):
+    """Tests for Session and replay()"""
+
+    def test_streams(self):
+        """Streams depend on seed, table, round and substream only
+        """
+        session = Session(42)
+        self.assertEqual(session.stream(3).integers(1 << 60),
+                         Session(42).stream(3).integers(1 << 60))
+        values = {s.stream(n, k).integers(1 << 60)
+                  for s in session.tables(3)
+                  for n in range(3) for k in (0, MULTIPLAY)}
+        self.assertEqual(18, len(values))
+        self.assertNotEqual(Session().seed, Session().seed)
+        self.assertEqual(session.seed, Session(session.seed).seed)
+
+    def test_replay(self):
+        """Rounds of a game are regenerated in any order
+        """
+        engine = JacksOrBetter()
+        session = Session()
+        deck = Deck(engine.deck)
+        played = []
+        for hold in (0, 31, 0b10101, 0b00011):
+            # The same steps as in the game
+            number = session.new_round()
+            dealt = session.deal(deck, number)
+            drawn = iter(deck.deal(5 - bin(hold).count('1')))
+            final = [code if hold >> i & 1 else next(drawn)
+                     for i, code in enumerate(dealt)]
+            others = draw_hands(session.stream(number, MULTIPLAY), dealt,
+                                hold, 2)
+            played.append((number, dealt, hold, final, others))
+        for number, dealt, hold, final, others in reversed(played):
+            result = replay(engine, session.seed, number, hold, hands=3)
+            self.assertEqual(dealt, result.dealt)
+            self.assertEqual(final, result.final)
+            self.assertEqual(engine.evaluate_id(final), result.combination)
+            self.assertEqual(others.tolist(), result.hands.tolist())
+        self.assertEqual((0, 5), replay(engine, 1, 0, 0).hands.shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
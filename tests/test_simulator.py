@@ -0,0 +1,123 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for Monte Carlo simulator"""
+
+import unittest
+import numpy as np
+
+from engine.jacks_or_better import JacksOrBetter, poker_winnings
+from engine.simulator import (deal, deal_chunks, hold_nothing,
+                              hold_everything, hold_pairs, simulate)
+
+
+class TestDeal(unittest.TestCase):
+    """Tests for deal()"""
+
+    def test_deal(self):
+        """Cards in a row are different and all cards are dealt evenly
+        """
+        cards = deal(np.random.default_rng(), 52000)
+        self.assertEqual((52000, 10), cards.shape)
+        for row in cards[:1000]:
+            self.assertEqual(10, len(set(row.tolist())))
+        counts = np.bincount(cards.ravel(), minlength=52)
+        self.assertEqual(52, len(counts))
+        # 10000 cards of every code are expected
+        self.assertTrue(np.all(abs(counts - 10000) < 700))
+
+    def test_deal_deck(self):
+        """Cards are taken from given deck only
+        """
+        deck = [3, 7, 11, 40, 50]
+        cards = deal(np.random.default_rng(), 100, 5, deck)
+        for row in cards.tolist():
+            self.assertEqual(deck, sorted(row))
+
+    def test_permutations(self):
+        """Every ordered deal is equally likely, as when cards are dealt
+        one by one without replacement
+        """
+        cards = deal(np.random.default_rng(), 60000, 3, [0, 1, 2, 3])
+        keys = cards @ np.array([16, 4, 1])
+        counts = np.bincount(keys)[np.unique(keys)]
+        # 24 ordered deals of 3 cards of 4, 2500 of every one are expected
+        self.assertEqual(24, len(counts))
+        self.assertTrue(np.all(abs(counts - 2500) < 250))
+
+    def test_deal_chunks(self):
+        """Chunks are bounded and cover all rounds, they depend on seed
+        only
+        """
+        chunks = list(deal_chunks(np.random.default_rng(2), 25000, 10000))
+        self.assertEqual([(10000, 10), (10000, 10), (5000, 10)],
+                         [chunk.shape for chunk in chunks])
+        again = deal_chunks(np.random.default_rng(2), 25000, 10000)
+        for chunk, other in zip(chunks, again):
+            self.assertTrue(np.array_equal(chunk, other))
+
+
+class TestStrategies(unittest.TestCase):
+    """Tests for built-in hold strategies"""
+
+    def test_strategies(self):
+        """Hold masks of built-in strategies
+        """
+        dealt = np.array([[0, 5, 10, 15, 20],
+                          [0, 1, 10, 15, 17],
+                          [0, 5, 4, 33, 7]])
+        self.assertEqual([0, 0, 0], hold_nothing(dealt).tolist())
+        self.assertEqual([31, 31, 31], hold_everything(dealt).tolist())
+        self.assertEqual([0, 0b11, 0b10110], hold_pairs(dealt).tolist())
+
+
+class TestSimulate(unittest.TestCase):
+    """Tests for simulate()"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = JacksOrBetter()
+
+    def test_report(self):
+        """Report is consistent
+        """
+        report = simulate(self.engine, poker_winnings, 10000, coins=3,
+                          strategy=hold_pairs, processes=1, chunk_size=3000)
+        self.assertEqual(10000, report.hands)
+        self.assertEqual(30000, report.bet)
+        self.assertEqual(10000, sum(report.combinations.values()))
+        self.assertEqual(10000, sum(report.payouts.values()))
+        self.assertEqual(
+            report.won,
+            sum(n * poker_winnings[name][2]
+                for name, n in report.combinations.items() if name))
+
+    def test_seed(self):
+        """The same seed gives the same result with any number of processes
+        """
+        reports = [simulate(self.engine, poker_winnings, 30000, seed=1,
+                            processes=processes, shard_size=10000)
+                   for processes in (1, 1, 2)]
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(reports[0], reports[2])
+        self.assertNotEqual(
+            reports[0],
+            simulate(self.engine, poker_winnings, 30000, seed=2,
+                     processes=1, shard_size=10000))
+
+    def test_frequencies(self):
+        """Frequencies of dealt combinations are close to exact ones
+        """
+        report = simulate(self.engine, poker_winnings, 200000,
+                          strategy=hold_everything, processes=1)
+        for name, exact in (('Jacks or Better', 337920),
+                            ('Two Pairs', 123552),
+                            ('', 2063880)):
+            self.assertAlmostEqual(exact / 2598960,
+                                   report.combinations[name] / 200000,
+                                   delta=0.005)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for solver"""
+
+import math
+import random
+import itertools
+import unittest
+import numpy as np
+
+from engine.base import Hand
+from engine.solver import Solver, held_cards, hold_mask
+from engine import tens_or_better, jacks_or_better, deuces_wild
+
+engines = (
+    (tens_or_better.TensOrBetter(), tens_or_better.poker_winnings),
+    (jacks_or_better.JacksOrBetter(), jacks_or_better.poker_winnings),
+    (deuces_wild.DeucesWild(), deuces_wild.poker_winnings)
+)
+
+
+class TestSolver(unittest.TestCase):
+    """Tests for Solver"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solvers = [(engine, Solver(engine, poker_winnings))
+                       for engine, poker_winnings in engines]
+
+    def brute_force_combinations(self, engine, cards, hold):
+        """Evaluate every draw
+        """
+        held = held_cards(cards, hold)
+        deck = [code for code in range(52) if code not in cards]
+        hands = [held + list(draw)
+                 for draw in itertools.combinations(deck, 5 - len(held))]
+        return engine.evaluate_batch(hands)
+
+    def brute_force(self, engine, solver, cards, hold):
+        """Count final hands by evaluating every draw
+        """
+        return np.bincount(self.brute_force_combinations(engine, cards, hold),
+                           minlength=len(solver.combinations)).tolist()
+
+    def test_hold_counts(self):
+        """Counts of combinations are the same as given by brute force for
+        holds of 2 or more cards
+        """
+        random.seed(None)
+        deals = [random.sample(range(52), 5) for _ in range(3)]
+        # Two deuces and suited cards
+        deals.append([0, 1, 36, 40, 44])
+        for engine, solver in self.solvers:
+            for cards in deals:
+                counts = solver.hold_counts(cards)
+                for hold in range(32):
+                    if bin(hold).count('1') >= 2:
+                        self.assertEqual(
+                            self.brute_force(engine, solver, cards, hold),
+                            counts[hold].tolist())
+
+    def test_number_of_draws(self):
+        """Every hold counts all possible draws
+        """
+        for _, solver in self.solvers:
+            counts = solver.hold_counts(random.sample(range(52), 5))
+            for hold in range(32):
+                self.assertEqual(
+                    math.comb(47, 5 - bin(hold).count('1')),
+                    counts[hold].sum())
+
+    def test_cache(self):
+        """Cached counts of suit-isomorphic hands are reordered by holds
+        """
+        for engine, poker_winnings in engines:
+            solver = Solver(engine, poker_winnings)
+            cached = Solver(engine, poker_winnings, cache_size=10)
+            cards = random.sample(range(52), 5)
+            # Suit permutation of the same cards in other order
+            renamed = [code ^ 1 for code in reversed(cards)]
+            for hand in (cards, renamed):
+                self.assertEqual(solver.hold_counts(hand).tolist(),
+                                 cached.hold_counts(hand).tolist())
+            self.assertEqual(1, len(cached.memo))
+
+    def test_best_hold(self):
+        """Royal flush is held as it is
+        """
+        for _, solver in self.solvers:
+            cards = Hand.from_strings(['S']*5, ['10', 'J', 'Q', 'K', 'A'])
+            hold, value = solver.best_hold(cards, 5)
+            self.assertEqual(31, hold)
+            self.assertEqual(4000, value)
+            self.assertTrue(np.all(solver.hold_values(cards, 5) <= value))
+
+    def test_hold_variances(self):
+        """Distribution of every hold sums to 1, variance is the same as
+        variance of winnings of all draws
+        """
+        cards = random.sample(range(52), 5)
+        for engine, solver in self.solvers:
+            probabilities = solver.hold_probabilities(cards)
+            self.assertTrue(np.allclose(1, probabilities.sum(axis=1)))
+            variances = solver.hold_variances(cards, 5)
+            values = solver.hold_values(cards, 5)
+            for hold in (0b11110, 0b11111):
+                winnings = solver.pays(5)[
+                    self.brute_force_combinations(engine, cards, hold)]
+                self.assertAlmostEqual(winnings.mean(), values[hold])
+                self.assertAlmostEqual(winnings.var(), variances[hold])
+
+    def test_hold_mask(self):
+        """Hold mask and held cards
+        """
+        self.assertEqual(0b10101, hold_mask([True, False, True, False, True]))
+        self.assertEqual(0, hold_mask([False]*5))
+        self.assertEqual([10, 30, 50],
+                         held_cards([10, 20, 30, 40, 50], 0b10101))
+
+
+if __name__ == '__main__':
+    unittest.main()
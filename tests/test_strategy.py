@@ -0,0 +1,112 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for compiled strategy"""
+
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+
+from engine.base import Hand
+from engine.canonical import canonical_form
+from engine.solver import Solver
+from engine.returns import load_game
+from engine.sensitivity import Analyzer
+from engine.simulator import simulate
+from engine.strategy import Strategy, compile_strategy, describe_hold
+
+
+def rename_suits(cards):
+    """Shuffle cards and rename their suits randomly"""
+    permutation = random.sample(range(4), 4)
+    return random.sample([code & ~3 | permutation[code & 3]
+                          for code in cards], 5)
+
+
+class TestStrategy(unittest.TestCase):
+    """Tests for Strategy and compile_strategy()"""
+
+    @classmethod
+    def setUpClass(cls):
+        random.seed(None)
+        forms = {canonical_form(random.sample(range(52), 5))
+                 for _ in range(40)}
+        deals = (np.array(sorted(forms)), np.ones(len(forms), dtype=int))
+        cls.games = {}
+        for name in ('jacks_or_better', 'deuces_wild'):
+            engine, poker_winnings = load_game(name)
+            analyzer = Analyzer.solve(engine, poker_winnings, processes=1,
+                                      deals=deals)
+            cls.games[name] = (engine, poker_winnings, Solver(
+                engine, poker_winnings), compile_strategy(
+                analyzer, poker_winnings, 5))
+        cls.deals = deals[0].tolist()
+
+    def test_hold(self):
+        """Compiled hold has the best expected winning for any deal of class
+        """
+        for _, _, solver, strategy in self.games.values():
+            for form in self.deals:
+                cards = rename_suits(form)
+                values = solver.hold_values(cards, 5)
+                self.assertAlmostEqual(values.max(),
+                                       values[strategy.hold(cards)])
+
+    def test_batch(self):
+        """Batch lookup gives the same holds as lookup of one deal
+        """
+        _, _, _, strategy = self.games['deuces_wild']
+        dealt = np.array([rename_suits(form) for form in self.deals])
+        self.assertEqual([strategy.hold(cards) for cards in dealt.tolist()],
+                         strategy(dealt).tolist())
+
+    def test_save_load(self):
+        """Saved strategy gives the same holds
+        """
+        _, _, _, strategy = self.games['jacks_or_better']
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'strategy.npz')
+            strategy.save(path)
+            loaded = Strategy.load(path)
+        for form in self.deals:
+            cards = rename_suits(form)
+            self.assertEqual(strategy.hold(cards), loaded.hold(cards))
+
+    def test_ranked_holds(self):
+        """Patterns cover every deal and are ordered by expected winning
+        """
+        engine, _, _, strategy = self.games['deuces_wild']
+        ranked = strategy.ranked_holds(engine.wild_ranks)
+        self.assertAlmostEqual(1, sum(item.frequency for item in ranked))
+        values = [item.value for item in ranked]
+        self.assertEqual(sorted(values, reverse=True), values)
+
+    def test_describe_hold(self):
+        """Held ranks are listed from the highest one with suitedness
+        """
+        cards = Hand.from_strings(['S', 'S', 'H', 'S', 'C'],
+                                  ['J', 'A', '2', '10', '2'])
+        self.assertEqual('A J 10 suited', describe_hold(cards, 0b01011))
+        self.assertEqual('A J 2', describe_hold(cards, 0b00111))
+        self.assertEqual('A J 2 suited',
+                         describe_hold(cards, 0b00111, ('2',)))
+        self.assertEqual('Draw five cards', describe_hold(cards, 0))
+
+    def test_simulate(self):
+        """Strategy can be used by simulator for compiled deals only
+        """
+        engine, poker_winnings, _, strategy = self.games['jacks_or_better']
+        self.assertRaises(KeyError, simulate, engine, poker_winnings, 100,
+                          strategy=strategy, seed=1, processes=1)
+        while True:
+            cards = random.sample(range(52), 5)
+            if list(canonical_form(cards)) not in self.deals:
+                break
+        self.assertRaises(KeyError, strategy.hold, cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
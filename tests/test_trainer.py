@@ -0,0 +1,58 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for strategy trainer"""
+
+import unittest
+
+from engine.base import Hand
+from engine.cache import Cache
+from engine.solver import Solver
+from engine.trainer import Trainer
+from engine import jacks_or_better
+
+
+class TestTrainer(unittest.TestCase):
+    """Tests for Trainer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = Solver(jacks_or_better.JacksOrBetter(),
+                            jacks_or_better.poker_winnings)
+
+    def test_grade(self):
+        """Optimal hold is not an error, other holds cost their loss
+        """
+        trainer = Trainer(self.solver, Cache())
+        cards = Hand.from_strings(['S', 'S', 'S', 'S', 'H'],
+                                  ['10', 'J', 'Q', 'K', '2'])
+        values = self.solver.hold_values(cards, 5)
+        decision = trainer.grade(cards, 15, 5)
+        self.assertEqual(15, decision.best_hold)
+        self.assertEqual(0, decision.loss)
+        self.assertEqual('K Q J 10 suited', decision.best_pattern)
+        decision = trainer.grade(cards, 0, 5, hands=3)
+        self.assertAlmostEqual(values[15] - values[0], decision.loss)
+        self.assertAlmostEqual(values[0], decision.value)
+        self.assertEqual((2, 1), (trainer.decisions, trainer.errors))
+        self.assertAlmostEqual(0.5, trainer.error_rate)
+        self.assertAlmostEqual(decision.loss * 3, trainer.cost)
+
+    def test_solved_once(self):
+        """Hand is solved once after the deal, grading and suit-isomorphic
+        hands are taken from cache
+        """
+        trainer = Trainer(self.solver, Cache())
+        cards = Hand.from_strings(['S', 'C', 'H', 'D', 'S'],
+                                  ['3', '8', 'J', 'Q', 'A'])
+        trainer.hold_values(cards, 1)
+        self.assertEqual((0, 1), trainer.cache.stats()[:2])
+        trainer.grade(cards, 0, 1)
+        trainer.grade(Hand.from_strings(['C', 'S', 'D', 'H', 'C'],
+                                        ['3', '8', 'J', 'Q', 'A']), 0, 1)
+        self.assertEqual((2, 1), trainer.cache.stats()[:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,18 @@
 
 """Unit tests for main module"""
 
+import os
+import tempfile
 import unittest
 import ddt
 from tests import tools
 
 from vpoker import CARD_BACKGROUND_HEIGHT, SCREEN_WIDTH
-from vpoker import Card, init_deck
+from vpoker import Card, Dbase
+from engine.base import decode_card
+from engine.deck import Deck
+from engine.session import Session, replay
+from engine.jacks_or_better import JacksOrBetter
 
 
 @ddt.ddt
@@ -130,8 +136,8 @@ class TestCard(unittest.TestCase):
         self.assertRaises(TypeError, self.card.set_back, 3)
 
 
-class TestInitDeck(unittest.TestCase):
-    """init_deck() testing"""
+class TestDeck(unittest.TestCase):
+    """Deck of the game testing"""
 
     @classmethod
     def setUpClass(cls):
@@ -151,11 +157,42 @@ class TestInitDeck(unittest.TestCase):
             ('S', 'A'),  ('C', 'A'),  ('H', 'A'),  ('D', 'A'),
         )
 
-    def test_init_deck(self):
-        """Check if standard test deck and generated deck are equal
+    def test_deck(self):
+        """Check if standard test deck and cards dealt by the game deck (as
+        game() shows them) are equal
         """
-        self.assertEqual(len(self.standard_deck), len(init_deck()))
-        self.assertEqual(set(self.standard_deck), set(init_deck()))
+        deck = Deck(JacksOrBetter().deck)
+        cards = [decode_card(code) for code in deck.deal(len(deck))]
+        self.assertEqual(len(self.standard_deck), len(cards))
+        self.assertEqual(set(self.standard_deck), set(cards))
+
+
+class TestDbase(unittest.TestCase):
+    """Tests for rounds kept in the database"""
+
+    def test_rounds(self):
+        """Kept rounds are replayed as they were dealt
+        """
+        engine = JacksOrBetter()
+        session = Session()
+        deck = Deck(engine.deck)
+        with tempfile.TemporaryDirectory() as directory:
+            dbase = Dbase(os.path.join(directory, 'test.db'))
+            session_id = dbase.add_session(session.seed)
+            dealt = {}
+            for hold in (0, 31, 0b00101):
+                number = session.new_round()
+                dealt[number] = session.deal(deck, number)
+                dbase.add_round(session_id, number, hold, 3)
+            for number, cards in dealt.items():
+                seed, number, hold, hands = dbase.get_round(session_id,
+                                                            number)
+                self.assertEqual(session.seed, seed)
+                self.assertEqual(3, hands)
+                self.assertEqual(cards, replay(engine, seed, number, hold,
+                                               hands=hands).dealt)
+            self.assertRaises(KeyError, dbase.get_round, session_id, 3)
+            del dbase
 
 
 if __name__ == '__main__':
@@ -0,0 +1,198 @@
+# Copyright (c) 2016-2023 Kirill 'Kolyat' Kiselnikov
+# This file is the part of vpoker, released under modified MIT license
+# See the file LICENSE.txt included in this distribution
+
+"""Unit tests for generic engine with wild cards"""
+
+import itertools
+import unittest
+import numpy as np
+
+from engine.base import ranks, rank_primes, code_ranks, deck_size
+from engine import tens_or_better, jacks_or_better
+from engine.simulator import deal
+from engine.solver import Solver
+from engine.wild import JOKER, straight_masks, WildEngine
+from engine.joker_poker import JokerPoker, poker_winnings as joker_winnings
+from engine.deuces_joker_wild import DeucesJokerWild, \
+    poker_winnings as deuces_joker_winnings
+
+rank_or_better_rules = (
+    ('natural_royal_flush', None),
+    ('straight_flush', None),
+    ('four_of_a_kind', None),
+    ('full_house', None),
+    ('flush', None),
+    ('straight', None),
+    ('three_of_a_kind', None),
+    ('two_pairs', None)
+)
+
+
+class GenericTensOrBetter(WildEngine):
+    rules = rank_or_better_rules + (('rank_or_better', '10'),)
+    combinations = tuple(tens_or_better.combination_names)
+
+
+class GenericJacksOrBetter(WildEngine):
+    rules = rank_or_better_rules + (('rank_or_better', 'J'),)
+    combinations = tuple(jacks_or_better.combination_names)
+
+
+def natural_rules(cards, straights):
+    """Rules a hand of natural cards satisfies, repeated cards are allowed
+
+    :param cards: five pairs of rank index and suit index
+    :type cards: list
+
+    :return: rule kinds and rank indexes of pairs
+    :type: set
+    """
+    counts = sorted((c for c in
+                     np.bincount([r for r, _ in cards]).tolist() if c),
+                    reverse=True) + [0]
+    mask = sum(1 << r for r in {r for r, _ in cards})
+    suited = len({s for _, s in cards}) == 1
+    straight = counts[0] == 1 and mask in straights
+    satisfied = {
+        'five_of_a_kind': counts[0] == 5,
+        'royal_flush': suited and mask == straight_masks[-1],
+        'straight_flush': suited and straight,
+        'four_of_a_kind': counts[0] >= 4,
+        'full_house': counts[:2] == [3, 2],
+        'flush': suited,
+        'straight': straight,
+        'three_of_a_kind': counts[0] >= 3,
+        'two_pairs': counts[0] >= 2 and counts[1] >= 2
+    }
+    result = {kind for kind, flag in satisfied.items() if flag}
+    return result | {('pair', r) for r, _ in cards
+                     if [c[0] for c in cards].count(r) >= 2}
+
+
+def brute_force(engine, cards):
+    """Find winning combination by substituting wild cards by every card,
+    repeats of natural cards are allowed
+
+    :return: winning combination
+    :type: str
+    """
+    wild = [code for code in cards
+            if code == JOKER or code_ranks[code] in engine.wild_ranks]
+    naturals = [(code >> 2, code & 3) for code in cards if code not in wild]
+    wild_ranked = sum(code != JOKER for code in wild)
+    reachable = set()
+    for substitutes in itertools.product(
+            itertools.product(range(len(ranks)), range(4)),
+            repeat=len(wild)):
+        reachable |= natural_rules(naturals + list(substitutes),
+                                   engine.straights)
+    for (kind, param), name in zip(engine.rules, engine.combinations):
+        if kind == 'natural_royal_flush':
+            found = not wild and 'royal_flush' in reachable
+        elif kind == 'wild_royal_flush':
+            found = bool(wild) and 'royal_flush' in reachable
+        elif kind == 'wild_ranks':
+            found = wild_ranked >= param
+        elif kind == 'wild_cards':
+            found = len(wild) >= param
+        elif kind == 'rank_or_better':
+            found = any(('pair', r) in reachable
+                        for r in range(ranks.index(param), len(ranks)))
+        else:
+            found = kind in reachable
+        if found:
+            return name
+    return ''
+
+
+class TestWildEngine(unittest.TestCase):
+    """Tests for WildEngine and its games"""
+
+    def test_rank_or_better(self):
+        """Generic engine without wild cards gives the same lookup table as
+        engines of 'rank or better' games
+        """
+        for generic, engine in (
+                (GenericTensOrBetter, tens_or_better.TensOrBetter),
+                (GenericJacksOrBetter, jacks_or_better.JacksOrBetter)):
+            expected, table = engine.lookup_table(), generic.lookup_table()
+            self.assertEqual(set(expected), set(table))
+            # Five cards of the same rank are not compared, they are not
+            # dealt without wild cards
+            for key in expected:
+                if not any(key % prime**5 == 0
+                           for prime in rank_primes.values()):
+                    self.assertEqual(expected[key], table[key])
+            self.assertEqual(52, len(generic().deck))
+            hands = deal(np.random.default_rng(), 2000, 5)
+            self.assertEqual(engine().evaluate_batch(hands).tolist(),
+                             generic().evaluate_batch(hands).tolist())
+
+    def test_brute_force(self):
+        """Both evaluation modes and batch evaluation give the same result
+        as substitution of wild cards
+        """
+        rng = np.random.default_rng()
+        for cls in (JokerPoker, DeucesJokerWild):
+            engine, table = cls(), cls('table')
+            hands = deal(rng, 300, 5, engine.deck)
+            # Hands with joker and with more wild cards
+            hands[:100, 0] = JOKER
+            hands[100:150, 1:3] = [[1, 2]]
+            # Brute force is too slow for more than 2 wild cards
+            hands = hands[[len(set(hand)) == 5 and sum(
+                engine.wild[code] for code in hand) <= 2
+                for hand in hands.tolist()]]
+            batch = engine.evaluate_batch(hands)
+            for cards, result in zip(hands.tolist(), batch.tolist()):
+                expected = brute_force(engine, cards)
+                self.assertEqual(expected, engine.evaluate(cards), cards)
+                self.assertEqual(expected, table.evaluate(cards), cards)
+                self.assertEqual(engine.combination_ids[expected], result)
+
+    def test_hands(self):
+        """Known hands
+        """
+        joker = JokerPoker()
+        self.assertEqual('Royal Flush', joker(
+            ['H', 'H', 'H', 'H', 'H'], ['10', 'J', 'Q', 'K', 'A']))
+        self.assertEqual('Wild Royal Flush', joker(
+            ['H', '*', 'H', 'H', 'H'], ['10', 'Joker', 'Q', 'K', 'A']))
+        self.assertEqual('Straight', joker(
+            ['H', '*', 'S', 'H', 'H'], ['A', 'Joker', '3', '4', '5']))
+        self.assertEqual('Kings or Better', joker(
+            ['H', '*', 'S', 'H', 'D'], ['K', 'Joker', '3', '9', '5']))
+        self.assertEqual('', joker(
+            ['H', '*', 'S', 'H', 'D'], ['Q', 'Joker', '3', '9', '5']))
+        deuces = DeucesJokerWild('table')
+        self.assertEqual('Five Wild Cards', deuces(
+            ['S', 'C', '*', 'H', 'D'], ['2', '2', 'Joker', '2', '2']))
+        self.assertEqual('Four Deuces', deuces(
+            ['S', 'C', 'H', 'H', 'D'], ['2', '2', 'A', '2', '2']))
+        self.assertEqual('Five of a Kind', deuces(
+            ['S', 'C', '*', 'H', 'D'], ['2', '7', 'Joker', '7', '7']))
+
+    def test_checks(self):
+        """Joker is accepted once and only by games with joker
+        """
+        self.assertRaises(KeyError, GenericJacksOrBetter(),
+                          ['S', '*', 'S', 'S', 'S'],
+                          ['2', 'Joker', '3', '4', '5'])
+        self.assertRaises(KeyError, JokerPoker(),
+                          ['S', '*', 'S', 'S', '*'],
+                          ['2', 'Joker', '3', '4', 'Joker'])
+        self.assertRaises(KeyError, JokerPoker(),
+                          ['S', 'S', 'S', 'S', 'S'],
+                          ['2', 'Joker', '3', '4', '5'])
+        self.assertRaises(ValueError, JokerPoker(),
+                          ['*', 'S'], ['Joker', '3'])
+        self.assertEqual(deck_size + 1, len(JokerPoker().deck))
+        self.assertEqual(tuple(joker_winnings), JokerPoker.combinations)
+        self.assertEqual(tuple(deuces_joker_winnings),
+                         DeucesJokerWild.combinations)
+        self.assertRaises(ValueError, Solver, JokerPoker(), joker_winnings)
+
+
+if __name__ == '__main__':
+    unittest.main()
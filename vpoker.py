@@ -6,7 +6,6 @@
 
 import sys
 import os
-import random
 import time
 import collections
 import logging
@@ -14,6 +13,14 @@ import sqlite3
 import pygame
 from pygame.locals import *
 from settings import *
+from engine.base import suit_list, ranks, decode_card, Hand
+from engine.deck import Deck
+from engine.session import Session, MULTIPLAY
+from engine import registry
+from engine.solver import hold_mask, Solver
+from engine.multiplay import play_hands
+from engine.trainer import Trainer
+from engine.history import History
 
 
 class Dbase:
@@ -39,11 +46,55 @@ class Dbase:
     def set_creds(self, c):
         self.creds = c
 
-    def decrease_creds(self):
-        self.set_creds(self.get_creds() - 1)
+    def decrease_creds(self, c=1):
+        self.set_creds(self.get_creds() - c)
 
-    def increase_creds(self):
-        self.set_creds(self.get_creds() + 1)
+    def increase_creds(self, c=1):
+        self.set_creds(self.get_creds() + c)
+
+    def add_session(self, seed):
+        """Keep seed of a session, so its rounds can be replayed
+
+        :return: session ID
+        :type: int
+        """
+        self.cursor.execute(
+            'CREATE TABLE IF NOT EXISTS sessions (seed TEXT NOT NULL,'
+            ' started TIMESTAMP DEFAULT CURRENT_TIMESTAMP)'
+        )
+        self.cursor.execute(
+            'CREATE TABLE IF NOT EXISTS rounds (session INTEGER NOT NULL,'
+            ' number INTEGER NOT NULL, hold INTEGER NOT NULL,'
+            ' hands INTEGER NOT NULL, PRIMARY KEY (session, number))'
+        )
+        self.cursor.execute('INSERT INTO sessions (seed) VALUES (?)',
+                            (str(seed),))
+        self.conn.commit()
+        return self.cursor.lastrowid
+
+    def add_round(self, session, number, hold, hands):
+        """Keep a round, see engine.session.replay()"""
+        self.cursor.execute(
+            'INSERT INTO rounds (session, number, hold, hands)'
+            ' VALUES (?, ?, ?, ?)', (session, number, hold, hands))
+        self.conn.commit()
+
+    def get_round(self, session, number):
+        """Get arguments of engine.session.replay() for a kept round
+
+        :return: seed, round number, hold mask and number of hands
+        :type: tuple
+
+        :raise KeyError: round is not kept
+        """
+        self.cursor.execute(
+            'SELECT seed, number, hold, hands FROM rounds'
+            ' JOIN sessions ON sessions.rowid = rounds.session'
+            ' WHERE session=? AND number=?', (session, number))
+        row = self.cursor.fetchone()
+        if row is None:
+            raise KeyError('Unknown round: ', (session, number))
+        return (int(row[0]),) + tuple(row[1:])
 
     def update_creds(self):
         self.cursor.execute(
@@ -235,21 +286,30 @@ def draw_table():
     table_surface.fill(BACKGROUND_COLOR)
     # table_surface = table_surface.convert()
     # Print available creds
-    text = font.render('Creds: {}'.format(dbase.get_creds()),
-                       ANTIALIASING, FONT_COLOR)
+    if hands > 1:
+        text = font.render('Creds: {}    Hands: {}'.format(
+            dbase.get_creds(), hands), ANTIALIASING, FONT_COLOR)
+    else:
+        text = font.render('Creds: {}'.format(dbase.get_creds()),
+                           ANTIALIASING, FONT_COLOR)
     text_rect = text.get_rect()
     text_rect.centerx = INDENTATION + int(text.get_width()/2)
     text_rect.centery = CREDS_Y
     table_surface.blit(text, text_rect)
+    if trainer is not None:
+        draw_trainer()
     # Draw cell for winning combination's name
     combination_rect = pygame.Rect(TABLE_X, TABLE_Y, COMBINATION_CELL_WIDTH,
                                    CELL_HEIGHT)
-    for name in combination_names:
-        if name == win_combo:
+    for combination, name in enumerate(combination_names):
+        won = win_counts[combination] > 0
+        if won:
             pygame.draw.rect(table_surface, WIN_COLOR, combination_rect, 0)
         pygame.draw.rect(table_surface, TABLE_BORDER_COLOR, combination_rect,
                          BORDER_WIDTH)
-        # Print combination's name
+        # Print combination's name and number of hands with it
+        if won and hands > 1:
+            name = '{} x{}'.format(name, win_counts[combination])
         text = font.render(name, ANTIALIASING, FONT_COLOR)
         text_rect = text.get_rect()
         text_rect.centerx = combination_rect.centerx
@@ -259,14 +319,14 @@ def draw_table():
         winning_rect = pygame.Rect(TABLE_X + COMBINATION_CELL_WIDTH - 1,
                                    combination_rect.top, WINNING_CELL_WIDTH,
                                    CELL_HEIGHT)
-        for i, item in enumerate(poker_winnings[name], start=1):
-            if coins == i and name == win_combo:
+        for i, item in enumerate(paytable[combination], start=1):
+            if coins == i and won:
                 pygame.draw.rect(table_surface, CARD_BACKGROUND_COLOR,
                                  winning_rect, 0)
             elif coins == i:
                 pygame.draw.rect(table_surface, TABLE_SELECTED_COLOR,
                                  winning_rect, 0)
-            elif name == win_combo:
+            elif won:
                 pygame.draw.rect(table_surface, WIN_COLOR,
                                  winning_rect, 0)
             else:
@@ -274,7 +334,7 @@ def draw_table():
             pygame.draw.rect(table_surface, TABLE_BORDER_COLOR, winning_rect,
                              BORDER_WIDTH)
             # Print number of winning coins
-            if coins == i and name == win_combo:
+            if coins == i and won:
                 font.set_bold(True)
                 text = font.render(str(item), ANTIALIASING, WIN_FONT_COLOR)
             else:
@@ -290,6 +350,31 @@ def draw_table():
     pygame.display.flip()
 
 
+def draw_trainer():
+    """Show grade of the last hold and summary of the session in trainer
+    mode
+    """
+    global table_surface
+    lines = []
+    if decision is not None:
+        lines.append('Your EV: {:.2f}'.format(decision.value))
+        lines.append('Best EV: {:.2f}'.format(decision.best_value))
+        if decision.loss:
+            lines.append('EV loss: {:.2f}'.format(decision.loss))
+            lines.append('Best: ' + decision.best_pattern)
+        else:
+            lines.append('Best hold')
+    lines.append('Errors: {}/{} ({:.0%})'.format(
+        trainer.errors, trainer.decisions, trainer.error_rate))
+    lines.append('Cost: {:.2f}'.format(trainer.cost))
+    for i, line in enumerate(lines, start=1):
+        text = font.render(line, ANTIALIASING, FONT_COLOR)
+        text_rect = text.get_rect()
+        text_rect.centerx = INDENTATION + int(text.get_width()/2)
+        text_rect.centery = MESSAGE_Y + INDENTATION * i
+        table_surface.blit(text, text_rect)
+
+
 def show_message():
     """Show message if no creds left
     """
@@ -303,15 +388,6 @@ def show_message():
     pygame.display.flip()
 
 
-def init_deck():
-    """Initialize playing deck with 52 cards
-
-    :return: deck with 52 cards
-    :type: list of tuples
-    """
-    return [(suit, rank) for suit in suits for rank in ranks]
-
-
 def game():
     """Main game function
     """
@@ -320,15 +396,16 @@ def game():
     global dbase
     global coins
     global win_combo
+    global win_counts
+    global decision
     global cards_surface
     # Main game loop
     while True:
         coins = 0
-        win_combo = ''
-        # Initialize playing deck
-        deck = init_deck()
-        # Initialize random generator with current system time
-        random.seed(None)
+        win_combo = Combination.NOTHING
+        win_counts = [0] * len(Combination)
+        # Return all cards to the deck
+        deck.reset()
         # Initialize cards
         cards = []
         for x in range(int(INDENTATION + CARD_BACKGROUND_WIDTH / 2),
@@ -344,7 +421,7 @@ def game():
         draw_table()
         for card in cards:
             card.draw()
-        if dbase.get_creds() < 1:
+        if dbase.get_creds() < hands:
             show_message()
             while True:
                 clock.tick(FPS)
@@ -357,14 +434,15 @@ def game():
             clock.tick(FPS)
             for event in pygame.event.get():
                 if event.type == KEYDOWN:
+                    # Every hand is bet the same number of coins
                     if event.key == K_UP:
-                        if coins < 5 and dbase.get_creds() > 0:
+                        if coins < 5 and dbase.get_creds() >= hands:
                             coins += 1
-                            dbase.decrease_creds()
+                            dbase.decrease_creds(hands)
                     if event.key == K_DOWN:
                         if coins > 0:
                             coins -= 1
-                            dbase.increase_creds()
+                            dbase.increase_creds(hands)
                     if event.key == K_RETURN:
                         if coins > 0:
                             wait = False
@@ -379,11 +457,18 @@ def game():
         #
         dbase.update_creds()
         active_card = 0
-        for card in cards:
-            random_card = deck.pop(random.randint(0, len(deck)-1))
-            card.set_card(random_card)
+        # Round is reproduced by replay() from seed, number, hold and hands
+        # kept in the database (see Dbase.get_round())
+        round_number = session.new_round()
+        dealt = Hand(session.deal(deck, round_number))
+        for card, code in zip(cards, dealt):
+            card.set_card(decode_card(code))
             card.draw()
             time.sleep(ANIMATION_SPEED)
+        # Hand is solved while player thinks, it takes a few milliseconds
+        # and then the hold is graded by table lookup
+        if trainer is not None:
+            trainer.hold_values(dealt, coins)
         cards[active_card].set_active(True)
         cards[active_card].draw()
         wait = True
@@ -417,6 +502,12 @@ def game():
                     exit(0)
         cards[active_card].set_active(False)
         cards[active_card].draw()
+        hold = hold_mask([card.get_held() for card in cards])
+        if session_id is not None:
+            dbase.add_round(session_id, round_number, hold, hands)
+        if trainer is not None:
+            decision = trainer.grade(dealt, hold, coins, hands)
+            draw_table()
         #
         # Stage 3: remove cards that were not held
         #
@@ -428,10 +519,11 @@ def game():
         #
         # Stage 4: hand out new cards
         #
+        drawn_cards = deck.deal(5 - sum(card.get_held() for card in cards))
+        drawn = iter(drawn_cards)
         for card in cards:
             if not card.get_held():
-                random_card = deck.pop(random.randint(0, len(deck)-1))
-                card.set_card(random_card)
+                card.set_card(decode_card(next(drawn)))
                 card.draw()
                 time.sleep(ANIMATION_SPEED)
         #
@@ -442,12 +534,23 @@ def game():
         for card in cards:
             card_suits.append(card.get_suit())
             card_ranks.append(card.get_rank())
-        win_combo = combo_check(card_suits, card_ranks)
-        if win_combo:
-            dbase.set_creds(
-                dbase.get_creds() + poker_winnings[win_combo][coins-1])
+        win_combo = combo_check.evaluate_id(
+            Hand.from_strings(card_suits, card_ranks))
+        won = int(paytable[win_combo, coins-1])
+        # Other hands draw from their own copies of the rest of the deck
+        if hands > 1:
+            _, counts, other_won = play_hands(
+                combo_check, paytable, session.stream(round_number, MULTIPLAY),
+                dealt, hold, hands - 1, coins)
+            win_counts = counts.tolist()
+            won += other_won
+        win_counts[win_combo] += 1
+        history.append(session_id or 0, round_number, poker_game.code, coins,
+                       hands, dealt, hold, drawn_cards, win_combo)
+        if won:
+            dbase.set_creds(dbase.get_creds() + won)
             dbase.update_creds()
-            draw_table()
+        draw_table()
         # Wait for player
         wait = True
         while wait:
@@ -466,8 +569,9 @@ def game():
 def menu():
     """Main menu
 
-    :return: game and poker types
-    :type: str
+    :return: game type, poker type (name of registered game), number of
+             hands per deal and True for trainer mode
+    :type: tuple
     """
 
     def clrscr():
@@ -501,16 +605,14 @@ def menu():
             item = input('> ', )
         game_type = game_types[item]
         if game_type == 'Exit':
-            return game_type, 'Exit'
+            return game_type, 'Exit', 0, False
     else:
         game_type = 'New game'
 
-    poker_types = collections.OrderedDict((
-        ('1', 'Tens or Better'),
-        ('2', 'Jacks or Better'),
-        ('3', 'Deuces Wild'),
-        ('0', 'Exit')
-    ))
+    poker_types = collections.OrderedDict(
+        (str(i), poker_game.caption)
+        for i, poker_game in enumerate(registry.games.values(), start=1))
+    poker_types['0'] = 'Exit'
     item = ''
     while item not in poker_types.keys():
         clrscr()
@@ -520,20 +622,38 @@ def menu():
             print(' - '.join((k, v)))
         print()
         item = input('> ', )
-    poker_type = poker_types[item]
-    return game_type, poker_type
+    if poker_types[item] == 'Exit':
+        return game_type, 'Exit', 0, False
+    poker_type = list(registry.games)[int(item) - 1]
 
+    hand_types = collections.OrderedDict(
+        (str(i), n) for i, n in enumerate(HANDS_PER_DEAL, start=1))
+    item = ''
+    while item not in hand_types.keys():
+        clrscr()
+        print('Select number of hands')
+        print()
+        for k, v in hand_types.items():
+            print(' - '.join((k, str(v))))
+        print()
+        item = input('> ', )
+    hands_per_deal = hand_types[item]
+
+    modes = collections.OrderedDict((
+        ('1', 'Play'),
+        ('2', 'Trainer (expected winning of every hold is shown)')
+    ))
+    item = ''
+    while item not in modes.keys():
+        clrscr()
+        print('Select mode')
+        print()
+        for k, v in modes.items():
+            print(' - '.join((k, v)))
+        print()
+        item = input('> ', )
+    return game_type, poker_type, hands_per_deal, item == '2'
 
-# For testing purposes
-if __name__ == 'vpoker':
-    suits = {
-        'S': '♠',
-        'C': '♣',
-        'H': '♥',
-        'D': '♦'
-    }
-    suit_list = suits.keys()
-    ranks = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
 
 if __name__ == '__main__':
     # Init logger
@@ -546,19 +666,20 @@ if __name__ == '__main__':
     )
     dbase = Dbase(DB_FILE)
     # Call main menu
-    game_t, poker_t = menu()
-    # Initialize poker engine
-    if poker_t == 'Tens or Better':
-        from engine.tens_or_better import *
-        combo_check = TensOrBetter()
-    elif poker_t == 'Jacks or Better':
-        from engine.jacks_or_better import *
-        combo_check = JacksOrBetter()
-    elif poker_t == 'Deuces Wild':
-        from engine.deuces_wild import *
-        combo_check = DeucesWild()
-    else:
+    game_t, poker_t, hands, training = menu()
+    # Initialize poker engine, only the chosen engine module is imported
+    if poker_t not in registry.games:
         exit(0)
+    poker_game = registry.get(poker_t)
+    CAPTION = poker_game.caption
+    BACKGROUND_COLOR = poker_game.background_color
+    poker_winnings = poker_game.poker_winnings
+    combination_names = poker_game.combination_names
+    Combination = poker_game.combinations
+    paytable = poker_game.paytable
+    combo_check = poker_game.create()
+    trainer = Trainer(Solver(combo_check, poker_winnings)) if training \
+        else None
     # Initialize player
     if game_t == 'Continue game':
         pass
@@ -585,8 +706,16 @@ if __name__ == '__main__':
     #
     # Global variables
     #
-    coins = 0  # Number of inserted coins
-    win_combo = ''
+    coins = 0  # Number of inserted coins per hand
+    win_combo = Combination.NOTHING  # ID of winning combination
+    win_counts = [0] * len(Combination)  # Numbers of hands by combination
+    session = Session(SEED, backend=RNG_BACKEND)  # Random streams of rounds
+    # Rounds of unseeded sessions can not be replayed, they are not kept
+    session_id = dbase.add_session(session.seed) \
+        if session.seed is not None else None
+    deck = Deck(combo_check.deck)  # Playing deck
+    history = History(HISTORY_FILE)  # Log of played rounds
+    decision = None  # Grade of the last hold in trainer mode
     table_surface = pygame.Surface(TABLE_SURFACE_SIZE)
     cards_surface = pygame.Surface(CARDS_SURFACE_SIZE)
     # Start game